@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+# app_index.py - Precomputed application lookup: exact, alias and fuzzy trigram matches
+
+from collections import namedtuple, defaultdict
+
+# kind is 'exact', 'alias', 'span' (a known name inside a longer phrase) or 'fuzzy'
+AppMatch = namedtuple("AppMatch", ["name", "path", "score", "kind"])
+
+# Minimum trigram similarity for a fuzzy match to be returned
+FUZZY_THRESHOLD = 0.45
+
+
+def _normalize(text):
+    return " ".join(text.lower().split())
+
+
+def _trigrams(text):
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class AppIndex:
+    """
+    Application lookup table built once from name -> path and alias -> name maps
+
+    Lookups try, in order: an exact name, an alias, the longest known name or
+    alias contained in the query as whole words, then a ranked fuzzy match over
+    a trigram inverted index. Only the first two are O(1); the fuzzy stage only
+    scores names that share at least one trigram with the query.
+
+    Names in `exact_only` (bare $PATH executables) are found only when spoken
+    exactly: they never match inside a longer phrase or fuzzily, so a
+    misheard phrase can't resolve to something like `poweroff`.
+    """
+
+    def __init__(self, app_paths, aliases=None, exact_only=()):
+        self.paths = {_normalize(name): path for name, path in app_paths.items()}
+        self.exact_only = {_normalize(name) for name in exact_only} & set(self.paths)
+        self.aliases = {}
+        self._trigram_index = defaultdict(set)
+        self._trigram_counts = {}
+        self._max_words = 1
+        self.add_aliases(aliases or {})
+        for name in self.paths:
+            if name not in self.exact_only:
+                self._index_term(name)
+
+    def add_aliases(self, aliases):
+        """Merge alias -> name entries; aliases for apps not in this index are dropped"""
+        for alias, target in aliases.items():
+            alias = _normalize(alias)
+            target = self._resolve_alias(_normalize(target))
+            if alias in self.paths or target is None:
+                continue
+            self.aliases[alias] = target
+            if target not in self.exact_only:
+                self._index_term(alias)
+
+    def add_app(self, name, path):
+        """Add or replace a single application"""
+        name = _normalize(name)
+        self.paths[name] = path
+        self.exact_only.discard(name)
+        self._index_term(name)
+
+    def _resolve_alias(self, name, depth=0):
+        """Follow alias chains (task mgr -> task manager) down to a real app name"""
+        if name in self.paths:
+            return name
+        if name in self.aliases and depth < 5:
+            return self._resolve_alias(self.aliases[name], depth + 1)
+        return None
+
+    def _index_term(self, term):
+        grams = _trigrams(term)
+        self._trigram_counts[term] = len(grams)
+        for gram in grams:
+            self._trigram_index[gram].add(term)
+        self._max_words = max(self._max_words, len(term.split()))
+
+    @property
+    def names(self):
+        return list(self.paths)
+
+    def __len__(self):
+        return len(self.paths)
+
+    def __contains__(self, name):
+        return self._resolve_alias(_normalize(name)) is not None
+
+    def _match(self, term, score, kind):
+        name = self._resolve_alias(term)
+        return AppMatch(name, self.paths[name], score, kind)
+
+    def lookup(self, query):
+        """Return the exact or alias match for query, or None"""
+        query = _normalize(query)
+        if query in self.paths:
+            return self._match(query, 1.0, "exact")
+        if query in self.aliases:
+            return self._match(query, 1.0, "alias")
+        return None
+
+    def search(self, query, limit=5):
+        """
+        Find applications matching a spoken name
+
+        Returns:
+            list: AppMatch tuples, best first (at most `limit`)
+        """
+        query = _normalize(query)
+        if not query:
+            return []
+
+        match = self.lookup(query)
+        if match:
+            return [match]
+
+        # Longest known name spoken as part of a longer phrase ("chrome please")
+        words = query.split()
+        for size in range(min(self._max_words, len(words)), 0, -1):
+            for start in range(len(words) - size + 1):
+                match = self.lookup(" ".join(words[start:start + size]))
+                if match and match.name not in self.exact_only:
+                    return [match._replace(score=0.9, kind="span")]
+
+        return self._fuzzy(query, limit)
+
+    def _fuzzy(self, query, limit):
+        grams = _trigrams(query)
+        shared = defaultdict(int)
+        for gram in grams:
+            for term in self._trigram_index.get(gram, ()):
+                shared[term] += 1
+
+        # Dice coefficient, keeping the best-scoring term per app
+        best = {}
+        for term, count in shared.items():
+            score = 2.0 * count / (len(grams) + self._trigram_counts[term])
+            if score < FUZZY_THRESHOLD:
+                continue
+            name = self._resolve_alias(term)
+            if name not in best or score > best[name]:
+                best[name] = score
+
+        ranked = sorted(best.items(), key=lambda item: (-item[1], item[0]))[:limit]
+        return [AppMatch(name, self.paths[name], score, "fuzzy") for name, score in ranked]
+
+
+_app_index = None
+
+
+def get_app_index():
+    """Shared index for the current platform, built on first use"""
+    global _app_index
+    if _app_index is None:
+        from config import APP_PATHS, APP_ALIASES
+        _app_index = AppIndex(APP_PATHS, APP_ALIASES)
+    return _app_index
+
+
+if __name__ == "__main__":
+    index = get_app_index()
+    print(f"Indexed {len(index)} apps and {len(index.aliases)} aliases")
+    for query in ["chrome", "vs code", "google chrom", "open the notepad please", "fire fox"]:
+        print(f"  {query!r}: {index.search(query, limit=3)}")
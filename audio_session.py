@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+# audio_session.py - Long-lived microphone session shared by every listen call
+
+import math
+import threading
+import time
+from collections import deque
+
+import speech_recognition as sr
+
+from config import VAD_CONFIG
+
+# Voice activity detection is optional; without numpy we fall back to the
+# recognizer's own energy/pause endpointing
+try:
+    from vad import StreamingVad
+    from level_meter import get_level_meter
+    VAD_AVAILABLE = True
+except ImportError:
+    VAD_AVAILABLE = False
+    print("Warning: numpy not available. Voice activity detection disabled.")
+
+# Recognizer settings (previously set up on every listen_for_command call)
+SESSION_DEFAULTS = {
+    'energy_threshold': 4000,
+    'dynamic_energy_threshold': True,
+    'pause_threshold': 1.2,
+    'calibration_duration': 2.0,  # Seconds of ambient noise sampled once at startup
+    'timeout': 15,
+    'phrase_time_limit': 10,
+}
+
+
+class AudioSession:
+    """
+    Keeps one Recognizer and one open Microphone stream for the whole run.
+
+    Ambient noise is calibrated once when the session opens. After that the
+    noise estimate keeps tracking the room between utterances: StreamingVad
+    folds every non-speech frame into its noise floor (or, without numpy, the
+    recognizer's dynamic energy threshold does the same while listen() waits),
+    so there is no per-command calibration pause.
+    """
+
+    def __init__(self, device_index=None, **settings):
+        self.settings = dict(SESSION_DEFAULTS, **settings)
+        self.device_index = device_index
+        self.recognizer = sr.Recognizer()
+        self.recognizer.energy_threshold = self.settings['energy_threshold']
+        self.recognizer.dynamic_energy_threshold = self.settings['dynamic_energy_threshold']
+        self.recognizer.pause_threshold = self.settings['pause_threshold']
+        self.recognizer.operation_timeout = None
+        self.microphone = None
+        self.source = None
+        self.vad = None
+        self.meter = None
+        self.use_vad = VAD_AVAILABLE and VAD_CONFIG.get('enabled', True)
+        self._lock = threading.RLock()
+
+    @property
+    def is_open(self):
+        return self.source is not None
+
+    def open(self, gui=None):
+        """Open the microphone stream and calibrate once"""
+        with self._lock:
+            if self.is_open:
+                return self
+            self.microphone = sr.Microphone(device_index=self.device_index)
+            self.source = self.microphone.__enter__()
+            try:
+                if gui:
+                    gui.update_status("Adjusting for ambient noise...")
+                print("Adjusting for ambient noise...")
+                self.recognizer.adjust_for_ambient_noise(self.source, duration=self.settings['calibration_duration'])
+                print(f"Energy threshold set to: {self.recognizer.energy_threshold}")
+                if self.use_vad and self.source.SAMPLE_WIDTH == 2:
+                    self.vad = StreamingVad(self.source.SAMPLE_RATE)
+                    self.meter = get_level_meter()
+            except Exception:
+                self.close()
+                raise
+            return self
+
+    def close(self):
+        """Release the microphone stream"""
+        with self._lock:
+            if self.microphone is not None:
+                try:
+                    self.microphone.__exit__(None, None, None)
+                except Exception as e:
+                    print(f"Error closing microphone: {e}")
+            self.microphone = None
+            self.source = None
+            self.vad = None
+            self.meter = None
+
+    def listen(self, timeout=None, phrase_time_limit=None, onset_check=None, on_onset=None):
+        """
+        Capture one utterance from the open stream
+
+        Args:
+            onset_check: Optional callable(chunk) -> bool. With VAD endpointing,
+                speech only starts an utterance once it returns True (used to
+                ignore Jarvis's own voice); ignored without VAD.
+            on_onset: Optional callable() run when the utterance starts, before
+                the rest of it is recorded; ignored without VAD.
+
+        Returns:
+            sr.AudioData
+
+        Raises:
+            sr.WaitTimeoutError: No speech started within `timeout`
+        """
+        with self._lock:
+            if not self.is_open:
+                self.open()
+            timeout = timeout if timeout is not None else self.settings['timeout']
+            phrase_time_limit = phrase_time_limit if phrase_time_limit is not None else self.settings['phrase_time_limit']
+            try:
+                if self.vad is not None:
+                    return self._listen_vad(timeout, phrase_time_limit, onset_check, on_onset)
+                return self.recognizer.listen(self.source, timeout=timeout, phrase_time_limit=phrase_time_limit)
+            except OSError:
+                # The device went away; reopen (and recalibrate) on the next call
+                self.close()
+                raise
+
+    def _listen_vad(self, timeout, phrase_time_limit, onset_check=None, on_onset=None):
+        """
+        Endpoint one utterance with StreamingVad instead of the energy threshold.
+
+        The utterance ends after VAD_CONFIG['end_silence_ms'] of non-speech,
+        which is well under the recognizer's pause_threshold.
+        """
+        source = self.source
+        chunk_seconds = source.CHUNK / source.SAMPLE_RATE
+        pre_roll = deque(maxlen=max(1, math.ceil(VAD_CONFIG['pre_roll_ms'] / 1000 / chunk_seconds)))
+        end_silence = VAD_CONFIG['end_silence_ms'] / 1000
+        self.vad.reset()
+
+        # Wait for speech onset, keeping a little audio from just before it
+        waited = 0.0
+        while True:
+            buffer = source.stream.read(source.CHUNK)
+            if not buffer:
+                raise sr.WaitTimeoutError("audio stream ended while waiting for phrase to start")
+            self._meter_feed(buffer)
+            waited += chunk_seconds
+            if self.vad.feed(buffer) and (onset_check is None or onset_check(buffer)):
+                break
+            pre_roll.append(buffer)
+            if timeout and waited > timeout:
+                raise sr.WaitTimeoutError("listening timed out while waiting for phrase to start")
+
+        if on_onset is not None:
+            on_onset()
+        frames = list(pre_roll)
+        frames.append(buffer)
+        phrase = chunk_seconds
+        silence = 0.0
+        while silence < end_silence and not (phrase_time_limit and phrase >= phrase_time_limit):
+            buffer = source.stream.read(source.CHUNK)
+            if not buffer:
+                break
+            self._meter_feed(buffer)
+            frames.append(buffer)
+            phrase += chunk_seconds
+            silence = 0.0 if self.vad.feed(buffer) else silence + chunk_seconds
+
+        return sr.AudioData(b"".join(frames), source.SAMPLE_RATE, source.SAMPLE_WIDTH)
+
+    def _meter_feed(self, buffer):
+        meter = self.meter
+        if meter is not None:
+            noise_db = self.vad.noise_db
+            meter.feed(buffer, None if noise_db is None else noise_db + VAD_CONFIG['energy_margin_db'])
+
+    def __enter__(self):
+        return self.open()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def get_audio_session(gui=None):
+    """Return the shared, opened audio session, creating it on first use"""
+    global _session
+    with _session_lock:
+        if _session is None:
+            start = time.perf_counter()
+            _session = AudioSession()
+            _session.open(gui)
+            print(f"DEBUG - Audio session ready in {(time.perf_counter() - start) * 1000:.0f} ms")
+        elif not _session.is_open:
+            _session.open(gui)
+        return _session
+
+
+def close_audio_session():
+    global _session
+    with _session_lock:
+        if _session is not None:
+            _session.close()
+            _session = None
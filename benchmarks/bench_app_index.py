@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+# bench_app_index.py - Golden-output check and timing for app_index.AppIndex lookups
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from app_index import AppIndex
+from config import APP_ALIASES, LINUX_APP_PATHS, WINDOWS_APP_PATHS
+
+# (spoken app name, expected (name, kind) of the best match, or None for no match)
+WINDOWS_CORPUS = [
+    ("notepad", ("notepad", "exact")),
+    ("Task  Manager", ("task manager", "exact")),
+    ("vs code", ("code", "alias")),
+    ("task mgr", ("task manager", "alias")),
+    ("calc", ("calculator", "alias")),
+    ("web browser", ("chrome", "alias")),
+    ("the notepad please", ("notepad", "span")),
+    ("microsoft word document", ("word", "span")),
+    ("google chrom", ("chrome", "fuzzy")),
+    ("notepd", ("notepad", "fuzzy")),
+    ("fire fox", ("firefox", "fuzzy")),
+    ("power point", ("powerpoint", "fuzzy")),
+    ("sublime", ("sublime text", "fuzzy")),
+    ("qwzx", None),
+    ("", None),
+]
+
+# Aliases for apps the platform doesn't have are dropped, not left dangling
+LINUX_CORPUS = [
+    ("firefox", ("firefox", "exact")),
+    ("mozilla firefox", ("firefox", "alias")),
+    ("notepad", None),
+    ("calculator", None),
+]
+
+
+def check_corpus(index, corpus, label):
+    failures = 0
+    for query, expected in corpus:
+        matches = index.search(query)
+        actual = (matches[0].name, matches[0].kind) if matches else None
+        if actual != expected:
+            failures += 1
+            print(f"FAIL - {label} '{query}': expected {expected}, got {actual}")
+    return failures
+
+
+def check_ranking(index):
+    """Fuzzy results come best first with scores in (threshold, 1)"""
+    matches = index.search("git hub desk top")
+    scores = [m.score for m in matches]
+    ok = bool(matches) and matches[0].name == "github desktop" and scores == sorted(scores, reverse=True)
+    if not ok:
+        print(f"FAIL - ranking for 'git hub desk top': {matches}")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    windows = AppIndex(WINDOWS_APP_PATHS, APP_ALIASES)
+    linux = AppIndex(LINUX_APP_PATHS, APP_ALIASES)
+    failures = check_corpus(windows, WINDOWS_CORPUS, "windows")
+    failures += check_corpus(linux, LINUX_CORPUS, "linux")
+    failures += check_ranking(windows)
+    total = len(WINDOWS_CORPUS) + len(LINUX_CORPUS) + 1
+    print(f"Golden corpus: {total - failures}/{total} passed")
+    if failures:
+        sys.exit(1)
+
+    rounds = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    queries = [query for query, _ in WINDOWS_CORPUS]
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for query in queries:
+            windows.search(query)
+    elapsed = time.perf_counter() - start
+    print(f"search     {elapsed / (rounds * len(queries)) * 1e6:7.2f} us/query")
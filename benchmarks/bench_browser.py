@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+# bench_browser.py - Behaviour checks and timing for browser.BrowserController (no real browser needed)
+
+import contextlib
+import io
+import os
+import sys
+import threading
+import time
+import webbrowser
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, unquote, urlsplit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from browser import BrowserController, google_search_url, whatsapp_send_uri, youtube_search_url
+from config import BROWSER_CONFIG
+
+
+class RecordingBrowser(webbrowser.BaseBrowser):
+    """webbrowser controller that remembers URLs instead of launching anything"""
+
+    def __init__(self, failures=0):
+        super().__init__("recording")
+        self.opened = []
+        self.attempts = 0
+        self.failures = failures  # Opens that fail before it starts working
+
+    def open(self, url, new=0, autoraise=True):
+        self.attempts += 1
+        if self.attempts <= self.failures:
+            return False
+        self.opened.append(url)
+        return True
+
+
+class FakeDevTools:
+    """Answers /json/version and PUT /json/new like a Chromium remote-debugging port"""
+
+    def __init__(self):
+        self.opened = []
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                self._reply(b'{"Browser": "FakeChrome/1.0"}')
+
+            def do_PUT(self):
+                fake.opened.append(unquote(urlsplit(self.path).query))
+                self._reply(b'{"id": "1"}')
+
+            def _reply(self, body):
+                self.send_response(200)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.port = self.server.server_address[1]
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+def make_controller(failures=0, **overrides):
+    recorder = RecordingBrowser(failures)
+    webbrowser.register("recording", None, recorder)
+    config = dict(BROWSER_CONFIG, browser="recording", **overrides)
+    return BrowserController(config), recorder
+
+
+def check(name, condition):
+    print(f"{'ok  ' if condition else 'FAIL'} {name}")
+    return 0 if condition else 1
+
+
+def run_checks():
+    failures = 0
+
+    url = google_search_url("fish & chips #1 café")
+    failures += check("search query encoded", parse_qs(urlsplit(url).query) == {'q': ["fish & chips #1 café"]})
+    url = youtube_search_url("lo-fi beats")
+    failures += check("youtube query encoded", parse_qs(urlsplit(url).query) == {'search_query': ["lo-fi beats"]})
+    failures += check("whatsapp text uses %20", whatsapp_send_uri("on my way & late") == "whatsapp://send?text=on%20my%20way%20%26%20late")
+
+    controller, recorder = make_controller(debounce_seconds=0.2)
+    controller.open("https://www.youtube.com")
+    controller.open("https://WWW.YOUTUBE.COM/")
+    failures += check("duplicate open within the window ignored", len(recorder.opened) == 1)
+    controller.open(google_search_url("python"))
+    failures += check("different URL opens", len(recorder.opened) == 2)
+    time.sleep(0.25)
+    controller.open("https://www.youtube.com")
+    failures += check("same URL opens again after the window", len(recorder.opened) == 3)
+
+    devtools = FakeDevTools()
+    try:
+        controller, recorder = make_controller(devtools_port=devtools.port)
+        url = google_search_url("fish & chips")
+        controller.open(url)
+        failures += check("DevTools endpoint used when available", devtools.opened == [url] and not recorder.opened)
+    finally:
+        devtools.close()
+    controller.open(youtube_search_url("after close"))
+    failures += check("falls back to the browser command when DevTools goes away", len(recorder.opened) == 1)
+
+    controller, recorder = make_controller(devtools_port=1)
+    controller.open("https://web.whatsapp.com/")
+    failures += check("unreachable DevTools port ignored", recorder.opened == ["https://web.whatsapp.com/"])
+
+    controller, recorder = make_controller(failures=1)
+    first = controller.open("https://www.youtube.com")
+    second = controller.open("https://www.youtube.com")
+    failures += check("failed open doesn't debounce the retry", not first and second and recorder.attempts == 2)
+
+    # No browser at all: a headless box, or BROWSER pointing nowhere
+    real_get = webbrowser.get
+
+    def no_browser(using=None):
+        raise webbrowser.Error("could not locate runnable browser")
+
+    webbrowser.get = no_browser
+    output = io.StringIO()
+    try:
+        with contextlib.redirect_stdout(output):
+            controller = BrowserController(dict(BROWSER_CONFIG, browser=None))
+            opened = [controller.open("https://www.youtube.com"), controller.open("https://www.youtube.com")]
+    except Exception as e:
+        opened = [e]
+    finally:
+        webbrowser.get = real_get
+    failures += check("no browser available: open returns False", opened == [False, False])
+    failures += check("no browser available: warning doesn't name 'None'",
+                      "no browser available" in output.getvalue() and "'None'" not in output.getvalue())
+
+    return failures
+
+
+if __name__ == "__main__":
+    failures = run_checks()
+    if failures:
+        sys.exit(1)
+
+    rounds = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    devtools = FakeDevTools()
+    try:
+        controller, _ = make_controller(debounce_seconds=0.0, devtools_port=devtools.port)
+        controller.resolve()
+        start = time.perf_counter()
+        for i in range(rounds):
+            controller.open(google_search_url(f"query {i}"))
+        per_open = (time.perf_counter() - start) / rounds
+    finally:
+        devtools.close()
+    print(f"DevTools tab open (local endpoint, no process spawned) {per_open * 1e6:9.1f} us")
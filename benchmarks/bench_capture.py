@@ -0,0 +1,231 @@
+#!/usr/bin/env python3
+# bench_capture.py - Behaviour checks and timing for capture.UtteranceRingBuffer, playback suppression and listening state
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import speech_recognition as sr
+
+import capture
+from capture import CapturePipeline, UtteranceRingBuffer
+from config import BARGE_IN_CONFIG, CAPTURE_CONFIG
+from ui_channel import UiChannel
+
+RATE, WIDTH = 16000, 2
+
+
+def clip(byte, length):
+    return sr.AudioData(bytes([byte]) * length, RATE, WIDTH)
+
+
+class FakeRecognizer:
+    non_speaking_duration = 0.5
+
+
+class FakeSource:
+    SAMPLE_RATE, SAMPLE_WIDTH = RATE, WIDTH
+
+
+class FakeSession:
+    """Hands out scripted utterances, then times out like an idle microphone"""
+
+    def __init__(self, clips, vad=None):
+        self.clips = list(clips)
+        self.vad = vad
+        self.source = FakeSource()
+        self.recognizer = FakeRecognizer()
+        self.onset_checks = []
+
+    def listen(self, timeout=None, phrase_time_limit=None, onset_check=None, on_onset=None):
+        self.onset_checks.append(onset_check)
+        if not self.clips:
+            time.sleep(timeout or 0.01)
+            raise sr.WaitTimeoutError()
+        if self.vad is not None and on_onset is not None:
+            on_onset()
+        return self.clips.pop(0)
+
+
+class FakeRoot:
+    """Tk root whose after() callbacks run only when pump() is called"""
+
+    def __init__(self):
+        self.callbacks = []
+
+    def after(self, ms, callback):
+        self.callbacks.append(callback)
+
+    def quit(self):
+        pass
+
+    def pump(self):
+        callbacks, self.callbacks = self.callbacks, []
+        for callback in callbacks:
+            callback()
+
+
+class RecordingView:
+    """JarvisGUI stand-in that records listening transitions"""
+
+    def __init__(self):
+        self.root = FakeRoot()
+        self.is_listening = False
+        self.transitions = []
+
+    def start_listening_animation(self):
+        self.is_listening = True
+        self.transitions.append(True)
+
+    def stop_listening_animation(self):
+        self.is_listening = False
+        self.transitions.append(False)
+
+    def update_status(self, text):
+        pass
+
+
+def check(name, condition):
+    print(f"{'ok  ' if condition else 'FAIL'} {name}")
+    return 0 if condition else 1
+
+
+def run_ring_checks():
+    failures = 0
+
+    ring = UtteranceRingBuffer(10, 4)
+    ring.put(clip(1, 4))
+    ring.put(clip(2, 4))
+    first = ring.get(0)
+    ring.put(clip(3, 4))  # Starts at offset 8: two bytes at the end, two at the start
+    second, third = ring.get(0), ring.get(0)
+    failures += check("FIFO order across wraparound", [a.frame_data for a in (first, second, third)]
+                      == [b"\x01" * 4, b"\x02" * 4, b"\x03" * 4])
+    failures += check("empty ring times out", ring.get(0.01) is None)
+
+    ring = UtteranceRingBuffer(10, 4)
+    for byte in (1, 2, 3):
+        ring.put(clip(byte, 4))
+    failures += check("byte overflow drops the oldest", ring.dropped == 1 and ring.get(0).frame_data == b"\x02" * 4
+                      and len(ring) == 1)
+
+    ring = UtteranceRingBuffer(100, 2)
+    for byte in (1, 2, 3):
+        ring.put(clip(byte, 2))
+    failures += check("slot overflow drops the oldest", ring.dropped == 1 and ring.get(0).frame_data == b"\x02" * 2)
+
+    ring = UtteranceRingBuffer(10, 4)
+    failures += check("clip larger than the ring rejected", not ring.put(clip(1, 11)) and len(ring) == 0)
+
+    ring = UtteranceRingBuffer(16, 8)
+    for i in range(50):  # Many laps of a small ring
+        ring.put(clip(i, 3 + i % 5))
+    kept = []
+    while len(ring):
+        kept.append(ring.get(0))
+    failures += check("contents intact after many laps",
+                      all(a.frame_data == bytes([a.frame_data[0]]) * len(a.frame_data) for a in kept)
+                      and [a.frame_data[0] for a in kept] == sorted(a.frame_data[0] for a in kept))
+    return failures
+
+
+def run_playback_checks():
+    failures = 0
+    tail = BARGE_IN_CONFIG['echo_tail_ms'] / 1000
+    real_state = capture.playback_state
+    barge_in = BARGE_IN_CONFIG['enabled']
+    try:
+        pipeline = CapturePipeline(session=FakeSession([]))
+        now = time.monotonic()
+
+        capture.playback_state = lambda: (now - 1.0, 0.0)
+        failures += check("VAD onset rejected while speaking", not pipeline._outside_playback(b""))
+        capture.playback_state = lambda: (None, time.monotonic() - tail / 2)
+        failures += check("VAD onset rejected in the echo tail", not pipeline._outside_playback(b""))
+        capture.playback_state = lambda: (None, time.monotonic() - tail - 0.1)
+        failures += check("VAD onset accepted after the tail", pipeline._outside_playback(b""))
+
+        # Without VAD: a 2 s clip (0.5 s lead-in) ending now started speech 1.5 s ago
+        two_seconds = clip(0, 2 * RATE * WIDTH)
+        capture.playback_state = lambda: (None, now - 1.0)
+        failures += check("clip that began during playback dropped", pipeline._heard_during_playback(two_seconds, now))
+        capture.playback_state = lambda: (None, now - 1.5 - tail - 0.1)
+        failures += check("clip that began after playback kept", not pipeline._heard_during_playback(two_seconds, now))
+
+        # End to end without VAD or echo gate: Jarvis reading the help text
+        capture.playback_state = lambda: (time.monotonic() - 5.0, 0.0)
+        session = FakeSession([clip(7, RATE * WIDTH)])
+        pipeline = CapturePipeline(session=session, config=dict(CAPTURE_CONFIG, poll_timeout=0.01))
+        pipeline.start()
+        time.sleep(0.1)
+        pipeline.stop()
+        failures += check("own voice never queued as a command", len(pipeline.buffer) == 0 and session.onset_checks[0] is None)
+
+        # Barge-in disabled: VAD but no echo gate
+        capture.playback_state = lambda: (None, 0.0)
+        BARGE_IN_CONFIG['enabled'] = False
+        session = FakeSession([clip(7, RATE * WIDTH)], vad=object())
+        pipeline = CapturePipeline(session=session, config=dict(CAPTURE_CONFIG, poll_timeout=0.01))
+        pipeline.start()
+        time.sleep(0.1)
+        pipeline.stop()
+        failures += check("with VAD the onset hook guards playback",
+                          len(pipeline.buffer) == 1 and session.onset_checks[0] == pipeline._outside_playback)
+    finally:
+        capture.playback_state = real_state
+        BARGE_IN_CONFIG['enabled'] = barge_in
+    return failures
+
+
+def run_listening_checks():
+    failures = 0
+    real_state = capture.playback_state
+    barge_in = BARGE_IN_CONFIG['enabled']
+    try:
+        capture.playback_state = lambda: (None, 0.0)
+        BARGE_IN_CONFIG['enabled'] = False
+        view = RecordingView()
+        channel = UiChannel(view)
+        session = FakeSession([clip(7, RATE * WIDTH), clip(8, RATE * WIDTH)], vad=object())
+        pipeline = CapturePipeline(session=session, config=dict(CAPTURE_CONFIG, poll_timeout=0.01))
+        pipeline.start(channel)
+        time.sleep(0.1)
+        events = list(channel._pending)
+        view.root.pump()
+        failures += check("animation follows each utterance's onset and end",
+                          [value for kind, value in events if kind == 'listening'] == [True, False, True, False])
+        failures += check("window idles once the utterance ends", not view.is_listening)
+        time.sleep(0.05)
+        failures += check("no animation while nobody speaks", not channel._pending and pipeline.running)
+        pipeline.stop()
+
+        view = RecordingView()
+        channel = UiChannel(view)
+        pipeline = CapturePipeline(session=FakeSession([clip(7, RATE * WIDTH)]), config=dict(CAPTURE_CONFIG, poll_timeout=0.01))
+        pipeline.start(channel)
+        time.sleep(0.1)
+        pipeline.stop()
+        view.root.pump()
+        failures += check("no onset events without VAD", view.transitions == [] and len(pipeline.buffer) == 1)
+    finally:
+        capture.playback_state = real_state
+        BARGE_IN_CONFIG['enabled'] = barge_in
+    return failures
+
+
+if __name__ == "__main__":
+    failures = run_ring_checks() + run_playback_checks() + run_listening_checks()
+    if failures:
+        sys.exit(1)
+
+    rounds = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    ring = UtteranceRingBuffer(2 * RATE * CAPTURE_CONFIG['buffer_seconds'], CAPTURE_CONFIG['max_utterances'])
+    utterance = clip(1, 3 * RATE * WIDTH)  # 3 s of 16 kHz mono
+    start = time.perf_counter()
+    for _ in range(rounds):
+        ring.put(utterance)
+        ring.get(0)
+    elapsed = time.perf_counter() - start
+    print(f"put + get of a 3 s utterance {elapsed / rounds * 1e6:8.1f} us")
@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+# bench_echo.py - Behaviour checks and timing for echo.EchoGate on synthetic playback and microphone audio
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import numpy as np
+
+import echo
+from config import BARGE_IN_CONFIG
+from echo import EchoGate
+
+MIC_RATE = 16000
+PLAY_RATE = 22050  # Phrase cache WAVs, as rendered by pyttsx3
+CHUNK = 1024
+RNG = np.random.default_rng(3)
+
+# Jarvis's voice: a few harmonics below 4 kHz so resampling keeps it intact
+PARTIALS = [(f, RNG.uniform(0, 2 * np.pi), 1 / (i + 1)) for i, f in enumerate(RNG.uniform(120, 3500, 12))]
+
+
+def voice(t, gain):
+    return gain * sum(a * np.sin(2 * np.pi * f * t + p) for f, p, a in PARTIALS)
+
+
+def pcm(samples):
+    return (np.clip(samples, -1.0, 1.0) * 32767).astype(np.int16).tobytes()
+
+
+def reference_pcm(seconds=1.5, gain=0.3):
+    return pcm(voice(np.arange(int(PLAY_RATE * seconds)) / PLAY_RATE, gain))
+
+
+def echo_chunk(offset_s, gain):
+    """What the microphone hears of the playback `offset_s` into it, plus a little room noise"""
+    t = offset_s + np.arange(CHUNK) / MIC_RATE
+    return pcm(voice(t, gain) + RNG.normal(0, 0.002, CHUNK))
+
+
+def user_chunk(db):
+    """Someone else talking: 200 Hz harmonics unrelated to the playback"""
+    t = np.arange(CHUNK) / MIC_RATE
+    samples = sum(np.sin(2 * np.pi * 200 * k * t + RNG.uniform(0, 6)) / k for k in range(1, 8))
+    return pcm(samples * 10 ** (db / 20) / np.sqrt(np.mean(samples ** 2)))
+
+
+class Playback:
+    """Stands in for voice_output: a response that started `started_ago` seconds back"""
+
+    def __init__(self, started_ago=None, ended_ago=10.0, reference=None):
+        now = time.monotonic()
+        self.started = None if started_ago is None else now - started_ago
+        self.ended = now - ended_ago
+        self.reference = reference
+
+    def state(self):
+        return self.started, self.ended
+
+    def ref(self):
+        return None if self.reference is None else (self.reference, (PLAY_RATE, 2, 1))
+
+
+def gate_for(playback):
+    echo.playback_state = playback.state
+    echo.playback_reference = playback.ref
+    return EchoGate(MIC_RATE)
+
+
+def learn(gate, gain=0.05, chunks=3):
+    """Start of a response: the first chunks teach the gate how loud the echo is"""
+    for i in range(chunks):
+        gate.is_user_speech(echo_chunk(0.1 + i * CHUNK / MIC_RATE, gain))
+
+
+def check(name, condition):
+    print(f"{'ok  ' if condition else 'FAIL'} {name}")
+    return 0 if condition else 1
+
+
+def run_checks():
+    failures = 0
+    tail = BARGE_IN_CONFIG['echo_tail_ms'] / 1000
+    needed = int(np.ceil(BARGE_IN_CONFIG['min_speech_ms'] / 1000 * MIC_RATE / CHUNK))
+
+    echo_like = echo.reference_samples(echo_chunk(0.5, 0.3), (MIC_RATE, 2, 1), MIC_RATE)
+    played = echo.reference_samples(reference_pcm(), (PLAY_RATE, 2, 1), MIC_RATE)
+    failures += check("resampled playback correlates with its echo", echo.max_correlation(echo_like, played) > 0.9)
+
+    gate = gate_for(Playback())
+    failures += check("everything passes when Jarvis is quiet", gate.is_user_speech(user_chunk(-40)))
+
+    playback = Playback(started_ago=None, ended_ago=tail / 2)
+    gate = gate_for(playback)
+    failures += check("echo tail still gated", not gate.is_user_speech(echo_chunk(0.5, 0.05)))
+
+    playback = Playback(started_ago=0.0)
+    gate = gate_for(playback)
+    decisions = [gate.is_user_speech(user_chunk(-10)) for _ in range(3)]
+    failures += check("settle period never interrupts", not any(decisions))
+
+    playback = Playback(started_ago=2.0, reference=reference_pcm())
+    gate = gate_for(playback)
+    learn(gate)
+    decisions = [gate.is_user_speech(echo_chunk(0.2 + i * 0.064, 0.05)) for i in range(10)]
+    failures += check("echo at the learned level rejected", not any(decisions))
+
+    # Echo that jumps well above the learned level (volume turned up) but is the playback
+    gate = gate_for(playback)
+    learn(gate)
+    decisions = [gate.is_user_speech(echo_chunk(0.2 + i * 0.064, 0.6)) for i in range(10)]
+    failures += check("loud playback-correlated audio rejected", not any(decisions))
+
+    gate = gate_for(Playback(started_ago=2.0, reference=None))
+    learn(gate)
+    decisions = [gate.is_user_speech(echo_chunk(0.2 + i * 0.064, 0.6)) for i in range(10)]
+    failures += check("without a reference, loud echo counts as speech", any(decisions))
+
+    gate = gate_for(playback)
+    learn(gate)
+    decisions = [gate.is_user_speech(user_chunk(-12)) for _ in range(needed + 1)]
+    failures += check("loud uncorrelated speech interrupts", decisions[-1] and not any(decisions[:needed - 1]))
+
+    gate = gate_for(playback)
+    learn(gate)
+    decisions = [gate.is_user_speech(user_chunk(-12)), gate.is_user_speech(echo_chunk(0.3, 0.05))]
+    decisions += [gate.is_user_speech(user_chunk(-12)) for _ in range(needed - 1)]
+    failures += check("short loud bursts don't add up", not any(decisions))
+
+    return failures
+
+
+if __name__ == "__main__":
+    real = echo.playback_state, echo.playback_reference
+    try:
+        failures = run_checks()
+        if failures:
+            sys.exit(1)
+
+        playback = Playback(started_ago=2.0, reference=reference_pcm())
+        gate = gate_for(playback)
+        learn(gate)
+        chunks = [user_chunk(-12) for _ in range(50)]
+        start = time.perf_counter()
+        for chunk in chunks:
+            gate._loud = 0.0
+            gate.is_user_speech(chunk)
+        elapsed = time.perf_counter() - start
+    finally:
+        echo.playback_state, echo.playback_reference = real
+    print(f"is_user_speech during cached playback {elapsed / len(chunks) * 1e6:8.1f} us/chunk "
+          f"({CHUNK / MIC_RATE * 1000:.0f} ms of audio)")
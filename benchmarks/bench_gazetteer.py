@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+# bench_gazetteer.py - Golden-output check and timing for the weather handler's city resolution
+
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import weather_client
+from config import GAZETTEER_CONFIG
+from gazetteer import Gazetteer, build_from_geonames, get_gazetteer
+from handlers.weather import find_cities, weather_report
+
+# (weather command, expected "Name,CC" queries - empty when no known city is named)
+GOLDEN_CORPUS = [
+    ("what's the weather in london", ("London,GB",)),
+    ("weather in new york city today", ("New York,US",)),
+    ("weather in nyc", ("New York,US",)),
+    ("how's the weather in Sao Paulo", ("Sao Paulo,BR",)),
+    ("weather for rio de janeiro", ("Rio de Janeiro,BR",)),
+    ("weather in bombay", ("Mumbai,IN",)),
+    ("weather in Kiev", ("Kyiv,UA",)),
+    ("tokyo weather", ("Tokyo,JP",)),
+    ("weather for ho chi minh city and paris", ("Ho Chi Minh City,VN", "Paris,FR")),
+    ("weather in London, Paris and Tokyo", ("London,GB", "Paris,FR", "Tokyo,JP")),
+    ("compare the weather in nyc vs bombay", ("New York,US", "Mumbai,IN")),
+    ("weather in tokio and lundon", ("Tokyo,JP", "London,GB")),
+    ("weather in paris and paris", ("Paris,FR",)),
+    # Misrecognitions
+    ("weather in tokio", ("Tokyo,JP",)),
+    ("weather in banglore", ("Bangalore,IN",)),
+    ("weather in lundon", ("London,GB",)),
+    ("weather in tokio today", ("Tokyo,JP",)),
+    # Close in spelling but not in sound: another place, never swapped
+    ("weather in kannur", ()),
+    ("weather in kannur and london", ("London,GB",)),
+    # No known city: the handler falls back or refuses without an API call
+    ("weather", ()),
+    ("nice weather today", ()),
+    ("weather in xyzzy town", ()),
+    ("what is the weather like", ()),
+]
+
+
+def check_golden():
+    gazetteer = get_gazetteer()
+    failures = 0
+    for command, expected in GOLDEN_CORPUS:
+        cities, _ = find_cities(command, gazetteer)
+        actual = tuple(city.query for city in cities)
+        if actual != expected:
+            failures += 1
+            print(f"FAIL - '{command}': expected {expected!r}, got {actual!r}")
+    return failures
+
+
+class FakeClient:
+    """Weather client that knows no city and records what it was asked"""
+
+    def __init__(self):
+        self.asked = []
+
+    def get(self, query, budget=None):
+        self.asked.append(query)
+        return None
+
+
+def check(name, condition):
+    print(f"{'ok  ' if condition else 'FAIL'} {name}")
+    return 0 if condition else 1
+
+
+def run_policy_checks():
+    failures = 0
+    client = FakeClient()
+    strict = GAZETTEER_CONFIG['strict']
+    weather_client._client = client
+    try:
+        spoken = " ".join(weather_report("weather for the next hour"))
+        failures += check("phrase that isn't a place never reaches the API",
+                          not client.asked and "don't know a city called next hour" in spoken)
+
+        GAZETTEER_CONFIG['strict'] = False
+        spoken = " ".join(weather_report("weather in kannur"))
+        failures += check("non-strict: unknown place asked for as said", client.asked == ["kannur"])
+        failures += check("close city offered, not swapped in", "Did you mean Kanpur?" in spoken)
+
+        GAZETTEER_CONFIG['strict'] = True
+        client.asked = []
+        spoken = " ".join(weather_report("weather in kannur"))
+        failures += check("strict mode refuses without a request", not client.asked and "Did you mean Kanpur?" in spoken)
+    finally:
+        GAZETTEER_CONFIG['strict'] = strict
+        weather_client._client = None
+
+    # "loston" is one edit from both Lisbon and London
+    failures += check("equally close names go to the more populous city",
+                      get_gazetteer().closest("loston")[0].name == "London")
+
+    with tempfile.TemporaryDirectory() as root:
+        dump, out = os.path.join(root, "cities15000.txt"), os.path.join(root, "cities.tsv")
+        rows = [("Mumbai", "IN", 12691836), ("Mumbai", "IN", 20000), ("Paris", "FR", 2138551),
+                ("Paris", "US", 24171), ("Hamlet", "GB", 900)]
+        with open(dump, "w", encoding="utf-8") as f:
+            for i, (name, country, population) in enumerate(rows):
+                fields = [str(i), name, name] + [""] * 5 + [country] + [""] * 5 + [str(population)] + [""] * 4
+                f.write("\t".join(fields) + "\n")
+        with open(out, "w", encoding="utf-8") as f:
+            f.write("Mumbai\tIN\t\tbombay\n")
+        count = build_from_geonames(dump, out)
+        built = Gazetteer.load(out)
+        failures += check("GeoNames build keeps real populations and aliases",
+                          count == 3 and built.lookup("bombay") == ("Mumbai", "IN", 12691836))
+        failures += check("more populous namesake wins", built.lookup("paris").country == "FR")
+    return failures
+
+
+if __name__ == "__main__":
+    failures = check_golden()
+    print(f"Golden corpus: {len(GOLDEN_CORPUS) - failures}/{len(GOLDEN_CORPUS)} passed")
+    failures += run_policy_checks()
+    if failures:
+        sys.exit(1)
+
+    rounds = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    gazetteer = get_gazetteer()
+    commands = [command for command, _ in GOLDEN_CORPUS]
+    exact = [command for command, expected in GOLDEN_CORPUS if gazetteer.find_cities(command)]
+
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for command in exact:
+            gazetteer.find_cities(command)
+    exact_time = (time.perf_counter() - start) / (rounds * len(exact))
+
+    # Silence the DEBUG lines while timing
+    corrected_rounds = max(1, rounds // 20)
+    with contextlib.redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        for _ in range(corrected_rounds):
+            for command in commands:
+                find_cities(command, gazetteer)
+        full_time = (time.perf_counter() - start) / (corrected_rounds * len(commands))
+
+    print(f"{len(gazetteer)} names and aliases loaded")
+    print(f"exact match       {exact_time * 1e6:8.2f} us/command")
+    print(f"full corpus mix   {full_time * 1e6:8.2f} us/command (includes fuzzy correction)")
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+# bench_launchers.py - Behaviour checks and timing for launcher discovery against a throwaway XDG/$PATH tree
+
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import launchers
+
+DESKTOP_ENTRY = """[Desktop Entry]
+Type=Application
+Name={name}
+Exec={exec} %U
+Keywords={keywords}
+"""
+
+# Executables a stock Linux box has on $PATH that must never be reachable by voice
+DANGEROUS = ["poweroff", "reboot", "halt", "kill", "file", "systemd", "yes"]
+
+
+def write_desktop(directory, filename, name, command, keywords=""):
+    with open(os.path.join(directory, filename), "w", encoding="utf-8") as f:
+        f.write(DESKTOP_ENTRY.format(name=name, exec=command, keywords=keywords))
+
+
+def make_tree(root):
+    """XDG data dir with two launchers and a bin dir full of system executables"""
+    apps = os.path.join(root, "share", "applications")
+    bin_dir = os.path.join(root, "bin")
+    os.makedirs(apps)
+    os.makedirs(bin_dir)
+    write_desktop(apps, "org.gnome.Nautilus.desktop", "Files", "nautilus --new-window", "folder;file manager;")
+    write_desktop(apps, "firefox.desktop", "Firefox", "firefox", "web;browser;")
+    for name in DANGEROUS + ["code"]:
+        path = os.path.join(bin_dir, name)
+        with open(path, "w") as f:
+            f.write("#!/bin/sh\n")
+        os.chmod(path, 0o755)
+    os.environ["XDG_DATA_HOME"] = os.path.join(root, "share")
+    os.environ["XDG_DATA_DIRS"] = os.path.join(root, "none")
+    os.environ["PATH"] = bin_dir
+    return apps
+
+
+def check(name, condition):
+    print(f"{'ok  ' if condition else 'FAIL'} {name}")
+    return 0 if condition else 1
+
+
+def run_checks(root):
+    failures = 0
+    apps = make_tree(root)
+    config = {'cache_path': os.path.join(root, "cache", "launchers.json"), 'path_allowlist': []}
+
+    index = launchers.build_index(config)
+    failures += check("only .desktop launchers indexed by default", sorted(index.names) == ["files", "firefox"])
+    phrases = ["power off", "poweroff", "reboot", "halt", "kill all", "yes please", "system monitor"]
+    failures += check("system binaries unreachable by voice", all(not index.search(p) for p in phrases))
+    failures += check("launcher keyword still works", index.search("file manager")[0].name == "files")
+
+    allowed = dict(config, path_allowlist=["code", "poweroff"])
+    index = launchers.build_index(allowed)
+    failures += check("allowlist change invalidates the cache", "code" in index.names)
+    failures += check("allowlisted binary opens by exact name", index.search("code")[0].kind == "exact")
+    failures += check("allowlisted binaries never span or fuzzy matched",
+                      not index.search("code please") and not index.search("power off") and not index.search("cod"))
+
+    data = launchers.load_cache(os.path.expanduser(allowed['cache_path']), allowed['path_allowlist'])
+    failures += check("unchanged tree served from cache", data is not None)
+
+    # Edited in place (same directory entry, so only the file's own mtime moves)
+    later = time.time() + 5
+    write_desktop(apps, "firefox.desktop", "Firefox Nightly", "firefox-nightly")
+    os.utime(os.path.join(apps, "firefox.desktop"), (later, later))
+    failures += check("edited .desktop file invalidates the cache",
+                      launchers.load_cache(allowed['cache_path'], allowed['path_allowlist']) is None)
+    index = launchers.build_index(allowed)
+    failures += check("rescan picks up the edit", "firefox nightly" in index.names)
+
+    write_desktop(apps, "gimp.desktop", "GIMP", "gimp-2.10")
+    os.utime(apps, (later + 5, later + 5))
+    index = launchers.build_index(allowed)
+    failures += check("new .desktop file picked up", "gimp" in index.names)
+
+    return failures
+
+
+if __name__ == "__main__":
+    with tempfile.TemporaryDirectory() as root:
+        failures = run_checks(root)
+        if failures:
+            sys.exit(1)
+
+        config = {'cache_path': os.path.join(root, "cache", "launchers.json"), 'path_allowlist': ["code"]}
+        rounds = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+        start = time.perf_counter()
+        for _ in range(rounds):
+            launchers.scan(config['path_allowlist'])
+        scanned = (time.perf_counter() - start) / rounds
+        start = time.perf_counter()
+        for _ in range(rounds):
+            launchers.load_cache(config['cache_path'], config['path_allowlist'])
+        cached = (time.perf_counter() - start) / rounds
+    print(f"full scan       {scanned * 1e6:9.1f} us")
+    print(f"cache validate  {cached * 1e6:9.1f} us")
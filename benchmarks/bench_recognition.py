@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+# bench_recognition.py - Behaviour checks and timing for the speech fallback chain and multi-locale recognition
+
+import itertools
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import speech_recognition as sr
+
+from outbound import CLOSED, HALF_OPEN, OPEN, Budget
+from recognition import RecognitionCoordinator
+from speech_backends import FallbackChain, StubBackend
+
+AUDIO = sr.AudioData(b"\0\0" * 1600, 16000, 2)
+_names = itertools.count()
+
+
+class ScriptedStub(StubBackend):
+    """
+    StubBackend whose behaviour can change per call
+
+    `script` items are consumed one per call (the last one repeats):
+    a transcript string, "error" (RequestError), "unknown" (UnknownValueError)
+    or ("slow", seconds, transcript). Confidence may differ per locale.
+    """
+
+    def __init__(self, script, confidence=None, locale_aware=True):
+        super().__init__({})
+        # Breakers are shared by name, so every stub gets a fresh one
+        self.name = f"stub{next(_names)}"
+        self.script = list(script)
+        self.confidence = confidence or {}
+        self.locale_aware = locale_aware
+        self.calls = []
+
+    def recognize(self, recognizer, audio, language):
+        self.calls.append(language)
+        step = self.script.pop(0) if len(self.script) > 1 else self.script[0]
+        if isinstance(step, tuple):
+            _, seconds, step = step
+            time.sleep(seconds)
+        if step == "error":
+            raise sr.RequestError("injected failure")
+        if step == "unknown":
+            raise sr.UnknownValueError()
+        return step, self.confidence.get(language, 1.0)
+
+
+def make_chain(*backends, timeout=1.0, threshold=1, cooldown=60.0, primary="en-US"):
+    return FallbackChain(list(backends), timeouts={b.name: timeout for b in backends},
+                         failure_threshold=threshold, cooldown=cooldown, primary_language=primary)
+
+
+def recognize(chain, language="en-US", budget=None):
+    """(transcript, confidence), or the exception class raised"""
+    try:
+        return chain.recognize(None, AUDIO, language, budget)
+    except Exception as e:
+        return type(e)
+
+
+def check(name, condition):
+    print(f"{'ok  ' if condition else 'FAIL'} {name}")
+    return 0 if condition else 1
+
+
+def run_chain_checks():
+    failures = 0
+
+    stub = StubBackend({'stub_transcript': "what time is it"})
+    failures += check("stub backend returns the configured transcript",
+                      recognize(make_chain(stub)) == ("what time is it", 1.0))
+    failures += check("empty stub transcript means nothing understood",
+                      recognize(make_chain(StubBackend({}))) is sr.UnknownValueError)
+
+    broken, backup = ScriptedStub(["error"]), ScriptedStub(["open chrome"])
+    chain = make_chain(broken, backup)
+    failures += check("failover to the next backend", recognize(chain) == ("open chrome", 1.0))
+    failures += check("failed backend's breaker opens", chain.health[broken.name].state == OPEN)
+    recognize(chain)
+    failures += check("open breaker skips the backend", len(broken.calls) == 1 and len(backup.calls) == 2)
+
+    deaf, backup = ScriptedStub(["unknown"]), ScriptedStub(["hello"])
+    chain = make_chain(deaf, backup)
+    recognize(chain)
+    failures += check("not understanding isn't a failure", chain.health[deaf.name].state == CLOSED)
+
+    flaky = ScriptedStub(["error", "error", "back again"])
+    chain = make_chain(flaky, cooldown=0.1)
+    recognize(chain)
+    time.sleep(0.12)
+    failures += check("breaker half-open after the cooldown", chain.health[flaky.name].state == HALF_OPEN)
+    recognize(chain)
+    failures += check("failed probe reopens it", chain.health[flaky.name].state == OPEN)
+    time.sleep(0.25)  # Doubled cooldown
+    failures += check("successful probe closes it", recognize(chain) == ("back again", 1.0)
+                      and chain.health[flaky.name].state == CLOSED)
+
+    slow, fast = ScriptedStub([("slow", 0.5, "late")]), ScriptedStub(["fast"])
+    chain = make_chain(slow, fast, timeout=2.0)
+    start = time.perf_counter()
+    result = recognize(chain, budget=Budget(0.15))
+    elapsed = time.perf_counter() - start
+    failures += check("budget cuts the chain off", result is sr.RequestError and elapsed < 0.3 and not fast.calls)
+    failures += check("budget cut-off isn't the backend's failure", chain.health[slow.name].state == CLOSED)
+
+    # A probe cut short by the budget must not keep the backend locked out
+    slow = ScriptedStub(["error", ("slow", 0.3, "late"), "recovered"])
+    chain = make_chain(slow, timeout=2.0, cooldown=0.05)
+    recognize(chain)
+    time.sleep(0.06)
+    recognize(chain, budget=Budget(0.1))
+    recognize(chain, budget=Budget(0.0))
+    time.sleep(0.3)  # Let the abandoned call finish
+    failures += check("abandoned probe released", recognize(chain) == ("recovered", 1.0))
+
+    # Two locales, one transient error each: one failed utterance, not two
+    google = ScriptedStub(["error"])
+    chain = make_chain(google, ScriptedStub(["ok"]), threshold=2)
+    recognize(chain, "en-US")
+    recognize(chain, "en-IN")
+    failures += check("one failure per utterance across locales", chain.health[google.name].failures == 1
+                      and chain.health[google.name].state == CLOSED)
+
+    offline = ScriptedStub(["offline result"], locale_aware=False)
+    chain = make_chain(offline)
+    recognize(chain, "en-US")
+    failures += check("offline backend only runs for the primary locale",
+                      recognize(chain, "en-IN") is sr.RequestError and offline.calls == ["en-US"])
+    return failures
+
+
+def run_coordinator_checks():
+    failures = 0
+
+    def coordinator(chain, deadline=2.0):
+        return RecognitionCoordinator(None, languages=["en-US", "en-IN"], deadline=deadline,
+                                      confidence_threshold=0.8, recognize_fn=chain.recognize)
+
+    stub = ScriptedStub(["turn on the lights"], confidence={"en-US": 0.55, "en-IN": 0.7})
+    result = coordinator(make_chain(stub)).recognize(AUDIO)
+    failures += check("most confident locale wins", result.language == "en-IN" and result.confidence == 0.7)
+
+    stub = ScriptedStub(["tie"], confidence={"en-US": 0.6, "en-IN": 0.6})
+    failures += check("ties go to the first locale", coordinator(make_chain(stub)).recognize(AUDIO).language == "en-US")
+
+    stub = ScriptedStub(["hi"], confidence={"en-US": 0.9, "en-IN": 0.95})
+    failures += check("confident result accepted", coordinator(make_chain(stub)).recognize(AUDIO).confidence >= 0.8)
+
+    stub = ScriptedStub(["unknown"])
+    try:
+        coordinator(make_chain(stub)).recognize(AUDIO)
+        raised = None
+    except Exception as e:
+        raised = type(e)
+    failures += check("nothing understood in any locale", raised is sr.UnknownValueError)
+
+    stub = ScriptedStub(["error"])
+    try:
+        coordinator(make_chain(stub, ScriptedStub(["error"]))).recognize(AUDIO)
+        raised = None
+    except Exception as e:
+        raised = type(e)
+    failures += check("every locale failing is a request error", raised is sr.RequestError)
+
+    slow = ScriptedStub([("slow", 1.0, "late")])
+    start = time.perf_counter()
+    try:
+        coordinator(make_chain(slow, timeout=5.0), deadline=0.2).recognize(AUDIO)
+    except Exception:
+        pass
+    failures += check("deadline bounds the whole recognition", time.perf_counter() - start < 0.4)
+    return failures
+
+
+if __name__ == "__main__":
+    failures = run_chain_checks() + run_coordinator_checks()
+    if failures:
+        sys.exit(1)
+
+    rounds = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    stub = ScriptedStub(["what time is it"], confidence={"en-US": 0.9, "en-IN": 0.7})
+    coordinator = RecognitionCoordinator(None, languages=["en-US", "en-IN"], recognize_fn=make_chain(stub).recognize)
+    start = time.perf_counter()
+    for _ in range(rounds):
+        coordinator.recognize(AUDIO)
+    elapsed = time.perf_counter() - start
+    coordinator.shutdown()
+    print(f"two-locale recognition overhead (stub backend) {elapsed / rounds * 1e6:8.1f} us/utterance")
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+# bench_rewrite.py - Golden-output check and timing for commands.preprocess_command
+
+import os
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from commands import COMMAND_REPLACEMENTS, preprocess_command
+
+# (raw transcript, expected preprocess_command output)
+GOLDEN_CORPUS = [
+    ("Open the recycle bin", "open the recycle bin"),
+    ("empty recycle bin", "empty recycle bin"),
+    ("empty the recycling bin", "empty the recycle bin"),
+    ("open trash", "open recycle bin"),
+    ("empty trash please", "empty recycle bin please"),
+    ("clear recycle bin", "empty recycle bin"),
+    ("throw it in the garbage bin", "throw it in the recycle bin"),
+    ("open recycle", "open recycle bin"),
+    ("What is the time?", "time"),
+    ("what time is it", "time"),
+    ("tell me the time in London", "time in london"),
+    ("search for python tutorials", "search python tutorials"),
+    ("Google search best pizza near me", "search best pizza near me"),
+    ("look for cheap flights", "search cheap flights"),
+    ("play video of cats", "youtube of cats"),
+    ("open youtube", "youtube"),
+    ("launch application notepad", "open notepad"),
+    ("start chrome", "open chrome"),
+    ("run calculator", "open calculator"),
+    # Word boundaries: no rewrites inside other words
+    ("restart the router", "restart the router"),
+    ("what is the runtime of this movie", "what is the runtime of this movie"),
+    ("brunch places nearby", "brunch places nearby"),
+    ("startup news", "startup news"),
+    ("recently played songs", "recently played songs"),
+    # Misrecognitions
+    ("empty reciting bin", "empty recycle bin"),
+    ("open recipe bin", "open recycle bin"),
+    ("", ""),
+]
+
+
+def legacy_preprocess(command):
+    """The original loop of str.replace calls, one per table entry"""
+    if not command:
+        return ""
+    command = command.lower().strip()
+    command = re.sub(r'[^\w\s\-\'\"]+', ' ', command)
+    for old, new in COMMAND_REPLACEMENTS.items():
+        command = command.replace(old, new)
+    return ' '.join(command.split())
+
+
+def check_golden():
+    failures = 0
+    for raw, expected in GOLDEN_CORPUS:
+        actual = preprocess_command(raw)
+        if actual != expected:
+            failures += 1
+            print(f"FAIL - '{raw}': expected '{expected}', got '{actual}'")
+    return failures
+
+
+def run_benchmark(preprocess, corpus, rounds):
+    """Return total seconds spent preprocessing the corpus `rounds` times"""
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for raw in corpus:
+            preprocess(raw)
+    return time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    failures = check_golden()
+    print(f"Golden corpus: {len(GOLDEN_CORPUS) - failures}/{len(GOLDEN_CORPUS)} passed")
+    if failures:
+        sys.exit(1)
+
+    # Silence the DEBUG lines while timing
+    import contextlib
+    import io
+
+    rounds = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    corpus = [raw for raw, _ in GOLDEN_CORPUS]
+    total = rounds * len(corpus)
+    with contextlib.redirect_stdout(io.StringIO()):
+        legacy = run_benchmark(legacy_preprocess, corpus, rounds)
+        engine = run_benchmark(preprocess_command, corpus, rounds)
+    print(f"legacy     {legacy / total * 1e6:7.2f} us/command")
+    print(f"rewrite    {engine / total * 1e6:7.2f} us/command")
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+# bench_router.py - Compare the legacy keyword if-chain with the compiled intent router
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from intents import BUILTIN_INTENTS, IntentRegistry
+
+# Preprocessed transcripts, roughly the mix we see in scripted runs
+CORPUS = [
+    "time",
+    "what's the weather in london",
+    "open recycle bin",
+    "empty recycle bin",
+    "search python programming tutorials",
+    "open chrome",
+    "youtube lo-fi music for studying",
+    "open whatsapp",
+    "whatsapp mom saying i will be late tonight",
+    "hello",
+    "good morning how are you doing today",
+    "help",
+    "goodbye",
+    "tell me something interesting about black holes",
+    "ok",
+    "open notepad and type a long note about the quarterly planning meeting",
+]
+
+
+def legacy_route(command):
+    """The original main.process_command routing chain, minus the handlers"""
+    exit_keywords = ["exit", "quit", "goodbye", "bye", "stop", "end", "shutdown"]
+    if any(keyword in command for keyword in exit_keywords):
+        return "EXIT"
+    if "help" in command:
+        return "HELP"
+    greeting_keywords = ["hello", "hi", "hey", "greetings", "good morning", "good afternoon", "good evening"]
+    if any(keyword in command for keyword in greeting_keywords):
+        return "GREETING"
+    time_keywords = ["time", "clock", "what time"]
+    if any(keyword in command for keyword in time_keywords):
+        return "TIME"
+    weather_keywords = ["weather", "temperature", "forecast", "climate"]
+    if any(keyword in command for keyword in weather_keywords):
+        return "WEATHER"
+    recycle_keywords = ["recycle bin", "trash", "garbage", "waste bin"]
+    if any(keyword in command for keyword in recycle_keywords):
+        return "OS_COMMAND"
+    if "whatsapp" in command:
+        return "WHATSAPP"
+    youtube_keywords = ["youtube", "play video", "watch video"]
+    youtube_in_command = any(keyword in command for keyword in youtube_keywords)
+    general_play_keywords = ["play", "watch"]
+    if youtube_in_command or (any(keyword in command for keyword in general_play_keywords) and "youtube" not in command):
+        return "YOUTUBE"
+    search_keywords = ["search", "google", "look up", "find", "search for"]
+    if any(keyword in command for keyword in search_keywords):
+        return "SEARCH"
+    open_keywords = ["open", "launch", "start", "run"]
+    if any(keyword in command for keyword in open_keywords):
+        return "OPEN_APP"
+    if len(command.split()) > 2 and not any(char in command for char in "?!"):
+        return "INFERRED_SEARCH"
+    return "UNKNOWN"
+
+
+def run_benchmark(route, corpus, rounds):
+    """Return per-command latencies in microseconds"""
+    samples = []
+    for _ in range(rounds):
+        for command in corpus:
+            start = time.perf_counter()
+            route(command)
+            samples.append((time.perf_counter() - start) * 1e6)
+    samples.sort()
+    return samples
+
+
+def summarize(name, samples):
+    mean = sum(samples) / len(samples)
+    p50 = samples[len(samples) // 2]
+    p99 = samples[int(len(samples) * 0.99)]
+    print(f"{name:<10} mean {mean:7.2f} us   p50 {p50:7.2f} us   p99 {p99:7.2f} us")
+
+
+if __name__ == "__main__":
+    router = IntentRegistry(BUILTIN_INTENTS).router
+
+    # Both routers must agree before timing means anything
+    for command in CORPUS:
+        expected = legacy_route(command)
+        actual = router.route(command)
+        if expected != actual:
+            print(f"MISMATCH - '{command}': legacy={expected} router={actual}")
+            sys.exit(1)
+
+    rounds = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    print(f"Routing {len(CORPUS)} transcripts x {rounds} rounds")
+    print("-" * 50)
+    summarize("legacy", run_benchmark(legacy_route, CORPUS, rounds))
+    summarize("router", run_benchmark(router.route, CORPUS, rounds))
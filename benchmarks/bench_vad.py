@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+# bench_vad.py - Behaviour checks and timing for vad.py on synthetic PCM
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import numpy as np
+import speech_recognition as sr
+
+from config import VAD_CONFIG
+from vad import StreamingVad, trim_silence
+
+RATE = 16000
+CHUNK = 1024  # Samples per microphone read, as in sr.Microphone
+RNG = np.random.default_rng(7)
+
+
+def noise(seconds, db):
+    """White noise at roughly `db` dBFS"""
+    return RNG.normal(0.0, 10 ** (db / 20), int(RATE * seconds))
+
+
+def speech(seconds, db, floor_db):
+    """Voiced 'syllables': 220 ms of 150 Hz harmonics, 80 ms gaps down to the noise floor"""
+    t = np.arange(int(RATE * seconds)) / RATE
+    voiced = sum(np.sin(2 * np.pi * 150 * k * t) / k for k in range(1, 6))
+    voiced *= 10 ** (db / 20) / np.sqrt(np.mean(voiced ** 2))
+    envelope = (t % 0.3) < 0.22
+    return np.where(envelope, voiced, 0.0) + noise(seconds, floor_db)
+
+
+def pcm(samples):
+    return (np.clip(samples, -1.0, 1.0) * 32767).astype(np.int16).tobytes()
+
+
+def stream(vad, samples):
+    """Feed samples chunk by chunk; returns the per-chunk speech decisions"""
+    data = pcm(samples)
+    step = CHUNK * 2
+    return [vad.feed(data[i:i + step]) for i in range(0, len(data), step)]
+
+
+def chunks_for(seconds):
+    return int(seconds * RATE / CHUNK)
+
+
+def check(name, condition):
+    print(f"{'ok  ' if condition else 'FAIL'} {name}")
+    return 0 if condition else 1
+
+
+def run_checks():
+    failures = 0
+
+    clip = np.concatenate([noise(0.6, -55), speech(1.2, -20, -55), noise(0.6, -55)])
+    trimmed = trim_silence(sr.AudioData(pcm(clip), RATE, 2))
+    seconds = len(trimmed.get_raw_data()) / (2 * RATE) if trimmed else 0
+    failures += check("trim keeps the speech plus padding", 1.2 <= seconds <= 1.2 + 2 * VAD_CONFIG['padding_ms'] / 1000 + 0.3)
+    failures += check("pure noise trims to nothing", trim_silence(sr.AudioData(pcm(noise(1.0, -55)), RATE, 2)) is None)
+
+    vad = StreamingVad(RATE)
+    quiet = stream(vad, noise(1.0, -55))
+    talk = stream(vad, speech(1.0, -20, -55))
+    failures += check("quiet room is not speech", not any(quiet))
+    failures += check("speech detected within 150 ms", any(talk[:chunks_for(0.15) + 1]))
+
+    click = np.concatenate([noise(0.5, -55), noise(0.02, -10), noise(0.5, -55)])
+    failures += check("20 ms click ignored", not any(stream(StreamingVad(RATE), click)))
+
+    # A fan switches on: +25 dB, more than the speech margin
+    vad = StreamingVad(RATE)
+    stream(vad, noise(1.0, -60))
+    loud = stream(vad, noise(10.0, -35))
+    settle = chunks_for((VAD_CONFIG['max_speech_run_ms'] + 500) / 1000)
+    failures += check("noise floor catches up with a louder room", abs(vad.noise_db - (-35)) < 4)
+    failures += check("louder room stops counting as speech", not any(loud[settle:]))
+    talk = stream(vad, speech(1.0, -12, -35))
+    failures += check("speech still detected over the louder room", any(talk))
+
+    # Continuous speech alone must not drag the floor up
+    vad = StreamingVad(RATE)
+    stream(vad, noise(1.0, -55))
+    stream(vad, speech(8.0, -20, -55))
+    failures += check("long speech leaves the floor alone", vad.noise_db < -45)
+
+    return failures
+
+
+if __name__ == "__main__":
+    failures = run_checks()
+    if failures:
+        sys.exit(1)
+
+    data = pcm(speech(10.0, -20, -55))
+    vad = StreamingVad(RATE)
+    start = time.perf_counter()
+    for i in range(0, len(data), CHUNK * 2):
+        vad.feed(data[i:i + CHUNK * 2])
+    elapsed = time.perf_counter() - start
+    chunks = len(data) // (CHUNK * 2)
+    print(f"StreamingVad.feed {elapsed / chunks * 1e6:8.1f} us/chunk ({CHUNK / RATE * 1000:.0f} ms of audio)")
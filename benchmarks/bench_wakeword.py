@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+# bench_wakeword.py - Behaviour checks and timing for the wake word spotter on synthetic audio
+#
+# eval_wakeword.py measures real recordings; this needs no fixtures. The
+# "wake word" is a generated two-vowel word with a fricative ending, enrolled
+# as the template and then said again at other pitches and speeds.
+
+import os
+import sys
+import tempfile
+import time
+import wave
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import numpy as np
+import speech_recognition as sr
+
+import capture
+import voice_input
+from ui_channel import NullSink
+from wakeword import SAMPLE_RATE, WakeWordGate, WakeWordSpotter, evaluate, spotting_features
+
+RNG = np.random.default_rng(11)
+
+
+def vowel(seconds, f0_start, f0_end, formants, gain=0.3):
+    """Voiced segment: harmonics of a gliding pitch, shaped by formant peaks"""
+    n = int(seconds * SAMPLE_RATE)
+    t = np.arange(n) / SAMPLE_RATE
+    f0 = np.linspace(f0_start, f0_end, n)
+    phase = 2 * np.pi * np.cumsum(f0) / SAMPLE_RATE
+    out = np.zeros(n)
+    for k in range(1, 30):
+        amp = sum(np.exp(-((k * f0 - f) / 120) ** 2) for f in formants) + 0.05
+        out += amp * np.sin(k * phase) / k
+    envelope = np.minimum(1, np.minimum(t / 0.02, (seconds - t) / 0.03))
+    return gain * out * envelope / np.max(np.abs(out))
+
+
+def fricative(seconds, gain=0.08):
+    """High-frequency noise, an 's'"""
+    hiss = np.diff(RNG.normal(0, 1, int(seconds * SAMPLE_RATE)), prepend=0)
+    return gain * hiss / np.max(np.abs(hiss))
+
+
+def wake_word(pitch=1.0, stretch=1.0):
+    return np.concatenate([
+        fricative(0.05 * stretch, 0.05),
+        vowel(0.18 * stretch, 140 * pitch, 120 * pitch, [700, 1200]),
+        vowel(0.08 * stretch, 120 * pitch, 115 * pitch, [500, 1500]),
+        vowel(0.15 * stretch, 115 * pitch, 95 * pitch, [300, 2200]),
+        fricative(0.12 * stretch),
+    ])
+
+
+def utterance(samples, before=0.2, after=0.3):
+    """Samples with room noise around them, as the microphone would deliver"""
+    padded = np.concatenate([np.zeros(int(before * SAMPLE_RATE)), samples, np.zeros(int(after * SAMPLE_RATE))])
+    return (padded + RNG.normal(0, 0.003, len(padded))).astype(np.float32)
+
+
+def audio_data(samples):
+    return sr.AudioData((np.clip(samples, -1.0, 1.0) * 32767).astype(np.int16).tobytes(), SAMPLE_RATE, 2)
+
+
+def write_wav(path, samples):
+    with wave.open(path, "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(SAMPLE_RATE)
+        wav.writeframes((np.clip(samples, -1.0, 1.0) * 32767).astype(np.int16).tobytes())
+
+
+POSITIVES = {
+    "same speaker": lambda: utterance(wake_word()),
+    "higher pitch": lambda: utterance(wake_word(pitch=1.08)),
+    "slower": lambda: utterance(wake_word(pitch=0.95, stretch=1.15)),
+    "faster": lambda: utterance(wake_word(pitch=1.05, stretch=0.88)),
+    "followed by a command": lambda: utterance(np.concatenate([wake_word(1.03, 1.05), vowel(0.4, 130, 110, [600, 1000])])),
+}
+NEGATIVES = {
+    "noise": lambda: utterance(RNG.normal(0, 0.05, SAMPLE_RATE)),
+    "440 Hz tone": lambda: utterance(0.2 * np.sin(2 * np.pi * 440 * np.arange(SAMPLE_RATE) / SAMPLE_RATE)),
+    "another word": lambda: utterance(np.concatenate([vowel(0.2, 180, 200, [300, 2400]), fricative(0.1),
+                                                      vowel(0.25, 200, 150, [800, 1300])])),
+    "silence": lambda: utterance(np.zeros(SAMPLE_RATE)),
+}
+
+
+class FakeSession:
+    """Stands in for the audio session in the blocking listen path"""
+
+    def __init__(self, samples):
+        self.samples = samples
+
+    def listen(self):
+        return audio_data(self.samples)
+
+
+def check(name, condition):
+    print(f"{'ok  ' if condition else 'FAIL'} {name}")
+    return 0 if condition else 1
+
+
+def run_checks():
+    failures = 0
+
+    with tempfile.TemporaryDirectory() as root:
+        for folder, cases in (("templates", {"enrolled": lambda: utterance(wake_word(), 0.1, 0.1)}),
+                              ("positive", POSITIVES), ("negative", NEGATIVES)):
+            os.makedirs(os.path.join(root, folder))
+            for name, make in cases.items():
+                write_wav(os.path.join(root, folder, name.replace(" ", "_") + ".wav"), make())
+        spotter = WakeWordSpotter.from_directory(os.path.join(root, "templates"))
+        paths = {folder: sorted(os.path.join(root, folder, f) for f in os.listdir(os.path.join(root, folder)))
+                 for folder in ("positive", "negative")}
+        result = evaluate(spotter, paths["positive"], paths["negative"])
+    failures += check("template enrolled from a WAV", len(spotter.templates) == 1)
+    failures += check("wake word found at other pitches and speeds", result['false_rejects'] == 0)
+    failures += check("noise, tone and other words rejected", result['false_accepts'] == 0)
+
+    positive = max(spotter.score(make()) for make in POSITIVES.values())
+    negative = min(spotter.score(make()) for make in NEGATIVES.values())
+    failures += check(f"clear margin at the configured threshold ({positive:.1f} < {spotter.threshold:.1f} < {negative:.1f})",
+                      positive < spotter.threshold * 0.5 and negative > spotter.threshold * 1.2)
+
+    gate = WakeWordGate(spotter, follow_up_seconds=60)
+    decisions = [gate.allow(audio_data(NEGATIVES["another word"]())),
+                 gate.allow(audio_data(POSITIVES["same speaker"]())),
+                 gate.allow(audio_data(NEGATIVES["another word"]()))]
+    failures += check("gate opens on the wake word for follow-ups", decisions == [False, True, True])
+
+    # The blocking fallback applies the same gate as the background pipeline
+    real = voice_input.get_audio_session, voice_input.recognize_audio, capture._wake_word_gate, capture._wake_word_loaded
+    recognized = []
+    try:
+        voice_input.recognize_audio = lambda audio, gui: recognized.append(audio) or "heard"
+        capture._wake_word_gate, capture._wake_word_loaded = WakeWordGate(spotter), True
+        heard = []
+        for samples in (NEGATIVES["another word"](), POSITIVES["followed by a command"]()):
+            voice_input.get_audio_session = lambda gui=None, samples=samples: FakeSession(samples)
+            heard.append(voice_input.listen_for_command(NullSink()))
+    finally:
+        voice_input.get_audio_session, voice_input.recognize_audio, capture._wake_word_gate, capture._wake_word_loaded = real
+    failures += check("blocking listen drops audio without the wake word", heard == ["", "heard"] and len(recognized) == 1)
+    return failures
+
+
+if __name__ == "__main__":
+    failures = run_checks()
+    if failures:
+        sys.exit(1)
+
+    rounds = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    spotter = WakeWordSpotter(templates=[spotting_features(utterance(wake_word(), 0.1, 0.1))])
+    samples = POSITIVES["followed by a command"]()
+    start = time.perf_counter()
+    for _ in range(rounds):
+        spotter.detect(samples)
+    elapsed = time.perf_counter() - start
+    print(f"WakeWordSpotter.detect, one template {elapsed / rounds * 1000:8.2f} ms/utterance "
+          f"({len(samples) / SAMPLE_RATE:.1f} s of audio)")
@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+# bench_weather.py - Behaviour checks and timing for weather_client.WeatherClient against a local stub server
+
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from config import WEATHER_CONFIG
+import weather_client
+from handlers.weather import weather_report
+from outbound import Budget, CircuitOpenError, HALF_OPEN, OPEN, get_breaker
+from weather_client import PREFETCH_ENDPOINT, FutureTimeout, WeatherClient, WeatherPrefetcher
+from weather_stub import StubWeatherServer
+
+
+def make_client(stub, **overrides):
+    # Breakers are shared; start every check with them closed
+    get_breaker("weather").record_success()
+    get_breaker(PREFETCH_ENDPOINT).record_success()
+    config = dict(WEATHER_CONFIG, base_url=stub.url, timeout=2, **overrides)
+    return WeatherClient(api_key="test", config=config)
+
+
+def check(name, condition):
+    print(f"{'ok  ' if condition else 'FAIL'} {name}")
+    return 0 if condition else 1
+
+
+def run_checks():
+    failures = 0
+
+    with StubWeatherServer() as stub:
+        client = make_client(stub)
+        report = client.get("London")
+        failures += check("report parsed", report is not None and report.city == "London" and report.humidity == 81)
+        client.get("  london ")
+        failures += check("second lookup served from cache", stub.requests == 1 and client.stats['hits'] == 1)
+        failures += check("unknown city returns None", client.get("Atlantis") is None)
+        for city in ("Paris", "Tokyo", "Sydney"):
+            client.get(city)
+        failures += check("keep-alive connection reused", len(stub.connections) == 1)
+
+    with StubWeatherServer(latency=0.2) as stub:
+        client = make_client(stub)
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(client.get("Paris"))) for _ in range(10)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        failures += check("10 concurrent lookups -> 1 request", stub.requests == 1 and len(results) == 10
+                          and all(r == results[0] for r in results))
+
+    with StubWeatherServer(latency=0.2) as stub:
+        client = make_client(stub, ttl=0.0, stale_ttl=60)
+        client.get("Tokyo")
+        start = time.perf_counter()
+        client.get("Tokyo")
+        elapsed = time.perf_counter() - start
+        failures += check("stale report returned without waiting", elapsed < 0.05 and client.stats['stale_hits'] == 1)
+        time.sleep(0.4)
+        failures += check("stale report refreshed in background", stub.requests == 2)
+
+    with StubWeatherServer() as stub:
+        client = make_client(stub, cache_size=2)
+        for city in ("London", "Paris", "London", "Tokyo"):
+            client.get(city)
+        client.get("London")
+        client.get("Paris")
+        failures += check("least recently used city evicted", stub.requests == 4)
+
+    with StubWeatherServer(status={"london": 503}) as stub:
+        client = make_client(stub)
+        try:
+            client.get("London")
+            raised = False
+        except Exception:
+            raised = True
+        failures += check("server error raised, not cached", raised and client.cached("London") is None)
+
+    with StubWeatherServer() as stub:
+        client = make_client(stub)
+        prefetcher = WeatherPrefetcher(client, ["New York", "London", "New York", "Tokyo"], client.config)
+        delay = prefetcher.refresh_round()
+        failures += check("prefetch warms every city once", stub.requests == 3 and client.cached("Tokyo") is not None)
+        interval, jitter = client.config['prefetch_interval'], client.config['prefetch_jitter']
+        failures += check("next round is jittered around the interval",
+                          interval * (1 - jitter) <= delay <= interval * (1 + jitter))
+        prefetcher.refresh_round()
+        failures += check("fresh cities not refetched", stub.requests == 3)
+
+    with StubWeatherServer() as stub:
+        client = make_client(stub, prefetch_budget=2)
+        WeatherPrefetcher(client, ["London", "Paris", "Tokyo"], client.config).refresh_round()
+        failures += check("request budget honoured", stub.requests == 2)
+
+    with StubWeatherServer(status={"london": 503}) as stub:
+        client = make_client(stub, prefetch_jitter=0.0)
+        prefetcher = WeatherPrefetcher(client, ["London"], client.config)
+        delays = [prefetcher.refresh_round() for _ in range(3)]
+        base = client.config['prefetch_backoff']
+        failures += check("errors back off exponentially", delays == [base, base * 2, base * 4])
+        failures += check("prefetch failures leave the interactive breaker closed",
+                          get_breaker(PREFETCH_ENDPOINT).state == OPEN and get_breaker("weather").state != OPEN)
+
+    with StubWeatherServer(malformed={"london"}) as stub:
+        client = make_client(stub, prefetch_jitter=0.0, prefetch_backoff=0.05)
+        prefetcher = WeatherPrefetcher(client, ["London", "Paris"], client.config).start()
+        time.sleep(0.3)
+        prefetcher.stop()
+        failures += check("malformed response doesn't kill the prefetch thread",
+                          prefetcher._thread.is_alive() and stub.requests >= 2)
+
+    with StubWeatherServer(latency=0.2) as stub:
+        client = make_client(stub)
+        start = time.perf_counter()
+        results = list(client.get_many(["London", "Paris", "Tokyo"], deadline=2.0))
+        elapsed = time.perf_counter() - start
+        failures += check("3 cities fetched concurrently", elapsed < 0.35 and all(r for _, r, _ in results))
+        failures += check("results in the order asked", [r.city for _, r, _ in results] == ["London", "Paris", "Tokyo"])
+
+    with StubWeatherServer(delays={"tokyo": 1.5}) as stub:
+        client = make_client(stub)
+        start = time.perf_counter()
+        results = list(client.get_many(["London", "Tokyo", "Paris"], deadline=0.5))
+        elapsed = time.perf_counter() - start
+        failures += check("slow city cut off at the shared deadline", 0.45 < elapsed < 0.65
+                          and isinstance(results[1][2], FutureTimeout))
+        failures += check("partial results kept", results[0][1] is not None and results[2][1] is not None)
+        time.sleep(1.2)
+        failures += check("late city lands in the cache", client.cached("Tokyo") is not None)
+
+    with StubWeatherServer(delays={"tokyo": 1.5}) as stub:
+        weather_client._client = make_client(stub, fanout_deadline=0.5)
+        spoken = " ".join(weather_report("weather in London, Paris, Tokyo and Xyzzy"))
+        weather_client._client = None
+        failures += check("combined summary names the late and unknown cities",
+                          "London" in spoken and "Paris" in spoken and "Tokyo is taking too long" in spoken
+                          and "Xyzzy" in spoken)
+        print(f"     \"{spoken}\"")
+
+    with StubWeatherServer(latency=1.0) as stub:
+        client = make_client(stub)
+        start = time.perf_counter()
+        try:
+            client.get("London", Budget(0.3))
+        except Exception:
+            pass
+        failures += check("request timeout follows the command budget", time.perf_counter() - start < 0.5)
+
+    with StubWeatherServer(status={"london": 503}) as stub:
+        client = make_client(stub)
+        breaker = get_breaker("weather")
+        breaker.base_reset_timeout = breaker.reset_timeout = 0.3
+        for _ in range(breaker.failure_threshold):
+            try:
+                client.fetch("London")
+            except Exception:
+                pass
+        start = time.perf_counter()
+        try:
+            client.fetch("Paris")
+            opened = False
+        except CircuitOpenError:
+            opened = True
+        failures += check("breaker opens after repeated failures", opened and breaker.state == OPEN
+                          and stub.requests == breaker.failure_threshold and time.perf_counter() - start < 0.01)
+        time.sleep(0.35)
+        failures += check("breaker half-open after the reset timeout", breaker.state == HALF_OPEN)
+        try:
+            client.fetch("London")
+        except Exception:
+            pass
+        failures += check("failed probe reopens with a longer wait", breaker.state == OPEN and breaker.reset_timeout == 0.6)
+        time.sleep(0.65)
+        client.fetch("Paris")
+        failures += check("successful probe closes the breaker", breaker.state != OPEN and breaker.failures == 0)
+
+    with StubWeatherServer(status={"london": 503}) as stub:
+        client = make_client(stub, ttl=0.0, stale_ttl=0.0)
+        client._cache["london,gb"] = (client.fetch("Paris")._replace(city="London"), time.monotonic() - 1800)
+        for _ in range(get_breaker("weather").failure_threshold):
+            try:
+                client.fetch("London,GB")
+            except Exception:
+                pass
+        weather_client._client = client
+        start = time.perf_counter()
+        spoken = " ".join(weather_report("weather in london", Budget(4.0)))
+        elapsed = time.perf_counter() - start
+        weather_client._client = None
+        failures += check("open breaker answers at once from the last report", elapsed < 0.05
+                          and "not waiting" in spoken and "30 minutes ago" in spoken)
+        print(f"     \"{spoken}\"")
+
+        # Same outage, several cities: each falls back to its own last report
+        client._cache["tokyo,jp"] = (client._cache["london,gb"][0]._replace(city="Tokyo"), time.monotonic() - 600)
+        weather_client._client = client
+        spoken = " ".join(weather_report("weather in london, tokyo and sydney", Budget(4.0)))
+        weather_client._client = None
+        failures += check("open breaker answers each city from its last report",
+                          "London, clear sky, 17°C, from 30 minutes ago" in spoken
+                          and "Tokyo, clear sky, 17°C, from 10 minutes ago" in spoken
+                          and "couldn't reach the weather service for Sydney" in spoken)
+        print(f"     \"{spoken}\"")
+        get_breaker("weather").base_reset_timeout = get_breaker("weather").reset_timeout = 30.0
+
+    return failures
+
+
+if __name__ == "__main__":
+    failures = run_checks()
+    if failures:
+        sys.exit(1)
+
+    rounds = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    with StubWeatherServer() as stub:
+        client = make_client(stub)
+        start = time.perf_counter()
+        for _ in range(20):
+            client.fetch("London")
+        network = (time.perf_counter() - start) / 20
+        client.get("London")
+        start = time.perf_counter()
+        for _ in range(rounds):
+            client.get("London")
+        cached = (time.perf_counter() - start) / rounds
+    print(f"network (local stub, keep-alive) {network * 1e6:9.1f} us/lookup")
+    print(f"cached                           {cached * 1e6:9.1f} us/lookup")
@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+# eval_wakeword.py - False-accept / false-reject rates of the wake word spotter on WAV fixtures
+#
+# Usage: python benchmarks/eval_wakeword.py <fixtures_dir> [templates_dir]
+#
+# <fixtures_dir> must contain positive/*.wav (utterances starting with "jarvis")
+# and negative/*.wav (speech or noise without it). Templates default to
+# WAKE_WORD_CONFIG['templates_dir'].
+
+import glob
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from config import WAKE_WORD_CONFIG
+from wakeword import WakeWordSpotter, evaluate
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("Usage: python benchmarks/eval_wakeword.py <fixtures_dir> [templates_dir]")
+        sys.exit(2)
+
+    fixtures = sys.argv[1]
+    templates_dir = sys.argv[2] if len(sys.argv) > 2 else WAKE_WORD_CONFIG['templates_dir']
+    positives = sorted(glob.glob(os.path.join(fixtures, "positive", "*.wav")))
+    negatives = sorted(glob.glob(os.path.join(fixtures, "negative", "*.wav")))
+
+    spotter = WakeWordSpotter.from_directory(templates_dir)
+    if not spotter.templates:
+        print(f"No templates found in {templates_dir}. Record some with: python wakeword.py enroll")
+        sys.exit(1)
+
+    print(f"{len(spotter.templates)} templates, {len(positives)} positive and {len(negatives)} negative fixtures")
+    print("-" * 50)
+    base = WAKE_WORD_CONFIG['threshold']
+    for threshold in (base * 0.8, base * 0.9, base, base * 1.1, base * 1.2):
+        spotter.threshold = threshold
+        result = evaluate(spotter, positives, negatives)
+        marker = "  <- configured" if threshold == base else ""
+        print(f"threshold {threshold:6.2f}: FRR {result['frr']:6.1%} ({result['false_rejects']}/{result['positives']})  "
+              f"FAR {result['far']:6.1%} ({result['false_accepts']}/{result['negatives']})  "
+              f"{result['mean_ms']:.1f} ms/clip{marker}")
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+# weather_stub.py - Local stand-in for the OpenWeatherMap current-weather endpoint
+#
+# Used by the weather benchmarks; run directly to serve on a fixed port:
+#     python benchmarks/weather_stub.py 8765
+
+import json
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+KNOWN_CITIES = {
+    "london": ("London", "light rain", 12.3, 11.1, 81),
+    "paris": ("Paris", "clear sky", 17.0, 16.2, 55),
+    "tokyo": ("Tokyo", "few clouds", 22.4, 22.9, 64),
+    "new york": ("New York", "broken clouds", 15.8, 15.0, 60),
+    "sydney": ("Sydney", "scattered clouds", 19.1, 18.7, 70),
+    "ahmedabad": ("Ahmedabad", "haze", 33.0, 35.2, 40),
+    "mumbai": ("Mumbai", "mist", 30.2, 36.0, 79),
+}
+
+
+class StubWeatherServer:
+    """
+    Threaded HTTP/1.1 server answering /data/2.5/weather?q=<city>
+
+    Args:
+        latency: Seconds added to every response
+        delays: {city: seconds} extra latency for specific cities
+        status: {city: HTTP status} forced error responses
+        malformed: Cities answered with 200 and a body missing every field
+    """
+
+    def __init__(self, latency=0.0, delays=None, status=None, malformed=(), port=0):
+        self.latency = latency
+        self.delays = delays or {}
+        self.status = status or {}
+        self.malformed = set(malformed)
+        self.requests = 0
+        self.connections = set()
+        self._lock = threading.Lock()
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"  # Keep-alive, like the real API
+            disable_nagle_algorithm = True
+
+            def do_GET(self):
+                query = parse_qs(urlparse(self.path).query)
+                # "London,GB" and "london" name the same city
+                city = " ".join(query.get('q', [''])[0].split(",")[0].lower().split())
+                with stub._lock:
+                    stub.requests += 1
+                    stub.connections.add(self.client_address)
+                time.sleep(stub.latency + stub.delays.get(city, 0.0))
+                if city in stub.status:
+                    self._reply(stub.status[city], {'cod': stub.status[city], 'message': 'injected error'})
+                elif city in stub.malformed:
+                    self._reply(200, {'cod': 200})
+                elif city in KNOWN_CITIES:
+                    name, condition, temp, feels_like, humidity = KNOWN_CITIES[city]
+                    self._reply(200, {
+                        'name': name,
+                        'weather': [{'description': condition}],
+                        'main': {'temp': temp, 'feels_like': feels_like, 'humidity': humidity},
+                    })
+                else:
+                    self._reply(404, {'cod': '404', 'message': 'city not found'})
+
+            def _reply(self, code, payload):
+                body = json.dumps(payload).encode()
+                self.send_response(code)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                try:
+                    self.end_headers()
+                    self.wfile.write(body)
+                except (BrokenPipeError, ConnectionResetError):
+                    pass  # The client timed out and hung up
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", port), Handler)
+        self.server.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}/data/2.5/weather"
+        self._thread = None
+
+    def __enter__(self):
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+if __name__ == "__main__":
+    port = int(sys.argv[1]) if len(sys.argv) > 1 else 8765
+    with StubWeatherServer(port=port) as stub:
+        print(f"Serving {stub.url} (Ctrl+C to stop)")
+        try:
+            threading.Event().wait()
+        except KeyboardInterrupt:
+            pass
@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+# browser.py - One browser controller shared by the search, YouTube and WhatsApp handlers
+
+import json
+import threading
+import time
+import urllib.request
+import webbrowser
+from urllib.parse import quote, urlencode, urlsplit, urlunsplit
+
+from config import BROWSER_CONFIG
+
+
+def google_search_url(query):
+    return "https://www.google.com/search?" + urlencode({'q': query})
+
+
+def youtube_search_url(query):
+    return "https://www.youtube.com/results?" + urlencode({'search_query': query})
+
+
+def whatsapp_send_uri(text):
+    """whatsapp:// deep link with the message prefilled (%20 for spaces, as the app expects)"""
+    return "whatsapp://send?" + urlencode({'text': text}, quote_via=quote)
+
+
+def _debounce_key(url):
+    # Scheme and host are case-insensitive; a trailing fragment doesn't load a new page
+    parts = urlsplit(url)
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), parts.path or "/", parts.query, ""))
+
+
+class BrowserController:
+    """
+    Opens pages as tabs in the user's running browser.
+
+    The webbrowser controller is resolved once (the PATH scan behind
+    webbrowser.get() is the slow part) and every page is opened with
+    open_new_tab(), which hands the URL to the existing browser window
+    instead of starting a new one. If BROWSER_CONFIG['devtools_port'] names
+    the remote-debugging port of a running Chromium-family browser, tabs are
+    opened over that HTTP endpoint instead and no process is spawned at all.
+
+    Opening the same URL again within `debounce_seconds` is ignored, so a
+    repeated or re-queued command doesn't stack identical tabs.
+    """
+
+    def __init__(self, config=BROWSER_CONFIG):
+        self.config = config
+        self._controller = None
+        self._devtools = None  # Base URL of a reachable DevTools endpoint
+        self._resolved = False
+        self._recent = {}  # debounce key -> monotonic time opened
+        self._lock = threading.Lock()
+
+    def resolve(self):
+        """Find the browser (once); safe to call from several threads"""
+        with self._lock:
+            if self._resolved:
+                return
+            port = self.config.get('devtools_port')
+            if port:
+                base = f"http://127.0.0.1:{port}"
+                try:
+                    with urllib.request.urlopen(f"{base}/json/version", timeout=self.config['devtools_timeout']) as response:
+                        print(f"DEBUG - Opening tabs through DevTools ({json.load(response).get('Browser', 'browser')})")
+                    self._devtools = base
+                except (OSError, ValueError) as e:
+                    print(f"DEBUG - No DevTools endpoint on port {port} ({e}); using the browser command")
+            name = self.config.get('browser')
+            if name:
+                try:
+                    self._controller = webbrowser.get(name)
+                except webbrowser.Error as e:
+                    print(f"Warning: browser '{name}' not found ({e}); using the system default")
+            if self._controller is None:
+                try:
+                    self._controller = webbrowser.get()
+                except webbrowser.Error as e:
+                    print(f"Warning: no browser available ({e}); pages can't be opened")
+            self._resolved = True
+
+    def warm_up(self):
+        """Resolve the browser in the background so the first command doesn't wait for it"""
+        threading.Thread(target=self.resolve, name="browser-resolve", daemon=True).start()
+
+    def _is_duplicate(self, key):
+        with self._lock:
+            last = self._recent.get(key)
+            return last is not None and time.monotonic() - last < self.config['debounce_seconds']
+
+    def _remember(self, key):
+        """Start the debounce window for a page that was actually opened"""
+        now = time.monotonic()
+        with self._lock:
+            self._recent = {k: t for k, t in self._recent.items() if now - t < self.config['debounce_seconds']}
+            self._recent[key] = now
+
+    def _open_devtools(self, url):
+        # Chrome 111+ only accepts PUT for /json/new
+        request = urllib.request.Request(f"{self._devtools}/json/new?{quote(url, safe='')}", method="PUT")
+        with urllib.request.urlopen(request, timeout=self.config['devtools_timeout']) as response:
+            response.read()
+
+    def open(self, url):
+        """
+        Open a URL in a new tab of the shared browser window
+
+        Returns:
+            bool: True if a tab was opened, False if it was a duplicate or failed
+        """
+        key = _debounce_key(url)
+        if self._is_duplicate(key):
+            print(f"DEBUG - Ignoring repeated open of {url}")
+            return False
+        self.resolve()
+        # Only a page that opened starts the debounce window, so a failed open can be retried at once
+        opened = self._open_tab(url)
+        if opened:
+            self._remember(key)
+        return opened
+
+    def _open_tab(self, url):
+        if self._devtools is not None:
+            try:
+                self._open_devtools(url)
+                return True
+            except (OSError, ValueError) as e:
+                print(f"DEBUG - DevTools open failed ({e}); falling back to the browser command")
+                self._devtools = None
+        if self._controller is None:
+            print(f"Error opening browser: no browser available for {url}")
+            return False
+        try:
+            return bool(self._controller.open_new_tab(url))
+        except Exception as e:
+            print(f"Error opening browser: {e}")
+            return False
+
+
+_browser = None
+_browser_lock = threading.Lock()
+
+
+def get_browser():
+    """Return the shared browser controller, creating it on first use"""
+    global _browser
+    with _browser_lock:
+        if _browser is None:
+            _browser = BrowserController()
+        return _browser
+
+
+def open_url(url):
+    """Open a URL through the shared controller (debounced)"""
+    return get_browser().open(url)
@@ -0,0 +1,286 @@
+#!/usr/bin/env python3
+# capture.py - Continuous background capture into a bounded utterance queue
+
+import threading
+import time
+
+import speech_recognition as sr
+
+from audio_session import get_audio_session
+from config import BARGE_IN_CONFIG, CAPTURE_CONFIG, WAKE_WORD_CONFIG
+from ui_channel import NullSink
+from voice_output import playback_state, stop_speaking
+
+
+class UtteranceRingBuffer:
+    """
+    Bounded FIFO of utterances stored in one preallocated byte ring.
+
+    PCM bytes are copied into a fixed bytearray, so capture never allocates
+    per utterance. When either the byte ring or the slot table is full, the
+    oldest utterances are dropped to make room: during a burst the newest
+    speech is the most relevant.
+    """
+
+    def __init__(self, capacity_bytes, max_utterances):
+        self._ring = bytearray(capacity_bytes)
+        self._capacity = capacity_bytes
+        self._slots = [None] * max_utterances  # (offset, length, sample_rate, sample_width)
+        self._head = 0  # Index of the oldest slot
+        self._count = 0
+        self._write_offset = 0
+        self._used = 0
+        self._cond = threading.Condition()
+        self.dropped = 0
+
+    @property
+    def capacity(self):
+        return self._capacity
+
+    def __len__(self):
+        with self._cond:
+            return self._count
+
+    def _drop_oldest(self):
+        offset, length, _, _ = self._slots[self._head]
+        self._slots[self._head] = None
+        self._head = (self._head + 1) % len(self._slots)
+        self._count -= 1
+        self._used -= length
+        self.dropped += 1
+
+    def put(self, audio):
+        """Copy an AudioData into the ring; returns False if it can never fit"""
+        data = audio.get_raw_data()
+        length = len(data)
+        if length > self._capacity:
+            return False
+
+        with self._cond:
+            while self._count and (self._count == len(self._slots) or self._used + length > self._capacity):
+                self._drop_oldest()
+            if self._count == 0:
+                self._write_offset = 0
+
+            offset = self._write_offset
+            first = min(length, self._capacity - offset)
+            self._ring[offset:offset + first] = data[:first]
+            if first < length:
+                self._ring[0:length - first] = data[first:]
+            self._write_offset = (offset + length) % self._capacity
+            self._used += length
+
+            tail = (self._head + self._count) % len(self._slots)
+            self._slots[tail] = (offset, length, audio.sample_rate, audio.sample_width)
+            self._count += 1
+            self._cond.notify()
+        return True
+
+    def get(self, timeout=None):
+        """
+        Remove and return the oldest utterance as AudioData
+
+        Returns None if nothing arrived within `timeout` seconds.
+        """
+        with self._cond:
+            if not self._cond.wait_for(lambda: self._count > 0, timeout):
+                return None
+            offset, length, sample_rate, sample_width = self._slots[self._head]
+            first = min(length, self._capacity - offset)
+            data = bytes(self._ring[offset:offset + first])
+            if first < length:
+                data += bytes(self._ring[0:length - first])
+            self._slots[self._head] = None
+            self._head = (self._head + 1) % len(self._slots)
+            self._count -= 1
+            self._used -= length
+            return sr.AudioData(data, sample_rate, sample_width)
+
+    def clear(self):
+        with self._cond:
+            while self._count:
+                self._drop_oldest()
+
+
+class CapturePipeline:
+    """
+    Keeps the microphone listening on a background thread.
+
+    Each utterance is segmented by the recognizer's energy/pause detection on
+    the shared audio session and pushed into an UtteranceRingBuffer, so speech
+    that arrives while a handler runs or TTS plays is queued instead of lost.
+
+    With an echo gate, Jarvis's own voice never starts an utterance, and real
+    speech over a response stops it (barge-in). Without one (barge-in
+    disabled, or no numpy), anything heard while Jarvis is talking, or within
+    BARGE_IN_CONFIG['echo_tail_ms'] after, is dropped: otherwise the help
+    text's "Goodbye to exit" would be queued as a command.
+
+    The GUI's listening animation follows the VAD: it starts at speech onset
+    and stops when the utterance ends, so the window idles between commands.
+    Without VAD there is no onset event and the animation stays off.
+    """
+
+    def __init__(self, session=None, config=CAPTURE_CONFIG):
+        self.config = config
+        self.session = session
+        # Sized for 16-bit mono at 16 kHz; start() grows it to fit the real device
+        self.buffer = UtteranceRingBuffer(int(2 * 16000 * config['buffer_seconds']), config['max_utterances'])
+        self._stop = threading.Event()
+        self._thread = None
+        self.on_error = None
+        # Optional wakeword.WakeWordGate; utterances it rejects never reach the queue
+        self.gate = None
+        # Optional echo.EchoGate; set up in start() when VAD endpointing is available
+        self.echo_gate = None
+        self.gui = NullSink()
+        self._speaking = False
+
+    @property
+    def running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self, gui=None):
+        if self.running:
+            return self
+        if gui is not None:
+            self.gui = gui
+        if self.session is None:
+            self.session = get_audio_session(gui)
+        source = self.session.source
+        if source is not None:
+            needed = int(source.SAMPLE_RATE * source.SAMPLE_WIDTH * self.config['buffer_seconds'])
+            if needed > self.buffer.capacity:
+                self.buffer = UtteranceRingBuffer(needed, self.config['max_utterances'])
+        if self.echo_gate is None and BARGE_IN_CONFIG.get('enabled') and self.session.vad is not None:
+            from echo import EchoGate
+            self.echo_gate = EchoGate(source.SAMPLE_RATE)
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="audio-capture", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self, timeout=2.0):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _run(self):
+        poll = self.config['poll_timeout']
+        while not self._stop.is_set():
+            if self.echo_gate is not None:
+                onset_check = self._onset_check
+            elif self.session.vad is not None:
+                onset_check = self._outside_playback
+            else:
+                onset_check = None
+            try:
+                # Short timeout so stop() is noticed promptly between utterances
+                audio = self.session.listen(timeout=poll, onset_check=onset_check, on_onset=self._speech_started)
+            except sr.WaitTimeoutError:
+                continue
+            except Exception as e:
+                print(f"Capture error: {e}")
+                if self.on_error:
+                    self.on_error(e)
+                time.sleep(0.5)
+                continue
+            finally:
+                self._speech_ended()
+            if onset_check is None and self._heard_during_playback(audio, time.monotonic()):
+                print("DEBUG - Utterance overlapped Jarvis speaking, dropped")
+                continue
+            if not wake_word_allows(self.gate, audio):
+                continue
+            if not self.buffer.put(audio):
+                print("DEBUG - Utterance longer than capture buffer, dropped")
+
+    def _speech_started(self):
+        self._speaking = True
+        self.gui.start_listening_animation()
+
+    def _speech_ended(self):
+        if self._speaking:
+            self._speaking = False
+            self.gui.stop_listening_animation()
+
+    @staticmethod
+    def _in_playback(when):
+        """Whether `when` (monotonic) falls while Jarvis is talking or within the echo tail after"""
+        started, ended = playback_state()
+        return started is not None or when <= ended + BARGE_IN_CONFIG['echo_tail_ms'] / 1000
+
+    def _outside_playback(self, chunk):
+        """VAD onset check without an echo gate: speech can't start during playback"""
+        return not self._in_playback(time.monotonic())
+
+    def _heard_during_playback(self, audio, end):
+        """
+        Without VAD there is no onset hook, so estimate the onset from the clip:
+        the recognizer keeps `non_speaking_duration` of audio before speech starts
+        """
+        duration = len(audio.frame_data) / (audio.sample_rate * audio.sample_width)
+        onset = end - duration + self.session.recognizer.non_speaking_duration
+        return self._in_playback(onset)
+
+    def _onset_check(self, chunk):
+        """Reject echo; stop the current response when the user talks over it"""
+        if not self.echo_gate.is_user_speech(chunk):
+            return False
+        started, _ = playback_state()
+        if started is not None:
+            print("DEBUG - Barge-in: user started talking, stopping speech")
+            stop_speaking()
+        return True
+
+    def get(self, timeout=None):
+        """Next captured utterance (AudioData) or None on timeout"""
+        return self.buffer.get(timeout)
+
+
+def wake_word_allows(gate, audio):
+    """Whether an utterance gets past the wake word gate (no gate, or a failing check, lets it through)"""
+    if gate is None:
+        return True
+    try:
+        return gate.allow(audio)
+    except Exception as e:
+        print(f"Wake word check failed, passing audio through: {e}")
+        return True
+
+
+_pipeline = None
+_wake_word_gate = None
+_wake_word_loaded = False
+
+
+def get_wake_word_gate():
+    """
+    Shared wakeword.WakeWordGate, built on first use
+
+    The background pipeline and the blocking listen fallback use the same
+    gate, so a wake word heard by one opens the follow-up window for both.
+
+    Returns:
+        WakeWordGate: or None when wake word mode is off or unavailable
+    """
+    global _wake_word_gate, _wake_word_loaded
+    if not _wake_word_loaded:
+        _wake_word_loaded = True
+        if WAKE_WORD_CONFIG.get('enabled'):
+            try:
+                from wakeword import create_wake_word_gate
+                _wake_word_gate = create_wake_word_gate()
+            except ImportError:
+                print("Warning: numpy not available. Wake word mode disabled.")
+    return _wake_word_gate
+
+
+def get_capture_pipeline(gui=None):
+    """Return the shared capture pipeline, starting it on first use"""
+    global _pipeline
+    if _pipeline is None:
+        _pipeline = CapturePipeline()
+        _pipeline.gate = get_wake_word_gate()
+    return _pipeline.start(gui)
@@ -2,6 +2,7 @@
 # config.py - Enhanced configuration settings and API keys
 
 import os
+import sys
 
 # OpenWeatherMap API Key
 # Sign up at https://openweathermap.org/api to get your free API key
@@ -14,20 +15,85 @@ SPEECH_RECOGNITION_CONFIG = {
     'pause_threshold': 0.8,  # Seconds of non-speaking audio before phrase is complete
     'timeout': 10,  # Maximum seconds to wait for speech
     'phrase_time_limit': 8,  # Maximum seconds for a single phrase
-    'language': 'en-US'  # Language for speech recognition
+    'language': 'en-US',  # Language for speech recognition
+    'languages': ['en-US', 'en-IN'],  # Locales tried concurrently for every utterance
+    'recognition_deadline': 8.0,  # Seconds to wait for any locale before giving up
+    'confidence_threshold': 0.8,  # A result this confident wins without waiting for other locales
+    # Backends tried in order: 'google', 'vosk', 'sphinx' or 'stub' (deterministic, for tests).
+    # Use ['vosk'] or ['sphinx'] to run fully offline.
+    'backends': ['google', 'vosk', 'sphinx'],
+    'backend_timeouts': {'google': 5.0, 'vosk': 10.0, 'sphinx': 10.0, 'stub': 1.0},
+    'backend_failure_threshold': 2,  # Utterances in a row that fail (in the first locale) before a backend is skipped
+    'backend_cooldown': 60.0,  # Seconds a failing backend is skipped for
+    'vosk_model_path': 'model',  # Directory of an unpacked Vosk model
+    'stub_transcript': '',  # Text the stub backend returns
+}
+
+# Voice activity detection (needs numpy)
+VAD_CONFIG = {
+    'enabled': True,
+    'frame_ms': 20,  # Analysis frame length
+    'energy_margin_db': 10.0,  # Frames this far above the noise floor count as speech
+    'zcr_range': (0.1, 0.5),  # Zero-crossing rates accepted for quieter fricatives
+    'min_speech_ms': 60,  # Shorter bursts are treated as clicks/noise
+    'hangover_ms': 200,  # Speech is held this long after the last speech frame
+    'padding_ms': 150,  # Audio kept around the detected speech when trimming
+    'pre_roll_ms': 300,  # Audio kept from before speech onset during live capture
+    'end_silence_ms': 500,  # Trailing silence that ends an utterance (vs pause_threshold)
+    'noise_adapt_rate': 0.05,  # How quickly the noise floor follows louder ambient noise
+    # "Speech" this long without a pause means the room got louder (fan, TV):
+    # the floor is raised to the quietest frame of the last noise_window_ms
+    'max_speech_run_ms': 4000,
+    'noise_window_ms': 1500,
+}
+
+# Local wake word spotting: when enabled, only utterances that start with
+# "jarvis" (or follow one closely) are sent to the speech recognizer.
+# Record templates with `python wakeword.py enroll`, then tune the threshold
+# with `python benchmarks/eval_wakeword.py <fixtures_dir>`.
+WAKE_WORD_CONFIG = {
+    'enabled': False,
+    'templates_dir': 'wakeword_templates',  # WAV recordings of the wake word
+    'threshold': 20.0,  # Maximum MFCC/DTW distance accepted as the wake word
+    'search_seconds': 1.5,  # How far into each utterance the wake word may start
+    'follow_up_seconds': 8.0,  # Utterances within this window after a detection pass without it
+}
+
+# Barge-in: speaking over Jarvis stops the current response. While Jarvis is
+# talking, microphone audio only counts as the user when it is clearly louder
+# than the learned echo level and doesn't match the audio being played.
+BARGE_IN_CONFIG = {
+    'enabled': True,
+    'echo_tail_ms': 300,  # Room reverb after playback ends still counts as echo
+    'settle_ms': 300,  # Start of each response, used to learn the echo level; never interrupts
+    'margin_db': 8.0,  # User speech must be this much louder than the echo level
+    'min_speech_ms': 150,  # Loud audio needed before speech is treated as an interruption
+    'correlation_threshold': 0.5,  # Mic audio this similar to the cached audio being played is echo
+}
+
+# Background capture settings
+CAPTURE_CONFIG = {
+    'buffer_seconds': 60,  # Audio the utterance queue can hold before dropping the oldest
+    'max_utterances': 8,  # Maximum queued utterances
+    'poll_timeout': 1.0,  # Seconds the capture thread waits for speech before re-checking for stop
 }
 
 # Text-to-Speech Settings
 TTS_CONFIG = {
     'rate': 180,  # Speed of speech (words per minute)
     'volume': 1.0,  # Volume level (0.0 to 1.0)
-    'voice_index': None  # Voice index (None for default, 0 for first available, 1 for second, etc.)
+    'voice_index': None,  # Voice index (None for default, 0 for first available, 1 for second, etc.)
+    'max_chunk_chars': 100,  # Longer sentences are spoken in comma-separated pieces
+    # Fixed responses are rendered to WAV once and played from disk afterwards
+    'phrase_cache_enabled': True,
+    'phrase_cache_dir': os.path.join(os.environ.get('XDG_CACHE_HOME') or os.path.expanduser('~/.cache'), 'jarvis', 'phrases'),
+    'phrase_cache_max_bytes': 50 * 1024 * 1024,
 }
 
 # Application paths - modify for your system
-# Format: "app_name": "path/to/executable"
-APP_PATHS = {
-    # Windows applications
+# Format: "app_name": "path/to/executable", one table per platform so the
+# same name (chrome, firefox, vlc, code...) can point somewhere different on each
+WINDOWS_APP_PATHS = {
     "notepad": "notepad.exe",
     "calculator": "calc.exe",
     "paint": "mspaint.exe",
@@ -65,8 +131,9 @@ APP_PATHS = {
     "github desktop": r"C:\Users\{}\AppData\Local\GitHubDesktop\GitHubDesktop.exe".format(os.environ.get('USERNAME', '')),
     "sublime text": r"C:\Program Files\Sublime Text\sublime_text.exe",
     "atom": r"C:\Users\{}\AppData\Local\atom\atom.exe".format(os.environ.get('USERNAME', '')),
-    
-    # macOS applications
+}
+
+MACOS_APP_PATHS = {
     "safari": "open -a Safari",
     "terminal": "open -a Terminal",
     "finder": "open -a Finder",
@@ -79,8 +146,10 @@ APP_PATHS = {
     "preview": "open -a Preview",
     "photoshop": "open -a 'Adobe Photoshop'",
     "illustrator": "open -a 'Adobe Illustrator'",
-    
-    # Linux applications (using command names)
+}
+
+# Linux applications (using command names)
+LINUX_APP_PATHS = {
     "gedit": "gedit",
     "nautilus": "nautilus",
     "firefox": "firefox",
@@ -91,6 +160,33 @@ APP_PATHS = {
     "thunderbird": "thunderbird"
 }
 
+PLATFORM_APP_PATHS = {
+    'windows': WINDOWS_APP_PATHS,
+    'macos': MACOS_APP_PATHS,
+    'linux': LINUX_APP_PATHS,
+}
+
+def current_platform():
+    """Return 'windows', 'macos' or 'linux' for the running system"""
+    if os.name == 'nt':
+        return 'windows'
+    if sys.platform == 'darwin':
+        return 'macos'
+    return 'linux'
+
+# Apps valid on this machine
+APP_PATHS = PLATFORM_APP_PATHS[current_platform()]
+
+# Linux launcher discovery (XDG .desktop files)
+LAUNCHER_DISCOVERY_CONFIG = {
+    'enabled': True,
+    # Bare $PATH executables to index as well, e.g. ['code', 'gimp']. These
+    # open only when named exactly; the rest of $PATH (poweroff, reboot, ...)
+    # is never indexed.
+    'path_allowlist': [],
+    'cache_path': os.path.join(os.environ.get('XDG_CACHE_HOME') or os.path.expanduser('~/.cache'), 'jarvis', 'launchers.json'),
+}
+
 # Common application aliases for better recognition
 APP_ALIASES = {
     "vs code": "code",
@@ -110,20 +206,76 @@ APP_ALIASES = {
     "browser": "chrome",
     "music player": "spotify",
     "video player": "vlc",
-    "media player": "vlc"
+    "media player": "vlc",
+    # Formerly hard-coded in handle_open_app
+    "chrome browser": "chrome",
+    "terminal": "cmd",
+}
+
+# Remote services (weather, online speech recognition) go through per-endpoint
+# circuit breakers: after repeated failures a service is skipped at once instead
+# of every command waiting out its timeout, then probed again later.
+OUTBOUND_CONFIG = {
+    'failure_threshold': 3,  # Consecutive failures before an endpoint is skipped
+    'reset_timeout': 30.0,  # Seconds before the first probe, doubled while probes keep failing
+    'max_reset_timeout': 300.0,
+    # Seconds a whole command may spend on remote calls, shared by all of them
+    'budgets': {'weather': 4.0, 'default': 5.0},
+}
+
+# Weather client (OpenWeatherMap current weather)
+WEATHER_CONFIG = {
+    'base_url': 'http://api.openweathermap.org/data/2.5/weather',
+    'units': 'metric',
+    'timeout': 10,  # Seconds per HTTP request (commands are further limited by OUTBOUND_CONFIG['budgets'])
+    'ttl': 600,  # Seconds a report is served from cache without touching the network
+    'stale_ttl': 3600,  # Older reports (up to this age) are served at once while refreshing in the background
+    'cache_size': 64,  # Cities kept in the cache, least recently used evicted first
+    # "weather in London, Paris and Tokyo" fetches the cities in parallel
+    'max_cities': 6,  # Cities answered per command; extra ones are ignored
+    'fanout_workers': 4,  # Concurrent requests for a multi-city command
+    'fanout_deadline': 4.0,  # Seconds for the whole set; cities still loading are reported as late
+    # DEFAULT_CITY and DEFAULT_CITIES are fetched at startup and kept fresh in the background
+    'prefetch_enabled': True,
+    'prefetch_interval': 480,  # Seconds between refresh rounds (below ttl, so answers stay fresh)
+    'prefetch_jitter': 0.2,  # Each wait is randomized by +/- this fraction
+    'prefetch_budget': 40,  # Maximum background requests per hour
+    'prefetch_backoff': 30,  # First retry delay after an error, doubled per consecutive error
+    'prefetch_backoff_max': 1800,
 }
 
-# Default cities for weather (when no city is specified)
+# Offline city list: places found here (or misheard names that sound like
+# one) are sent to the API unambiguously as "Name,CC"; anything else is
+# refused, since an unmatched phrase is as often "the next hour" as a town.
+# The shipped populations are approximate; rebuild a larger list with
+# GeoNames figures with `python gazetteer.py build cities15000.txt`.
+GAZETTEER_CONFIG = {
+    'path': os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'cities.tsv'),
+    'strict': True,  # Refuse places missing from the list; False asks the weather API for them as said
+}
+
+# Weather for DEFAULT_CITY is given when no city is specified; DEFAULT_CITIES
+# are favourites. Both are prefetched (see WEATHER_CONFIG).
 DEFAULT_CITIES = ["New York", "London", "Tokyo", "Paris", "Sydney"]
 DEFAULT_CITY = "New York"
 
+# Search, YouTube and WhatsApp Web open as tabs in one running browser
+BROWSER_CONFIG = {
+    'browser': None,  # webbrowser name such as 'firefox' or 'chrome'; None uses the system default
+    'debounce_seconds': 3.0,  # Opening the same URL again within this window is ignored
+    # Remote-debugging port of a Chromium-family browser started with
+    # --remote-debugging-port=<port>; tabs then open without spawning a process
+    'devtools_port': None,
+    'devtools_timeout': 0.5,  # Seconds per DevTools request
+}
+
 # Debug settings
 DEBUG_MODE = True  # Set to False to disable debug output
 LOG_COMMANDS = True  # Log all commands for analysis
 
 def get_app_path(app_name):
     """
-    Get the application path, checking aliases first
+    Get the application path, checking exact names, aliases and then fuzzy matches
     
     Args:
         app_name (str): Name of the application
@@ -131,25 +283,10 @@ def get_app_path(app_name):
     Returns:
         str: Path to the application or None if not found
     """
-    # Normalize app name
-    app_name = app_name.lower().strip()
-    
-    # Check direct match first
-    if app_name in APP_PATHS:
-        return APP_PATHS[app_name]
-    
-    # Check aliases
-    if app_name in APP_ALIASES:
-        alias_target = APP_ALIASES[app_name]
-        if alias_target in APP_PATHS:
-            return APP_PATHS[alias_target]
-    
-    # Check partial matches
-    for key in APP_PATHS:
-        if app_name in key or key in app_name:
-            return APP_PATHS[key]
+    from app_index import get_app_index
     
-    return None
+    matches = get_app_index().search(app_name, limit=1)
+    return matches[0].path if matches else None
 
 def validate_config():
     """
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+# echo.py - Tell the user's voice apart from Jarvis's own speech picked up by the microphone
+
+import time
+
+import numpy as np
+
+from config import BARGE_IN_CONFIG
+from voice_output import playback_reference, playback_state
+
+
+def pcm_level_db(pcm):
+    """Mean energy of 16-bit mono PCM in dB (same scale as vad.frame_features)"""
+    samples = np.frombuffer(pcm, dtype=np.int16).astype(np.float32) / 32768.0
+    if not len(samples):
+        return -100.0
+    return float(10.0 * np.log10(np.mean(samples * samples) + 1e-10))
+
+
+def reference_samples(pcm, fmt, sample_rate):
+    """Played audio as mono float32 at the microphone's sample rate, or None if unsupported"""
+    rate, width, channels = fmt
+    if width != 2:
+        return None
+    samples = np.frombuffer(pcm, dtype=np.int16).astype(np.float32) / 32768.0
+    if channels > 1:
+        samples = samples[:len(samples) // channels * channels].reshape(-1, channels).mean(axis=1)
+    if rate != sample_rate:
+        positions = np.arange(0, len(samples), rate / sample_rate)
+        samples = np.interp(positions, np.arange(len(samples)), samples).astype(np.float32)
+    return samples
+
+
+def max_correlation(frame, reference):
+    """
+    Peak normalized cross-correlation of `frame` against every offset in `reference`
+
+    Computed with one FFT, so the unknown speaker-to-microphone delay costs
+    nothing extra. 1.0 means the frame is a scaled copy of part of the reference.
+    """
+    n, m = len(frame), len(reference)
+    if n == 0 or m < n:
+        return 0.0
+    x = frame - frame.mean()
+    x_norm = float(np.sqrt(np.dot(x, x)))
+    if x_norm == 0.0:
+        return 0.0
+    size = 1 << (m + n - 1).bit_length()
+    corr = np.fft.irfft(np.fft.rfft(reference, size) * np.conj(np.fft.rfft(x, size)), size)[:m - n + 1]
+    energy = np.concatenate(([0.0], np.cumsum(reference.astype(np.float64) ** 2)))
+    window = np.sqrt(np.maximum(energy[n:] - energy[:-n], 1e-12))
+    return float(np.max(np.abs(corr) / (x_norm * window)))
+
+
+class EchoGate:
+    """
+    Decides whether speech heard while Jarvis is talking is the user.
+
+    Outside playback (plus a short reverb tail) everything passes. During
+    playback the first `settle_ms` of each response only teach the gate how
+    loud the echo is; after that a chunk counts as the user when it is
+    `margin_db` above that level and, if the response is playing from the
+    phrase cache, doesn't correlate with the audio being played. Only
+    `min_speech_ms` of consecutive such chunks count as an interruption.
+    """
+
+    def __init__(self, sample_rate, config=BARGE_IN_CONFIG):
+        self.sample_rate = sample_rate
+        self.config = config
+        self.echo_db = None
+        self._interval = None  # Start time of the response echo_db was learned from
+        self._loud = 0.0
+        self.rejected = 0
+
+    def is_user_speech(self, chunk):
+        """Whether a chunk the VAD flagged as speech should count as the user talking"""
+        started, ended = playback_state()
+        now = time.monotonic()
+        if started is None and now - ended >= self.config['echo_tail_ms'] / 1000:
+            self._loud = 0.0
+            return True
+        if started is not None and started != self._interval:
+            self._interval = started
+            self.echo_db = None
+            self._loud = 0.0
+
+        level = pcm_level_db(chunk)
+        settling = started is not None and now - started < self.config['settle_ms'] / 1000
+        if self.echo_db is None or settling:
+            self.echo_db = level if self.echo_db is None else max(self.echo_db, level)
+            self.rejected += 1
+            return False
+
+        if level < self.echo_db + self.config['margin_db'] or self._matches_playback(chunk):
+            # Echo: follow it up quickly and down slowly
+            rate = 0.5 if level > self.echo_db else 0.05
+            self.echo_db += rate * (level - self.echo_db)
+            self._loud = 0.0
+            self.rejected += 1
+            return False
+
+        self._loud += len(chunk) / 2 / self.sample_rate
+        return self._loud >= self.config['min_speech_ms'] / 1000
+
+    def _matches_playback(self, chunk):
+        reference = playback_reference()
+        if reference is None:
+            return False
+        samples = reference_samples(reference[0], reference[1], self.sample_rate)
+        if samples is None:
+            return False
+        frame = np.frombuffer(chunk, dtype=np.int16).astype(np.float32) / 32768.0
+        return max_correlation(frame, samples) >= self.config['correlation_threshold']
+
+
+if __name__ == "__main__":
+    # Sanity check: a delayed, attenuated copy of the reference correlates, fresh noise doesn't
+    rng = np.random.default_rng(0)
+    played = rng.standard_normal(16000).astype(np.float32) * 0.1
+    echo = 0.3 * played[5000:6024] + 0.01 * rng.standard_normal(1024).astype(np.float32)
+    other = rng.standard_normal(1024).astype(np.float32) * 0.1
+    start = time.perf_counter()
+    print(f"echo correlation:  {max_correlation(echo, played):.2f}")
+    print(f"other correlation: {max_correlation(other, played):.2f}")
+    print(f"{(time.perf_counter() - start) * 500:.2f} ms per check")
@@ -0,0 +1,278 @@
+#!/usr/bin/env python3
+# gazetteer.py - Offline city index used to validate and normalize weather locations
+
+import sys
+import threading
+import unicodedata
+from bisect import bisect_left
+from collections import namedtuple
+
+from config import GAZETTEER_CONFIG
+
+# Words that never start a city span on their own ("weather in ...", "of", "nice weather")
+STOPWORDS = {
+    'a', 'an', 'and', 'at', 'for', 'how', 'in', 'is', 'it', 'like', 'me', 'now', 'of', 'please',
+    's', 'show', 'tell', 'the', 'today', 'tomorrow', 'weather', 'what', 'whats',
+}
+
+
+class City(namedtuple('City', ['name', 'country', 'population'])):
+    """A known place; `population` is 0 when the list doesn't say"""
+    __slots__ = ()
+
+    @property
+    def query(self):
+        """Unambiguous OpenWeatherMap query, e.g. 'London,GB'"""
+        return f"{self.name},{self.country}"
+
+
+CityMatch = namedtuple('CityMatch', ['city', 'start', 'end', 'text'])  # Token span [start, end)
+
+
+def normalize(text):
+    """Lowercase ASCII words: accents dropped, punctuation removed ("Xi'an" -> "xian", "São Paulo" -> "sao paulo")"""
+    text = unicodedata.normalize('NFKD', text)
+    text = "".join(c for c in text if not unicodedata.combining(c)).lower()
+    text = "".join(c if c.isalnum() or c.isspace() else ("" if c == "'" else " ") for c in text)
+    return " ".join(text.split())
+
+
+def edit_distance(a, b, limit):
+    """Damerau-Levenshtein (optimal string alignment) distance, or limit + 1 once it is exceeded"""
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    previous2 = None
+    previous = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        current = [i] + [0] * len(b)
+        for j in range(1, len(b) + 1):
+            cost = 0 if a[i - 1] == b[j - 1] else 1
+            current[j] = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            if previous2 is not None and i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                current[j] = min(current[j], previous2[j - 2] + 1)
+        if min(current) > limit:
+            return limit + 1
+        previous2, previous = previous, current
+    return previous[-1]
+
+
+# Consonant classes for sound_key(); vowels, h, w and y carry no class
+SOUND_CLASSES = {c: str(d) for d, letters in enumerate(["bfpv", "cgjkqsxz", "dt", "l", "mn", "r"], 1) for c in letters}
+
+
+def sound_key(text):
+    """
+    Rough pronunciation key: first letter plus the classes of the following consonants
+
+    Like Soundex without the 4-character cut-off, so "tokio"/"tokyo" and
+    "banglore"/"bangalore" share a key but "kannur"/"kanpur" don't.
+    """
+    key = normalize(text).replace(" ", "")
+    if not key:
+        return ""
+    code = [key[0]]
+    last = SOUND_CLASSES.get(key[0])
+    for c in key[1:]:
+        digit = SOUND_CLASSES.get(c)
+        if digit is not None and digit != last:
+            code.append(digit)
+        if c not in "hw":
+            last = digit
+    return "".join(code)
+
+
+class Gazetteer:
+    """
+    Sorted array of normalized city names (plus aliases) with populations.
+
+    find_cities() walks the command's words once: from each word it extends
+    the span only while some name still starts with it (a bisect into the
+    sorted array), keeping the longest exact name, so "new york city" beats
+    "new york" and nothing is compared against every city.
+    """
+
+    def __init__(self, entries):
+        self._by_key = {}
+        for name, country, population, aliases in entries:
+            city = City(name, country, population)
+            for key in [normalize(name)] + [normalize(alias) for alias in aliases]:
+                if key and (key not in self._by_key or population > self._by_key[key].population):
+                    self._by_key[key] = city
+        self._keys = sorted(self._by_key)
+        self._by_initial = {}
+        for key in self._keys:
+            self._by_initial.setdefault(key[0], []).append(key)
+
+    @classmethod
+    def load(cls, path):
+        """Read the tab-separated file: name, country code, population (may be empty), optional comma-separated aliases"""
+        entries = []
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                if not line.strip() or line.startswith("#"):
+                    continue
+                fields = line.rstrip("\n").split("\t")
+                aliases = fields[3].split(",") if len(fields) > 3 and fields[3] else []
+                population = int(fields[2]) if len(fields) > 2 and fields[2] else 0
+                entries.append((fields[0], fields[1], population, aliases))
+        return cls(entries)
+
+    def __len__(self):
+        return len(self._keys)
+
+    def lookup(self, name):
+        """Exact (normalized) name or alias -> City, else None"""
+        return self._by_key.get(normalize(name))
+
+    def _has_prefix(self, prefix):
+        i = bisect_left(self._keys, prefix)
+        return i < len(self._keys) and self._keys[i].startswith(prefix)
+
+    def find_cities(self, text):
+        """
+        Every known city in `text`, longest span first at each position, left to right
+
+        Returns:
+            list: CityMatch tuples (token spans don't overlap)
+        """
+        tokens = normalize(text).split()
+        matches = []
+        i = 0
+        while i < len(tokens):
+            best = None
+            span = ""
+            for j in range(i, len(tokens)):
+                span = f"{span} {tokens[j]}" if span else tokens[j]
+                if span in self._by_key and not (j == i and span in STOPWORDS):
+                    best = j
+                if not self._has_prefix(span + " "):
+                    break
+            if best is None:
+                i += 1
+                continue
+            key = " ".join(tokens[i:best + 1])
+            matches.append(CityMatch(self._by_key[key], i, best + 1, key))
+            i = best + 1
+        return matches
+
+    def closest(self, phrase):
+        """
+        Nearest known name to a phrase that isn't one itself
+
+        Allows one edit for names up to 5 letters and two for longer ones;
+        among equally close names the more populous wins.
+
+        Returns:
+            tuple: (City, matched name key), or None
+        """
+        key = normalize(phrase)
+        if not key or key in STOPWORDS or key in self._by_key:
+            return None
+        limit = 1 if len(key) <= 5 else 2
+        best = None
+        for candidate in self._by_initial.get(key[0], []):
+            distance = edit_distance(key, candidate, limit)
+            if distance <= limit:
+                city = self._by_key[candidate]
+                if best is None or (distance, -city.population) < best[0]:
+                    best = ((distance, -city.population), city, candidate)
+        return best[1:] if best else None
+
+    def correct(self, phrase):
+        """
+        Known city for a misheard name ("tokio", "banglore"), or None
+
+        Only corrects to a name that sounds the same (see sound_key): a close
+        spelling that sounds different ("kannur" for Kanpur) is more likely
+        another place missing from the list, so suggest() offers it instead.
+        """
+        key = normalize(phrase)
+        if key in self._by_key and key not in STOPWORDS:
+            return self._by_key[key]
+        match = self.closest(key)
+        if match is None or sound_key(key) != sound_key(match[1]):
+            return None
+        return match[0]
+
+    def suggest(self, phrase):
+        """Close known city to offer as "did you mean", for a phrase correct() won't change, else None"""
+        if self.correct(phrase) is not None:
+            return None
+        match = self.closest(phrase)
+        return match[0] if match else None
+
+    def resolve(self, name):
+        """City for a configured name (exact or corrected), else None"""
+        return self.lookup(name) or self.correct(name)
+
+
+def city_query(name):
+    """API query for a configured city name: canonical 'Name,CC' when known, else the name itself"""
+    city = get_gazetteer().resolve(name)
+    return city.query if city else name
+
+
+_gazetteer = None
+_gazetteer_lock = threading.Lock()
+
+
+def get_gazetteer():
+    """Return the shared gazetteer, loading it on first use"""
+    global _gazetteer
+    with _gazetteer_lock:
+        if _gazetteer is None:
+            try:
+                _gazetteer = Gazetteer.load(GAZETTEER_CONFIG['path'])
+            except OSError as e:
+                print(f"Warning: city list not loaded ({e}); city names won't be validated")
+                _gazetteer = Gazetteer([])
+        return _gazetteer
+
+
+def build_from_geonames(source, destination, min_population=15000):
+    """
+    Convert a GeoNames dump (e.g. cities15000.txt from download.geonames.org) into the compact city file
+
+    Aliases already in `destination` ("bombay", "peking") are kept for the
+    same name and country.
+
+    Returns:
+        int: number of cities written
+    """
+    aliases = {}
+    try:
+        with open(destination, encoding="utf-8") as f:
+            for line in f:
+                fields = line.rstrip("\n").split("\t")
+                if not line.startswith("#") and len(fields) > 3 and fields[3]:
+                    aliases[(normalize(fields[0]), fields[1])] = fields[3]
+    except OSError:
+        pass
+
+    best = {}  # (normalized name, country) -> (population, name); GeoNames lists some places twice
+    with open(source, encoding="utf-8") as f:
+        for line in f:
+            fields = line.rstrip("\n").split("\t")
+            if len(fields) < 15:
+                continue
+            population = int(fields[14] or 0)
+            name, country = fields[2] or fields[1], fields[8]
+            key = (normalize(name), country)
+            if population >= min_population and population > best.get(key, (0,))[0]:
+                best[key] = (population, name)
+    with open(destination, "w", encoding="utf-8") as f:
+        f.write("# name\tcountry\tpopulation\taliases (comma-separated)\n")
+        for key in sorted(best):
+            population, name = best[key]
+            f.write(f"{name}\t{key[1]}\t{population}\t{aliases.get(key, '')}\n".replace("\t\n", "\n"))
+    return len(best)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) >= 3 and sys.argv[1] == "build":
+        destination = sys.argv[3] if len(sys.argv) > 3 else GAZETTEER_CONFIG['path']
+        count = build_from_geonames(sys.argv[2], destination)
+        print(f"Wrote {count} cities to {destination}")
+    else:
+        print("Usage: python gazetteer.py build <geonames cities15000.txt> [output]")
+        print(f"Current list: {GAZETTEER_CONFIG['path']} ({len(get_gazetteer())} names and aliases)")
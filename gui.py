@@ -1,6 +1,29 @@
 # gui.py
 import customtkinter as ctk
 import math
+import time
+from collections import deque
+
+# The live level meter needs numpy; without it only the pulse is drawn
+try:
+    from level_meter import get_level_meter, level_fraction, waveform_coords
+    LEVEL_METER_AVAILABLE = True
+except ImportError:
+    LEVEL_METER_AVAILABLE = False
+
+ACCENT = "#00BFFF"
+THRESHOLD_COLOR = "#FF6A6A"
+FRAME_MS = 33  # ~30 FPS while something is moving
+METER_IDLE_MS = 100  # Level meter poll between utterances; redrawn only when new audio arrived
+FRAME_BUDGET_MS = 8.0  # A frame slower than this skips the next waveform redraw
+METER_X0, METER_X1 = 50, 550
+
+# Arc reactor tick marks: (x1, y1, x2, y2) around (300, 100), computed once
+REACTOR_TICKS = [
+    (300 + 45 * math.cos(math.radians(i * 30)), 100 + 45 * math.sin(math.radians(i * 30)),
+     300 + 50 * math.cos(math.radians(i * 30)), 100 + 50 * math.sin(math.radians(i * 30)))
+    for i in range(12)
+]
 
 class JarvisGUI:
     def __init__(self, root):
@@ -18,13 +41,37 @@ class JarvisGUI:
 
         # --- Status Label ---
         self.status_label = ctk.CTkLabel(self.main_frame, text="Initializing Jarvis...", font=("Roboto", 24, "bold"), text_color="#00BFFF")
-        self.status_label.pack(pady=20)
+        self.status_label.pack(pady=(20, 0))
+
+        # Remote services currently being skipped (empty while all are reachable)
+        self.health_label = ctk.CTkLabel(self.main_frame, text="", font=("Roboto", 14), text_color=THRESHOLD_COLOR)
+        self.health_label.pack(pady=(0, 10))
 
         # --- Visualization Canvas ---
         self.canvas = ctk.CTkCanvas(self.main_frame, width=600, height=200, bg="#1C1F23", highlightthickness=0)
         self.canvas.pack(pady=15)
         self.is_listening = False
         self.angle = 0
+        self._after_id = None
+        self._drawn_listening = None  # Which scene the canvas items currently show
+        self.frame_count = 0
+        self.frame_times = deque(maxlen=120)  # Seconds spent drawing recent frames
+
+        # Canvas items are created once; frames only move or show/hide them
+        self.meter = get_level_meter() if LEVEL_METER_AVAILABLE else None
+        self._meter_version = -1
+        self._over_budget = False
+        if self.meter is not None:
+            # Scrolling waveform behind the pulse, level bar and speech threshold marker below.
+            # Always shown: when speech is never detected (threshold too high), the meter is
+            # what tells the user the microphone hears them
+            self.waveform = self.canvas.create_line(METER_X0, 100, METER_X1, 100, fill="#1E6F8F", width=1)
+            self.level_bar = self.canvas.create_rectangle(METER_X0, 182, METER_X0, 190, fill=ACCENT, outline="")
+            self.threshold_mark = self.canvas.create_line(METER_X0, 178, METER_X0, 194, fill=THRESHOLD_COLOR, width=2)
+        self.pulse = self.canvas.create_oval(0, 0, 0, 0, fill=ACCENT, outline="", state="hidden")
+        self.listening_items = [self.pulse]
+        self.reactor = [self.canvas.create_oval(250, 50, 350, 150, outline=ACCENT, width=4)]
+        self.reactor += [self.canvas.create_line(*tick, fill=ACCENT, width=3) for tick in REACTOR_TICKS]
 
         # --- Transcription Label ---
         self.transcription_label = ctk.CTkLabel(self.main_frame, text="You said: ...", font=("Roboto", 16), wraplength=700, justify="center")
@@ -35,38 +82,85 @@ class JarvisGUI:
     def update_status(self, text):
         self.status_label.configure(text=text)
 
+    def update_health(self, text):
+        self.health_label.configure(text=text)
+
     def update_transcription(self, text):
         self.transcription_label.configure(text=f"You said: \"{text}\"")
 
     def start_listening_animation(self):
-        self.is_listening = True
+        if not self.is_listening:
+            self.is_listening = True
+            self.animate()
 
     def stop_listening_animation(self):
-        self.is_listening = False
+        if self.is_listening:
+            self.is_listening = False
+            self.animate()
+
+    def frame_stats(self):
+        """Frames drawn so far and the mean/worst draw time (ms) of recent frames"""
+        times = list(self.frame_times)
+        if not times:
+            return self.frame_count, 0.0, 0.0
+        return self.frame_count, 1000 * sum(times) / len(times), 1000 * max(times)
+
+    def _draw_meter(self):
+        """Update the level bar every frame and the waveform when there's new audio and time for it"""
+        meter = self.meter
+        width = METER_X1 - METER_X0
+        self.canvas.coords(self.level_bar, METER_X0, 182, METER_X0 + width * level_fraction(meter.level_db()), 190)
+        if meter.threshold_db is not None:
+            x = METER_X0 + width * level_fraction(meter.threshold_db)
+            self.canvas.coords(self.threshold_mark, x, 178, x, 194)
+
+        if meter.version == self._meter_version or self._over_budget:
+            return
+        self._meter_version = meter.version
+        self.canvas.coords(self.waveform, *waveform_coords(meter.waveform(), METER_X0, METER_X1, 100, 60))
 
     def animate(self):
-        self.canvas.delete("all")
+        """
+        Draw one frame and schedule the next only while something moves
+
+        While the user is speaking the pulse and meter run at FRAME_MS.
+        Otherwise the static arc reactor is drawn once and, if there is a
+        level meter, it is polled every METER_IDLE_MS and redrawn only when
+        new audio arrived; without one the loop stops.
+        start/stop_listening_animation() switch between the two.
+        """
+        start = time.perf_counter()
+        if self._after_id is not None:
+            self.root.after_cancel(self._after_id)
+            self._after_id = None
+
+        drawn = self._drawn_listening != self.is_listening
+        if drawn:
+            # Swap between the pulse and the static "Iron Man" Arc Reactor
+            for item in self.listening_items:
+                self.canvas.itemconfigure(item, state="normal" if self.is_listening else "hidden")
+            for item in self.reactor:
+                self.canvas.itemconfigure(item, state="hidden" if self.is_listening else "normal")
+            self._drawn_listening = self.is_listening
+
         if self.is_listening:
             # Pulsing circle animation
             radius = 10 + 5 * (1 + math.sin(self.angle))
-
-            # --- CORRECTED CODE ---
-            # This calculation now correctly keeps the blue value between 100 and 255
-            blue_intensity = int(177 + 78 * math.sin(self.angle * 0.7))
-            color = f'#00BFFF' # Using the theme's accent color for the pulse
-            
-            # We will vary the size and use a consistent color for a smoother look
-            self.canvas.create_oval(300 - radius, 100 - radius, 300 + radius, 100 + radius, fill=color, outline="")
+            self.canvas.coords(self.pulse, 300 - radius, 100 - radius, 300 + radius, 100 + radius)
             self.angle += 0.2
-        else:
-            # Static "Iron Man" Arc Reactor style
-            self.canvas.create_oval(250, 50, 350, 150, outline="#00BFFF", width=4)
-            for i in range(12):
-                rad = i * 30 * (math.pi / 180)
-                x1 = 300 + 45 * math.cos(rad)
-                y1 = 100 + 45 * math.sin(rad)
-                x2 = 300 + 50 * math.cos(rad)
-                y2 = 100 + 50 * math.sin(rad)
-                self.canvas.create_line(x1, y1, x2, y2, fill="#00BFFF", width=3)
-        
-        self.root.after(33, self.animate) # ~30 FPS
\ No newline at end of file
+            drawn = True
+        elif self.meter is not None and self.meter.version != self._meter_version:
+            # Idle poll: only worth a redraw if the microphone delivered audio since the last one
+            drawn = True
+        if drawn and self.meter is not None:
+            self._draw_meter()
+
+        if drawn:
+            self.frame_count += 1
+            elapsed = time.perf_counter() - start
+            self.frame_times.append(elapsed)
+            self._over_budget = elapsed * 1000 > FRAME_BUDGET_MS
+        if self.is_listening:
+            self._after_id = self.root.after(FRAME_MS, self.animate)
+        elif self.meter is not None:
+            self._after_id = self.root.after(METER_IDLE_MS, self.animate)
\ No newline at end of file
@@ -0,0 +1,3 @@
+# handlers - Command handlers, one module per dependency footprint.
+# Modules here are imported lazily by intents.IntentRegistry the first time
+# one of their intents fires, so keep heavy imports inside these modules.
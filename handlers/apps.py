@@ -0,0 +1,66 @@
+# handlers/apps.py - Launching desktop applications
+
+import os
+import re
+import shlex
+import subprocess
+from voice_output import speak
+from commands import debug_command
+from app_index import get_app_index
+from config import current_platform
+from launchers import get_launcher_index
+
+def handle_open_app(command, gui):
+    """
+    Handle requests to open applications with improved app name detection
+    """
+    debug_command(command, command, "Open App")
+    
+    # Remove "open", "launch", "start", "run" from the command
+    app_name = command
+    for keyword in ['open', 'launch', 'start', 'run']:
+        app_name = re.sub(rf'\b{keyword}\b', '', app_name, flags=re.IGNORECASE)
+    
+    app_name = app_name.strip()
+    
+    if not app_name:
+        speak("Which application would you like to open?", gui)
+        return
+    
+    # Clean app name
+    app_name = re.sub(r'[^\w\s]', '', app_name).strip().lower()
+    
+    index = get_app_index()
+    matches = index.search(app_name, limit=3)
+    
+    # Fall back to launchers discovered on this Linux system
+    if not matches and current_platform() == 'linux':
+        launcher_index = get_launcher_index()
+        if launcher_index is not None:
+            matches = launcher_index.search(app_name, limit=3)
+    
+    print(f"DEBUG - Looking for app: '{app_name}'")
+    print(f"DEBUG - Matches: {[(m.name, m.kind, round(m.score, 2)) for m in matches]}")
+    
+    if matches:
+        best_match = matches[0]
+        try:
+            speak(f"Opening {best_match.name}", gui)
+            launch_app(best_match.path)
+        except Exception as e:
+            speak(f"Sorry, I couldn't open {best_match.name}", gui)
+            print(f"Error opening app: {e}")
+    else:
+        available_apps = ', '.join(index.names[:5])  # Show first 5
+        speak(f"Sorry, I don't know how to open {app_name}. Some available apps are: {available_apps}", gui)
+
+def launch_app(path):
+    """Start an application path or command for the current OS"""
+    if os.name == 'nt':
+        if path.endswith('.exe') or '\\' in path:
+            os.startfile(path)
+        else:
+            # Protocol handler (like whatsapp:)
+            subprocess.run(f'start {path}', shell=True)
+    else:
+        subprocess.Popen(shlex.split(path))
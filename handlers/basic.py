@@ -0,0 +1,67 @@
+# handlers/basic.py - Conversational handlers with no heavy dependencies
+
+import datetime
+import random
+from voice_output import speak
+
+GREETINGS = [
+    "Hello! This is Jarvis. How can I help you today?",
+    "Hi there! Jarvis at your service. What can I do for you?",
+    "Hey! Jarvis here. What do you need?",
+    "Greetings! Jarvis ready to assist you."
+]
+
+UNKNOWN_RESPONSES = [
+    "I'm not sure I understand, sir. Could you rephrase that?",
+    "I didn't catch that. What would you like me to do?",
+    "Sorry, I don't know how to help with that yet. Try commands like 'what time is it', 'open recycle bin', or 'search for something'.",
+    "I'm still learning. Could you try a different command? Say 'help' to see what I can do."
+]
+
+GOODBYE_TEXT = "Shutting down, sir. Jarvis going offline."
+
+HELP_TEXT = """Here are some commands you can try:
+    - What time is it?
+    - What's the weather in London?
+    - Open recycle bin
+    - Empty recycle bin
+    - Search for Python tutorials
+    - Open Chrome
+    - Play music on YouTube
+    - Open WhatsApp
+    - Open notepad
+    - Goodbye to exit"""
+
+# Fixed responses rendered into the phrase cache at startup
+CANNED_PHRASES = GREETINGS + UNKNOWN_RESPONSES + [GOODBYE_TEXT, HELP_TEXT]
+
+
+def handle_greeting(gui):
+    """Handle greeting commands"""
+    response = random.choice(GREETINGS)
+    speak(response, gui, cache=True)
+
+
+def handle_goodbye(gui):
+    """Handle exit commands"""
+    speak(GOODBYE_TEXT, gui, cache=True)
+    return "exit"
+
+
+def handle_time(gui):
+    """Handle time requests"""
+    current_time = datetime.datetime.now().strftime('%I:%M %p')
+    current_date = datetime.datetime.now().strftime('%A, %B %d, %Y')
+    response = f"The current time is {current_time} on {current_date}"
+    speak(response, gui)
+
+
+def handle_unknown(gui):
+    """Handle commands that don't match any known patterns"""
+    response = random.choice(UNKNOWN_RESPONSES)
+    speak(response, gui, cache=True)
+
+
+def handle_help(gui):
+    """Provide help information about available commands"""
+    speak(HELP_TEXT, gui, cache=True)
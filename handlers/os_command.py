@@ -0,0 +1,38 @@
+# handlers/os_command.py - Recycle bin and other OS-level commands
+
+from voice_output import speak, PRIORITY_STATUS
+from commands import debug_command
+from os_operations import open_recycle_bin, empty_recycle_bin, RECYCLE_BIN_KEY
+
+def handle_os_command(command, gui):
+    """Handles OS-level commands like interacting with the Recycle Bin."""
+    debug_command(command, command, "OS Command")
+    
+    # More comprehensive matching for recycle bin commands
+    recycle_keywords = ['recycle', 'bin', 'trash', 'garbage', 'waste']
+    open_keywords = ['open', 'show', 'display', 'access', 'view']
+    empty_keywords = ['empty', 'clear', 'delete', 'clean', 'remove']
+    
+    command_lower = command.lower()
+    command_words = command_lower.split()
+    
+    # Check for recycle bin mentions
+    has_recycle = any(keyword in command_lower for keyword in recycle_keywords)
+    has_open = any(keyword in command_lower for keyword in open_keywords)
+    has_empty = any(keyword in command_lower for keyword in empty_keywords)
+    
+    print(f"DEBUG - Recycle command analysis:")
+    print(f"  Command: '{command}'")
+    print(f"  Has recycle: {has_recycle}")
+    print(f"  Has open: {has_open}")
+    print(f"  Has empty: {has_empty}")
+    
+    if has_recycle:
+        if has_empty:
+            speak("Warning: this action is permanent and cannot be undone.", gui)
+            empty_recycle_bin(gui)
+        elif has_open or not has_empty:  # Default to open if not explicitly empty
+            speak("Opening the recycle bin now.", gui, priority=PRIORITY_STATUS, key=RECYCLE_BIN_KEY, cache=True)
+            open_recycle_bin(gui)
+    else:
+        speak("I'm not sure which OS action you mean. Try saying 'open recycle bin' or 'empty recycle bin'.", gui)
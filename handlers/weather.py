@@ -0,0 +1,203 @@
+# handlers/weather.py - Weather lookups via OpenWeatherMap
+
+import re
+import requests
+from voice_output import speak
+from commands import debug_command
+from weather_client import FutureTimeout, brief, describe, get_weather_client
+from outbound import BudgetExceeded, CircuitOpenError, command_budget
+from gazetteer import STOPWORDS, city_query, get_gazetteer
+from config import DEFAULT_CITY, GAZETTEER_CONFIG, WEATHER_CONFIG
+
+def handle_weather(command, gui):
+    """
+    Handle weather requests with improved city detection
+    """
+    debug_command(command, command, "Weather")
+    # The budget starts now, not when the speech thread reaches the request
+    budget = command_budget('weather')
+    # Fragments are spoken as they are yielded, so the "no city" notice
+    # plays while the API request is in flight
+    speak(weather_report(command, budget), gui)
+
+
+# Separators in "weather in London, Paris and Tokyo"
+CITY_SEPARATORS = re.compile(r'\s*(?:,|&|\band\b|\bor\b|\bvs\b|\bversus\b)\s*', re.IGNORECASE)
+
+
+def extract_city_phrases(command):
+    """Loosely pull the place names out of a weather command, one phrase per listed city"""
+    patterns = [
+        r'weather (?:in|for|at|of) ([a-zA-Z\s,&]+)',
+        r'(?:in|for|at|of) ([a-zA-Z\s,&]+) weather',
+        r'weather ([a-zA-Z\s,&]+)',
+    ]
+    
+    for pattern in patterns:
+        match = re.search(pattern, command, re.IGNORECASE)
+        if match:
+            phrases = []
+            for part in CITY_SEPARATORS.split(match.group(1)):
+                # Remove common words that might be picked up ("weather today")
+                city = ' '.join(word for word in part.split() if word.lower() not in STOPWORDS)
+                if len(city) >= 2:
+                    phrases.append(city)
+            return phrases
+    return []
+
+
+def correct_city(phrase, gazetteer):
+    """Known city a phrase was misheard for, dropping trailing words ("tokio today"), else None"""
+    words = phrase.split()
+    for end in range(len(words), 0, -1):
+        city = gazetteer.correct(" ".join(words[:end]))
+        if city is not None:
+            print(f"DEBUG - Corrected city '{phrase}' -> {city.name}")
+            return city
+    return None
+
+
+def did_you_mean(names, gazetteer):
+    """' Did you mean Kanpur?' for names that are close to a known city but weren't corrected to it, else ''"""
+    suggestions = []
+    for name in names:
+        city = gazetteer.suggest(name)
+        if city is not None and city.name not in suggestions:
+            suggestions.append(city.name)
+    return f" Did you mean {' or '.join(suggestions)}?" if suggestions else ""
+
+
+def find_cities(command, gazetteer):
+    """
+    Resolve the places a weather command asks about
+
+    Returns:
+        tuple: (cities, unknown) - distinct City tuples in spoken order, and
+        the place phrases that matched no known city (refused unless
+        GAZETTEER_CONFIG['strict'] is off, when they are asked for as said)
+    """
+    cities, unknown = [], []
+    for phrase in extract_city_phrases(command):
+        matches = gazetteer.find_cities(phrase)
+        if matches:
+            cities += [match.city for match in matches]
+            continue
+        city = correct_city(phrase, gazetteer)
+        if city is not None:
+            cities.append(city)
+        else:
+            unknown.append(phrase)
+    if not cities:
+        # "tokyo weather", "london weather for the weekend"
+        matches = gazetteer.find_cities(command)
+        if matches:
+            cities, unknown = [match.city for match in matches], []
+    return list(dict.fromkeys(cities)), unknown
+
+
+def weather_report(command, budget=None):
+    """Yield the spoken weather response for a command, one fragment at a time"""
+    gazetteer = get_gazetteer()
+    cities, unknown = find_cities(command, gazetteer)
+    queries = [city.query for city in cities]
+    
+    if unknown and not (GAZETTEER_CONFIG.get('strict') and len(gazetteer)):
+        queries += unknown
+        unknown = []
+    if unknown and not queries:
+        # Not a place we know: don't spend a round trip on it
+        yield f"Sorry, I don't know a city called {' or '.join(unknown)}.{did_you_mean(unknown, gazetteer)}"
+        return
+    if len(queries) > 1:
+        yield from multi_city_report(queries, unknown, budget)
+        return
+    if not queries:
+        # Kept warm by the weather prefetcher, so this never waits on the network
+        queries = [city_query(DEFAULT_CITY)]
+        yield f"No city specified. Showing weather for {DEFAULT_CITY}."
+
+    query = queries[0]
+    client = get_weather_client()
+    try:
+        report = client.get(query, budget)
+        if report is not None:
+            yield describe(report)
+        else:
+            name = query.split(',')[0]
+            yield f"Sorry, I couldn't find weather information for {name}.{did_you_mean([name], gazetteer)}"
+            
+    except (CircuitOpenError, BudgetExceeded, requests.Timeout) as e:
+        print(f"Weather API unavailable: {e}")
+        yield unavailable_message(e)
+        report = client.cached(query)
+        if report is not None:
+            yield f"The last report I have, from {client.age(query) / 60:.0f} minutes ago: {describe(report)}"
+    except requests.RequestException as e:
+        yield "Sorry, there was an error connecting to the weather service."
+        print(f"Weather API error: {e}")
+    except Exception as e:
+        yield "Sorry, there was an error getting the weather."
+        print(f"Weather error: {e}")
+    if unknown:
+        yield f"I don't know a city called {' or '.join(unknown)}.{did_you_mean(unknown, gazetteer)}"
+
+
+def unavailable_message(error):
+    """Spoken fast-fail notice for a skipped or too-slow weather service"""
+    if isinstance(error, CircuitOpenError):
+        retry = round(error.retry_in)
+        when = f"in about {retry} seconds" if retry > 1 else "in a moment"
+        return f"The weather service isn't responding, so I'm not waiting on it. I'll try it again {when}."
+    return "The weather service is too slow right now."
+
+
+def multi_city_report(queries, unknown=(), budget=None):
+    """
+    Yield one combined answer for several cities, fetched concurrently
+
+    Cities are spoken in the order asked, each as soon as it (and those
+    before it) has arrived; any still loading at the shared deadline are
+    named together at the end instead of holding up the rest. While the
+    weather breaker is open, each city falls back to its last cached report.
+    """
+    limit = WEATHER_CONFIG['max_cities']
+    if len(queries) > limit:
+        print(f"DEBUG - Weather asked for {len(queries)} cities, answering the first {limit}")
+        queries = queries[:limit]
+
+    client = get_weather_client()
+    late, missing, failed, last_known = [], [], [], []
+    offline = None
+    first = True
+    for query, report, error in client.get_many(queries, budget=budget):
+        name = query.split(',')[0]
+        if report is not None:
+            yield f"{'Here is the weather. ' if first else ''}{brief(report)}."
+            first = False
+        elif isinstance(error, CircuitOpenError):
+            # Fresh cached cities were answered above; the notice is said once
+            offline = error
+            cached = client.cached(query)
+            if cached is not None:
+                last_known.append(f"{brief(cached)}, from {client.age(query) / 60:.0f} minutes ago")
+            else:
+                failed.append(name)
+        elif isinstance(error, (FutureTimeout, BudgetExceeded, requests.Timeout)):
+            late.append(name)
+        elif error is not None:
+            print(f"Weather error for {name}: {error}")
+            failed.append(name)
+        else:
+            missing.append(name)
+
+    if offline is not None:
+        yield unavailable_message(offline)
+        if last_known:
+            yield f"The last reports I have: {'. '.join(last_known)}."
+    if late:
+        yield f"{' and '.join(late)} {'is' if len(late) == 1 else 'are'} taking too long, ask me again in a moment."
+    if failed:
+        yield f"Sorry, I couldn't reach the weather service for {' and '.join(failed)}."
+    if missing or unknown:
+        names = missing + list(unknown)
+        yield f"Sorry, I couldn't find weather information for {' or '.join(names)}.{did_you_mean(names, get_gazetteer())}"
@@ -0,0 +1,112 @@
+# handlers/web.py - Browser-based handlers: Google search, YouTube and WhatsApp
+
+import os
+import re
+from voice_output import speak
+from commands import debug_command
+from browser import google_search_url, open_url, whatsapp_send_uri, youtube_search_url
+
+def handle_search(command, gui):
+    """
+    Handle web search requests with improved search capability
+    """
+    debug_command(command, command, "Search")
+    
+    # Multiple patterns to extract search query
+    patterns = [
+        r'(?:search|google|look up|find)(?: for)?\s+(.+)',
+        r'(?:search|google|look up|find)\s+(.+)',
+        r'(.+?)\s+(?:on google|search)',
+    ]
+    
+    query = None
+    for pattern in patterns:
+        match = re.search(pattern, command, re.IGNORECASE)
+        if match:
+            query = match.group(1).strip()
+            break
+    
+    # Fallback: remove search keywords from command
+    if not query:
+        search_words = ['search', 'google', 'look up', 'find', 'for']
+        words = command.split()
+        filtered_words = [word for word in words if word not in search_words]
+        query = ' '.join(filtered_words)
+    
+    if query and len(query.strip()) > 0:
+        speak(f"Searching for {query}", gui)
+        open_url(google_search_url(query))
+    else:
+        speak("What would you like me to search for?", gui)
+
+
+def handle_youtube(command, gui):
+    """
+    Enhanced YouTube handler with better pattern matching
+    """
+    debug_command(command, command, "YouTube")
+    
+    # Pattern to extract what to search for
+    patterns = [
+        r'(?:youtube|play|watch)\s+(.+)',
+        r'(.+?)\s+(?:on youtube|youtube)',
+        r'(?:open youtube and (?:search|find|play|watch))\s+(.+)',
+    ]
+    
+    query = None
+    for pattern in patterns:
+        match = re.search(pattern, command, re.IGNORECASE)
+        if match:
+            query = match.group(1).strip()
+            # Remove common stop words
+            stop_words = ['video', 'videos', 'on', 'youtube']
+            query_words = [word for word in query.split() if word.lower() not in stop_words]
+            query = ' '.join(query_words)
+            break
+    
+    if query and len(query.strip()) > 0:
+        speak(f"Searching YouTube for {query}", gui)
+        open_url(youtube_search_url(query))
+    else:
+        speak("Opening YouTube.", gui)
+        open_url("https://www.youtube.com")
+
+
+def handle_whatsapp(command, gui):
+    """
+    Enhanced WhatsApp handler
+    """
+    debug_command(command, command, "WhatsApp")
+    
+    # Pattern for sending message
+    message_pattern = r'(?:whatsapp|message|text)\s+(.+?)\s+(?:saying|that)\s+(.+)'
+    match = re.search(message_pattern, command, re.IGNORECASE)
+    
+    if match:
+        contact = match.group(1).strip()
+        message = match.group(2).strip()
+        
+        if os.name == 'nt':
+            try:
+                speak(f"Opening WhatsApp to message {contact}.", gui)
+                # startfile hands the link to the registered app without a shell,
+                # so '&' or '%' in the message can't break the command line
+                os.startfile(whatsapp_send_uri(message))
+                return
+            except Exception as e:
+                print(f"Error launching WhatsApp app: {e}")
+    
+    # Just open WhatsApp
+    speak("Opening WhatsApp.", gui)
+    if os.name == 'nt':
+        try:
+            os.startfile("whatsapp:")
+        except OSError:
+            open_url("https://web.whatsapp.com/")
+    else:
+        open_url("https://web.whatsapp.com/")
+
+def handle_inferred_search(command, gui):
+    """Treat an unmatched multi-word command as a Google search"""
+    speak("I'll search for that on Google.", gui)
+    return handle_search("search " + command, gui)
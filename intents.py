@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+# intents.py - Declarative intent registry with lazily imported handlers
+
+import importlib
+
+from router import IntentRouter, INFERRED_SEARCH, UNKNOWN
+
+# Entry point group third-party packages use to contribute intents.
+# Each entry point must load to an Intent, a list of Intents, or a
+# callable returning either.
+ENTRY_POINT_GROUP = "jarvis.intents"
+
+
+class Intent:
+    """
+    A routable command type
+
+    Args:
+        name (str): Intent name, e.g. "WEATHER"
+        keywords (list): Substrings that select this intent
+        priority (int): Lower wins when several intents match
+        handler (str): Dotted path to the handler, "package.module:function"
+        takes_command (bool): Whether the handler takes (command, gui) or just (gui)
+    """
+
+    def __init__(self, name, keywords, priority, handler, takes_command=True):
+        self.name = name
+        self.keywords = list(keywords)
+        self.priority = priority
+        self.handler = handler
+        self.takes_command = takes_command
+
+    def __repr__(self):
+        return f"Intent({self.name!r}, priority={self.priority}, handler={self.handler!r})"
+
+
+# Built-in intents. Priorities are spaced out so plugins can slot in between.
+BUILTIN_INTENTS = [
+    Intent("EXIT", ["exit", "quit", "goodbye", "bye", "stop", "end", "shutdown"],
+           10, "handlers.basic:handle_goodbye", takes_command=False),
+    Intent("HELP", ["help"],
+           20, "handlers.basic:handle_help", takes_command=False),
+    Intent("GREETING", ["hello", "hi", "hey", "greetings", "good morning", "good afternoon", "good evening"],
+           30, "handlers.basic:handle_greeting", takes_command=False),
+    Intent("TIME", ["time", "clock", "what time"],
+           40, "handlers.basic:handle_time", takes_command=False),
+    Intent("WEATHER", ["weather", "temperature", "forecast", "climate"],
+           50, "handlers.weather:handle_weather"),
+    Intent("OS_COMMAND", ["recycle bin", "trash", "garbage", "waste bin"],
+           60, "handlers.os_command:handle_os_command"),
+    Intent("WHATSAPP", ["whatsapp"],
+           70, "handlers.web:handle_whatsapp"),
+    Intent("YOUTUBE", ["youtube", "play video", "watch video", "play", "watch"],
+           80, "handlers.web:handle_youtube"),
+    Intent("SEARCH", ["search", "google", "look up", "find", "search for"],
+           90, "handlers.web:handle_search"),
+    Intent("OPEN_APP", ["open", "launch", "start", "run"],
+           100, "handlers.apps:handle_open_app"),
+    # Fallbacks chosen by the router when no keyword matches
+    Intent(INFERRED_SEARCH, [], 1000, "handlers.web:handle_inferred_search"),
+    Intent(UNKNOWN, [], 1010, "handlers.basic:handle_unknown", takes_command=False),
+]
+
+
+def resolve_handler(path):
+    """Import "package.module:function" (or "package.module.function") and return the function"""
+    if ":" in path:
+        module_name, attr = path.split(":", 1)
+    else:
+        module_name, attr = path.rsplit(".", 1)
+    return getattr(importlib.import_module(module_name), attr)
+
+
+class IntentRegistry:
+    """
+    Holds intents, routes commands to them and imports handlers on first use
+    """
+
+    def __init__(self, intents=()):
+        self._intents = {}
+        self._handlers = {}
+        self._router = None
+        for intent in intents:
+            self.register(intent)
+
+    def register(self, intent):
+        """Add or replace an intent; the router is rebuilt on next use"""
+        self._intents[intent.name] = intent
+        self._handlers.pop(intent.name, None)
+        self._router = None
+
+    def load_entry_points(self, group=ENTRY_POINT_GROUP):
+        """Register intents published by installed packages"""
+        try:
+            from importlib.metadata import entry_points
+        except ImportError:
+            return 0
+
+        try:
+            eps = entry_points(group=group)
+        except TypeError:  # Python < 3.10
+            eps = entry_points().get(group, [])
+
+        count = 0
+        for ep in eps:
+            try:
+                loaded = ep.load()
+                if callable(loaded) and not isinstance(loaded, Intent):
+                    loaded = loaded()
+                for intent in (loaded if isinstance(loaded, (list, tuple)) else [loaded]):
+                    self.register(intent)
+                    count += 1
+            except Exception as e:
+                print(f"Warning: could not load intent plugin '{ep.name}': {e}")
+        return count
+
+    @property
+    def intents(self):
+        """Registered intents in priority order"""
+        return sorted(self._intents.values(), key=lambda intent: intent.priority)
+
+    @property
+    def router(self):
+        if self._router is None:
+            self._router = IntentRouter([(intent.name, intent.keywords) for intent in self.intents])
+        return self._router
+
+    def route(self, command):
+        """Return the name of the intent that should handle command"""
+        return self.router.route(command)
+
+    def get_handler(self, name):
+        """Return the handler for intent `name`, importing its module on first use"""
+        handler = self._handlers.get(name)
+        if handler is None:
+            handler = resolve_handler(self._intents[name].handler)
+            self._handlers[name] = handler
+        return handler
+
+    def dispatch(self, name, command, gui):
+        """Call the handler for intent `name`"""
+        handler = self.get_handler(name)
+        if self._intents[name].takes_command:
+            return handler(command, gui)
+        return handler(gui)
+
+
+def create_default_registry():
+    """Registry with the built-in intents plus any installed plugins"""
+    registry = IntentRegistry(BUILTIN_INTENTS)
+    registry.load_entry_points()
+    return registry
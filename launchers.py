@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+# launchers.py - Discover Linux .desktop launchers (and allowlisted executables) into a cached index
+
+import json
+import os
+import re
+import shutil
+import threading
+import time
+
+from app_index import AppIndex
+from config import LAUNCHER_DISCOVERY_CONFIG
+
+CACHE_VERSION = 2  # 2: $PATH limited to an allowlist, exact-only names
+
+# Exec field codes from the Desktop Entry spec (%f, %U, %i, ...)
+_FIELD_CODE = re.compile(r"%[fFuUdDnNickvm]")
+
+_index = None
+_ready = threading.Event()
+_thread = None
+
+
+def application_dirs():
+    """XDG applications directories, most specific first"""
+    data_home = os.environ.get("XDG_DATA_HOME") or os.path.expanduser("~/.local/share")
+    data_dirs = os.environ.get("XDG_DATA_DIRS") or "/usr/local/share:/usr/share"
+    dirs = [data_home] + data_dirs.split(":")
+    return [os.path.join(d, "applications") for d in dirs if d]
+
+
+def path_dirs():
+    return [d for d in os.environ.get("PATH", "").split(os.pathsep) if d]
+
+
+def parse_desktop_file(path):
+    """
+    Parse the [Desktop Entry] group of a .desktop file
+
+    Returns:
+        dict: {'name', 'exec', 'keywords'} or None if it isn't a launchable application
+    """
+    entry = {}
+    in_entry = False
+    try:
+        with open(path, encoding="utf-8", errors="replace") as f:
+            for line in f:
+                line = line.strip()
+                if not line or line.startswith("#"):
+                    continue
+                if line.startswith("["):
+                    if in_entry:
+                        break
+                    in_entry = line == "[Desktop Entry]"
+                    continue
+                if in_entry and "=" in line:
+                    key, value = line.split("=", 1)
+                    entry[key.strip()] = value.strip()
+    except OSError:
+        return None
+
+    if entry.get("Type", "Application") != "Application":
+        return None
+    if entry.get("Hidden", "").lower() == "true" or "Name" not in entry or "Exec" not in entry:
+        return None
+
+    command = _FIELD_CODE.sub("", entry["Exec"]).replace("%%", "%").strip()
+    keywords = [k.strip() for k in entry.get("Keywords", "").split(";") if k.strip()]
+    return {"name": entry["Name"], "exec": command, "keywords": keywords}
+
+
+def _dir_mtime(d, launchers=False):
+    """Directory mtime; for launcher dirs also the newest .desktop file, so in-place edits count"""
+    try:
+        mtime = os.stat(d).st_mtime
+        if launchers:
+            with os.scandir(d) as it:
+                for item in it:
+                    if item.name.endswith(".desktop"):
+                        mtime = max(mtime, item.stat().st_mtime)
+    except OSError:
+        return None
+    return mtime
+
+
+def _dir_mtimes(dirs):
+    app_dirs = set(application_dirs())
+    return {d: _dir_mtime(d, d in app_dirs) for d in dirs}
+
+
+def scan(path_allowlist=()):
+    """
+    Scan the XDG applications directories, plus any allowlisted $PATH executables
+
+    Returns:
+        dict: {'apps': {name: command}, 'aliases': {alias: name}, 'exact_only': [name],
+               'path_allowlist': [name], 'mtimes': {dir: mtime}}
+    """
+    apps = {}
+    aliases = {}
+    dirs = application_dirs()
+
+    # Bare executables only by explicit name; the rest of $PATH (poweroff,
+    # reboot, kill, ...) must never be reachable from a misheard phrase
+    path_names = set()
+    if path_allowlist:
+        dirs = dirs + path_dirs()
+        for name in path_allowlist:
+            path = shutil.which(name)
+            if path:
+                apps[name.lower()] = path
+                path_names.add(name.lower())
+
+    # Desktop launchers override bare executables of the same name;
+    # within launchers the earlier (more specific) directory wins
+    desktop_names = set()
+    for d in application_dirs():
+        try:
+            names = sorted(os.listdir(d))
+        except OSError:
+            continue
+        for filename in names:
+            if not filename.endswith(".desktop"):
+                continue
+            entry = parse_desktop_file(os.path.join(d, filename))
+            if not entry:
+                continue
+            name = entry["name"].lower()
+            if name in desktop_names:
+                continue
+            desktop_names.add(name)
+            path_names.discard(name)
+            apps[name] = entry["exec"]
+            aliases.setdefault(filename[:-len(".desktop")].lower(), name)
+            for keyword in entry["keywords"]:
+                aliases.setdefault(keyword.lower(), name)
+
+    return {"apps": apps, "aliases": aliases, "exact_only": sorted(path_names),
+            "path_allowlist": sorted(path_allowlist), "mtimes": _dir_mtimes(dirs)}
+
+
+def load_cache(cache_path, path_allowlist=()):
+    """Return cached scan results if no scanned directory (or the allowlist) has changed, else None"""
+    try:
+        with open(cache_path, encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if data.get("version") != CACHE_VERSION or data.get("path_allowlist") != sorted(path_allowlist):
+        return None
+    if _dir_mtimes(data.get("mtimes", {})) != data.get("mtimes"):
+        return None
+    return data
+
+
+def save_cache(cache_path, data):
+    try:
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        tmp_path = cache_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(dict(data, version=CACHE_VERSION), f)
+        os.replace(tmp_path, cache_path)
+    except OSError as e:
+        print(f"Warning: could not write launcher cache: {e}")
+
+
+def build_index(config=LAUNCHER_DISCOVERY_CONFIG):
+    """Load the launcher index from cache, rescanning if the cache is stale"""
+    start = time.perf_counter()
+    cache_path = os.path.expanduser(config["cache_path"])
+    path_allowlist = config.get("path_allowlist", ())
+    data = load_cache(cache_path, path_allowlist)
+    source = "cache"
+    if data is None:
+        data = scan(path_allowlist)
+        save_cache(cache_path, data)
+        source = "scan"
+    index = AppIndex(data["apps"], data["aliases"], exact_only=data["exact_only"])
+    print(f"DEBUG - Launcher index: {len(index)} apps from {source} in {(time.perf_counter() - start) * 1000:.1f} ms")
+    return index
+
+
+def _discover():
+    global _index
+    try:
+        _index = build_index()
+    except Exception as e:
+        print(f"Launcher discovery failed: {e}")
+    finally:
+        _ready.set()
+
+
+def start_discovery():
+    """Build the launcher index on a background thread, once per process"""
+    global _thread
+    if _thread is None and LAUNCHER_DISCOVERY_CONFIG.get("enabled", True):
+        _thread = threading.Thread(target=_discover, name="launcher-discovery", daemon=True)
+        _thread.start()
+    return _thread
+
+
+def get_launcher_index(timeout=2.0):
+    """
+    Return the discovered launcher index, starting discovery if needed
+
+    Waits up to `timeout` seconds for discovery to finish; returns None if it
+    hasn't, or if discovery is disabled or failed.
+    """
+    if start_discovery() is None:
+        return None
+    _ready.wait(timeout)
+    return _index
+
+
+if __name__ == "__main__":
+    index = get_launcher_index(timeout=None)
+    if index is not None:
+        print(f"Discovered {len(index)} apps, {len(index.aliases)} aliases")
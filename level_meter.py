@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+# level_meter.py - Microphone levels shared between the capture thread and the GUI
+
+import numpy as np
+
+POINTS = 128  # Waveform history (about 2 s at 16 kHz with 256-sample blocks)
+BLOCK = 256  # Samples reduced to one RMS/peak pair
+FLOOR_DB = -60.0  # Bottom of the level meter scale
+
+
+class LevelMeter:
+    """
+    Decimated RMS/peak history in fixed-size NumPy arrays.
+
+    The capture thread calls feed() with each raw chunk it reads. That's one
+    vectorized reduction and a slice assignment, with no locks and no per-sample
+    Python objects. The GUI reads the arrays whenever it draws; a frame that
+    races a write just shows one block from the next chunk early.
+    """
+
+    def __init__(self, points=POINTS, block=BLOCK):
+        self.block = block
+        self.rms = np.zeros(points, dtype=np.float32)
+        self.peak = np.zeros(points, dtype=np.float32)
+        self.threshold_db = None  # Speech threshold (VAD noise floor + margin), same dB scale
+        self.version = 0  # Bumped on every write, so the GUI can skip unchanged frames
+        self._index = 0
+
+    def feed(self, pcm, threshold_db=None):
+        """Add a chunk of 16-bit mono PCM"""
+        samples = np.frombuffer(pcm, dtype=np.int16)
+        count = min(len(samples) // self.block, len(self.rms))
+        if not count:
+            return
+        blocks = samples[-count * self.block:].reshape(count, self.block).astype(np.float32) / 32768.0
+        slots = (self._index + np.arange(count)) % len(self.rms)
+        self.rms[slots] = np.sqrt(np.mean(blocks * blocks, axis=1))
+        self.peak[slots] = np.max(np.abs(blocks), axis=1)
+        self._index = (self._index + count) % len(self.rms)
+        if threshold_db is not None:
+            self.threshold_db = threshold_db
+        self.version += 1
+
+    def level_db(self):
+        """Most recent block's RMS level in dB"""
+        return float(20.0 * np.log10(self.rms[self._index - 1] + 1e-5))
+
+    def waveform(self):
+        """Peak history, oldest first"""
+        return np.roll(self.peak, -self._index)
+
+
+def level_fraction(level_db):
+    """Map a dB level onto 0..1 of the meter scale"""
+    return min(1.0, max(0.0, (level_db - FLOOR_DB) / -FLOOR_DB))
+
+
+def waveform_coords(peaks, x0, x1, center_y, half_height):
+    """
+    Flat [x, y, x, y, ...] list for a canvas line, alternating above and below the centre
+
+    Returns:
+        list: Python floats, ready for canvas.coords()
+    """
+    xs = np.linspace(x0, x1, len(peaks))
+    signs = np.where(np.arange(len(peaks)) % 2, 1.0, -1.0)
+    ys = center_y + signs * np.minimum(peaks * 4.0, 1.0) * half_height
+    return np.column_stack((xs, ys)).ravel().tolist()
+
+
+_meter = None
+
+
+def get_level_meter():
+    """Return the shared meter, creating it on first use"""
+    global _meter
+    if _meter is None:
+        _meter = LevelMeter()
+    return _meter
@@ -1,33 +1,30 @@
 #!/usr/bin/env python3
 # main.py - Enhanced voice assistant with better command processing
 
+import inspect
+import sys
 import time
 import speech_recognition as sr
 import threading
-import customtkinter as ctk
-from voice_input import listen_for_command
-from voice_output import speak
-from commands import (
-    handle_greeting,
-    handle_goodbye,
-    handle_time,
-    handle_weather,
-    handle_search,
-    handle_open_app,
-    handle_unknown,
-    handle_youtube,
-    handle_whatsapp,
-    handle_os_command,
-    handle_help,
-    preprocess_command,
-    debug_command
-)
-
-from gui import JarvisGUI
-
-# GUI object will be shared
+from voice_input import listen_for_command, next_queued_command
+from capture import get_capture_pipeline
+from voice_output import speak, wait_for_speech, prewarm_phrases, warm_up_speech, PRIORITY_URGENT
+from commands import preprocess_command, debug_command
+from intents import create_default_registry
+from config import current_platform
+from launchers import start_discovery
+from outbound import add_listener, health_summary
+from handlers.basic import CANNED_PHRASES
+from ui_channel import UiChannel, NullSink
+
+# GUI update channel shared with the assistant thread (UiChannel or NullSink)
 gui = None
 
+STARTUP_BANNER = "Jarvis is now active. How can I help you? Say 'help' to see available commands."
+
+# Intent keywords are compiled once; handler modules load on first use
+INTENT_REGISTRY = create_default_registry()
+
 def process_command(command):
     """Process the recognized command with improved routing"""
     if not command:
@@ -49,93 +46,41 @@ def process_command(command):
     if not command:
         return
     
-    # --- Enhanced Command Routing with Priority ---
-    # Most specific commands first, then general ones
-    
-    # Exit commands - highest priority
-    exit_keywords = ["exit", "quit", "goodbye", "bye", "stop", "end", "shutdown"]
-    if any(keyword in command for keyword in exit_keywords):
-        debug_command(original_command, command, "EXIT")
-        return handle_goodbye(gui)
-    
-    # Help command
-    if "help" in command:
-        debug_command(original_command, command, "HELP")
-        return handle_help(gui)
-    
-    # Greeting commands
-    greeting_keywords = ["hello", "hi", "hey", "greetings", "good morning", "good afternoon", "good evening"]
-    if any(keyword in command for keyword in greeting_keywords):
-        debug_command(original_command, command, "GREETING")
-        return handle_greeting(gui)
-    
-    # Time commands
-    time_keywords = ["time", "clock", "what time"]
-    if any(keyword in command for keyword in time_keywords):
-        debug_command(original_command, command, "TIME")
-        return handle_time(gui)
-    
-    # Weather commands
-    weather_keywords = ["weather", "temperature", "forecast", "climate"]
-    if any(keyword in command for keyword in weather_keywords):
-        debug_command(original_command, command, "WEATHER")
-        return handle_weather(command, gui)
-    
-    # OS commands - Recycle bin operations (high priority for specificity)
-    recycle_keywords = ["recycle bin", "trash", "garbage", "waste bin"]
-    if any(keyword in command for keyword in recycle_keywords):
-        debug_command(original_command, command, "OS_COMMAND")
-        return handle_os_command(command, gui)
-    
-    # WhatsApp commands
-    if "whatsapp" in command:
-        debug_command(original_command, command, "WHATSAPP")
-        return handle_whatsapp(command, gui)
-    
-    # YouTube commands - check for YouTube specifically
-    youtube_keywords = ["youtube", "play video", "watch video"]
-    youtube_in_command = any(keyword in command for keyword in youtube_keywords)
-    general_play_keywords = ["play", "watch"] # These could be YouTube or other media
-    
-    if youtube_in_command or (any(keyword in command for keyword in general_play_keywords) and "youtube" not in command):
-        # If it's clearly YouTube or a general play command, handle it as YouTube
-        debug_command(original_command, command, "YOUTUBE")
-        return handle_youtube(command, gui)
-    
-    # Search commands
-    search_keywords = ["search", "google", "look up", "find", "search for"]
-    if any(keyword in command for keyword in search_keywords):
-        debug_command(original_command, command, "SEARCH")
-        return handle_search(command, gui)
-    
-    # Open application commands
-    open_keywords = ["open", "launch", "start", "run"]
-    if any(keyword in command for keyword in open_keywords):
-        debug_command(original_command, command, "OPEN_APP")
-        return handle_open_app(command, gui)
-    
-    # If no specific command matched, try to infer intent
-    # Check if it might be a search query
-    if len(command.split()) > 2 and not any(char in command for char in "?!"):
-        debug_command(original_command, command, "INFERRED_SEARCH")
-        speak("I'll search for that on Google.", gui)
-        return handle_search("search " + command, gui)
-    
-    # Default to unknown command
-    debug_command(original_command, command, "UNKNOWN")
-    return handle_unknown(gui)
+    # --- Single-pass routing, priority order lives in intents.BUILTIN_INTENTS ---
+    intent = INTENT_REGISTRY.route(command)
+    debug_command(original_command, command, intent)
+    response = INTENT_REGISTRY.dispatch(intent, command, gui)
+    if inspect.isgenerator(response):
+        # Handlers may yield their reply in fragments; speak them as they come
+        speak(response, gui)
+        return None
+    return response
 
 def assistant_thread_func():
     """Main function that runs the voice assistant loop"""
     global gui
-    speak("Jarvis is now active. How can I help you? Say 'help' to see available commands.", gui)
+    
+    # Open the microphone, calibrate once and keep capturing in the background
+    # so speech during handlers or TTS is queued instead of lost
+    pipeline = None
+    try:
+        pipeline = get_capture_pipeline(gui)
+    except Exception as e:
+        print(f"Could not start background capture, falling back to blocking listen: {e}")
+    
+    speak(STARTUP_BANNER, gui, cache=True)
+    # Render the remaining fixed responses while we wait for the first command
+    prewarm_phrases(CANNED_PHRASES)
     
     consecutive_errors = 0
     max_consecutive_errors = 5
     
     while True:
         try:
-            command = listen_for_command(gui)
+            if pipeline is not None and pipeline.running:
+                command = next_queued_command(pipeline, gui)
+            else:
+                command = listen_for_command(gui)
             
             # Reset error counter on successful command
             if command:
@@ -144,26 +89,43 @@ def assistant_thread_func():
             response = process_command(command)
             
             if response == "exit":
-                gui.root.quit() # Properly close the GUI
+                wait_for_speech(timeout=10) # Let the goodbye finish playing
+                gui.quit() # Properly close the GUI
                 break
                 
         except KeyboardInterrupt:
-            speak("Shutting down Jarvis.", gui)
+            speak("Shutting down Jarvis.", gui, wait=True, priority=PRIORITY_URGENT, cache=True)
             break
         except Exception as e:
             consecutive_errors += 1
             print(f"Error: {e}")
             
             if consecutive_errors >= max_consecutive_errors:
-                speak("I'm having trouble with repeated errors. Please restart me.", gui)
+                speak("I'm having trouble with repeated errors. Please restart me.", gui, wait=True, priority=PRIORITY_URGENT)
                 break
             else:
-                speak("Sorry, something went wrong. Please try again.", gui)
+                speak("Sorry, something went wrong. Please try again.", gui, key="error", cache=True)
             
             # Small delay to prevent rapid error loops
             time.sleep(1)
 
-def main():
+def warm_up_services():
+    """
+    Prefetch weather and find the browser, off the startup path
+
+    weather_client pulls in requests and browser pulls in webbrowser, so
+    both are imported here, on a background thread, rather than at the top
+    of this module.
+    """
+    from weather_client import start_prefetch
+    from browser import get_browser
+
+    # Fetch weather for the default and favourite cities before anyone asks
+    start_prefetch()
+    # Find the browser now so the first search opens immediately
+    get_browser().resolve()
+
+def main(headless=False):
     """Main function to setup GUI and start assistant thread"""
     global gui
     
@@ -181,8 +143,30 @@ def main():
     print("- Goodbye")
     print("-" * 50)
     
+    # Load the speech driver while the window is being built
+    warm_up_speech()
+
+    # Index installed launchers in the background so "open <app>" can find them
+    if current_platform() == 'linux':
+        start_discovery()
+
+    # Weather prefetch and browser lookup import their modules in the background
+    threading.Thread(target=warm_up_services, name="warm-up", daemon=True).start()
+
+    if headless:
+        gui = NullSink()
+        assistant_thread_func()
+        return
+
+    import customtkinter as ctk
+    from gui import JarvisGUI
+
     root = ctk.CTk()
-    gui = JarvisGUI(root)
+    # The assistant thread never touches Tk directly; updates go through the channel
+    gui = UiChannel(JarvisGUI(root))
+    # Show which remote services are being skipped while their breakers are open
+    add_listener(lambda: gui.update_health(health_summary()))
+    gui.update_health(health_summary())
 
     # Run the assistant logic in a separate thread
     assistant_thread = threading.Thread(target=assistant_thread_func, daemon=True)
@@ -194,4 +178,4 @@ def main():
         print("\nShutting down Jarvis...")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main(headless="--headless" in sys.argv)
\ No newline at end of file
@@ -4,6 +4,11 @@ import os
 import sys
 from voice_output import speak
 
+# Coalesce key for recycle bin result messages: a newer one replaces any that
+# haven't been spoken yet. The "contains N items" warnings go without it so a
+# quick "emptied" can never replace them before they are heard
+RECYCLE_BIN_KEY = "recycle-bin"
+
 # Try to import Windows-specific modules
 try:
     import winshell
@@ -37,7 +42,7 @@ def open_recycle_bin(gui):
                 try:
                     print(f"DEBUG - Trying method {i}...")
                     method()
-                    speak("Recycle Bin opened successfully.", gui)
+                    speak("Recycle Bin opened successfully.", gui, key=RECYCLE_BIN_KEY, cache=True)
                     return True
                 except subprocess.CalledProcessError as e:
                     print(f"DEBUG - Method {i} failed with return code {e.returncode}")
@@ -50,7 +55,7 @@ def open_recycle_bin(gui):
                     continue
             
             # If all methods failed
-            speak("I had trouble opening the Recycle Bin. Please try opening it manually.", gui)
+            speak("I had trouble opening the Recycle Bin. Please try opening it manually.", gui, key=RECYCLE_BIN_KEY, cache=True)
             return False
             
         else:  # macOS or Linux
@@ -58,11 +63,11 @@ def open_recycle_bin(gui):
                 try:
                     subprocess.run(['open', os.path.expanduser('~/.Trash')], 
                                  check=True, timeout=10)
-                    speak("Trash opened successfully.", gui)
+                    speak("Trash opened successfully.", gui, key=RECYCLE_BIN_KEY, cache=True)
                     return True
                 except Exception as e:
                     print(f"macOS trash error: {e}")
-                    speak("I couldn't open the Trash folder.", gui)
+                    speak("I couldn't open the Trash folder.", gui, key=RECYCLE_BIN_KEY, cache=True)
                     return False
             else:  # Linux
                 trash_paths = [
@@ -76,18 +81,18 @@ def open_recycle_bin(gui):
                         try:
                             subprocess.run(['xdg-open', trash_path], 
                                          check=True, timeout=10)
-                            speak("Trash folder opened successfully.", gui)
+                            speak("Trash folder opened successfully.", gui, key=RECYCLE_BIN_KEY, cache=True)
                             return True
                         except Exception as e:
                             print(f"Linux trash error for {trash_path}: {e}")
                             continue
                 
-                speak("I couldn't locate the trash folder on this Linux system.", gui)
+                speak("I couldn't locate the trash folder on this Linux system.", gui, key=RECYCLE_BIN_KEY, cache=True)
                 return False
                 
     except Exception as e:
         print(f"Error opening recycle bin: {e}")
-        speak("I encountered an error trying to open the recycle bin.", gui)
+        speak("I encountered an error trying to open the recycle bin.", gui, key=RECYCLE_BIN_KEY, cache=True)
         return False
 
 def empty_recycle_bin(gui):
@@ -97,7 +102,7 @@ def empty_recycle_bin(gui):
     try:
         if os.name == 'nt':  # Windows
             if not WINSHELL_AVAILABLE:
-                speak("Sorry, I need the winshell library to empty the recycle bin on Windows.", gui)
+                speak("Sorry, I need the winshell library to empty the recycle bin on Windows.", gui, key=RECYCLE_BIN_KEY, cache=True)
                 return False
             
             # Check if recycle bin has items first
@@ -106,7 +111,7 @@ def empty_recycle_bin(gui):
                 items = list(recycle_bin)
                 
                 if not items:
-                    speak("The recycle bin is already empty.", gui)
+                    speak("The recycle bin is already empty.", gui, key=RECYCLE_BIN_KEY, cache=True)
                     return True
                 
                 item_count = len(items)
@@ -117,12 +122,12 @@ def empty_recycle_bin(gui):
                 
                 print("DEBUG - Attempting to empty recycle bin...")
                 recycle_bin.empty(confirm=False, show_progress=False, sound=False)
-                speak("The recycle bin has been emptied successfully.", gui)
+                speak("The recycle bin has been emptied successfully.", gui, key=RECYCLE_BIN_KEY, cache=True)
                 return True
                 
             except Exception as e:
                 print(f"Error accessing recycle bin: {e}")
-                speak("I couldn't access the recycle bin contents.", gui)
+                speak("I couldn't access the recycle bin contents.", gui, key=RECYCLE_BIN_KEY, cache=True)
                 return False
                 
         else:  # macOS or Linux
@@ -133,21 +138,21 @@ def empty_recycle_bin(gui):
                         # Count items first
                         items = os.listdir(trash_path)
                         if not items:
-                            speak("The trash is already empty.", gui)
+                            speak("The trash is already empty.", gui, key=RECYCLE_BIN_KEY, cache=True)
                             return True
                         
                         speak(f"The trash contains {len(items)} items. Emptying now.", gui)
                         subprocess.run(['rm', '-rf', f'{trash_path}/*'], 
                                      shell=True, check=True, timeout=30)
-                        speak("Trash emptied successfully.", gui)
+                        speak("Trash emptied successfully.", gui, key=RECYCLE_BIN_KEY, cache=True)
                         return True
                     else:
-                        speak("I couldn't find the trash folder.", gui)
+                        speak("I couldn't find the trash folder.", gui, key=RECYCLE_BIN_KEY, cache=True)
                         return False
                         
                 except Exception as e:
                     print(f"macOS trash empty error: {e}")
-                    speak("I encountered an error emptying the trash.", gui)
+                    speak("I encountered an error emptying the trash.", gui, key=RECYCLE_BIN_KEY, cache=True)
                     return False
                     
             else:  # Linux
@@ -161,25 +166,25 @@ def empty_recycle_bin(gui):
                         try:
                             items = os.listdir(trash_path)
                             if not items:
-                                speak("The trash is already empty.", gui)
+                                speak("The trash is already empty.", gui, key=RECYCLE_BIN_KEY, cache=True)
                                 return True
                             
                             speak(f"Emptying {len(items)} items from trash.", gui)
                             subprocess.run(['rm', '-rf', f'{trash_path}/*'], 
                                          shell=True, check=True, timeout=30)
-                            speak("Trash emptied successfully.", gui)
+                            speak("Trash emptied successfully.", gui, key=RECYCLE_BIN_KEY, cache=True)
                             return True
                             
                         except Exception as e:
                             print(f"Linux trash empty error for {trash_path}: {e}")
                             continue
                 
-                speak("I couldn't empty the trash on this Linux system.", gui)
+                speak("I couldn't empty the trash on this Linux system.", gui, key=RECYCLE_BIN_KEY, cache=True)
                 return False
                 
     except Exception as e:
         print(f"Error emptying recycle bin: {e}")
-        speak("I ran into an error trying to empty the recycle bin.", gui)
+        speak("I ran into an error trying to empty the recycle bin.", gui, key=RECYCLE_BIN_KEY, cache=True)
         return False
 
 def check_system_compatibility():
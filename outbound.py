@@ -0,0 +1,224 @@
+#!/usr/bin/env python3
+# outbound.py - Circuit breakers and latency budgets shared by every call to a remote service
+
+import threading
+import time
+
+from config import OUTBOUND_CONFIG
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half-open"
+
+
+class CircuitOpenError(Exception):
+    """The endpoint failed repeatedly and is being skipped until its next probe"""
+
+    def __init__(self, endpoint, retry_in):
+        super().__init__(f"{endpoint} is unavailable (retrying in {retry_in:.0f}s)")
+        self.endpoint = endpoint
+        self.retry_in = retry_in
+
+
+class BudgetExceeded(Exception):
+    """The command ran out of time before this call could start"""
+
+
+class CircuitBreaker:
+    """
+    Per-endpoint failure tracker.
+
+    closed: calls go through; `failure_threshold` consecutive failures open it.
+    open: calls fail at once with CircuitOpenError for `reset_timeout` seconds.
+    half-open: one probe call is let through; success closes the breaker,
+    failure opens it again with the reset timeout doubled (up to
+    `max_reset_timeout`), so a service that stays down is probed less often.
+    """
+
+    def __init__(self, name, failure_threshold=3, reset_timeout=30.0, max_reset_timeout=300.0):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.base_reset_timeout = reset_timeout
+        self.max_reset_timeout = max_reset_timeout
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self._state = CLOSED
+        self._opened_at = 0.0
+        self._probing = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self):
+        with self._lock:
+            if self._state == OPEN and time.monotonic() - self._opened_at >= self.reset_timeout:
+                return HALF_OPEN
+            return self._state
+
+    def retry_in(self):
+        """Seconds until the next probe is allowed (0 unless open)"""
+        with self._lock:
+            if self._state != OPEN:
+                return 0.0
+            return max(0.0, self.reset_timeout - (time.monotonic() - self._opened_at))
+
+    def allow(self):
+        """
+        Whether a call may go out now. In half-open state only one caller
+        gets True (the probe); it must report back with record_success/failure,
+        or release() if the call was abandoned for reasons of its own.
+        """
+        with self._lock:
+            if self._state == CLOSED:
+                return True
+            if self._state == OPEN:
+                if time.monotonic() - self._opened_at < self.reset_timeout:
+                    return False
+                self._state = HALF_OPEN
+                self._probing = False
+            if self._probing:
+                return False
+            self._probing = True
+            return True
+
+    def release(self):
+        """Give back the probe from allow() when the call ended without saying anything about the endpoint"""
+        with self._lock:
+            self._probing = False
+
+    def record_success(self):
+        with self._lock:
+            changed = self._state != CLOSED
+            self._state = CLOSED
+            self.failures = 0
+            self._probing = False
+            self.reset_timeout = self.base_reset_timeout
+        if changed:
+            print(f"DEBUG - {self.name} is back")
+            _notify()
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self._state == HALF_OPEN:
+                self.reset_timeout = min(self.reset_timeout * 2, self.max_reset_timeout)
+            elif self.failures < self.failure_threshold or self._state == OPEN:
+                return
+            self._state = OPEN
+            self._opened_at = time.monotonic()
+            self._probing = False
+            reset_timeout = self.reset_timeout
+        print(f"DEBUG - {self.name} failing, skipping it for {reset_timeout:.0f}s")
+        _notify()
+
+
+class Budget:
+    """
+    Time left for one command, shared by every remote call it makes.
+
+    Created when the command starts and passed down explicitly (handlers may
+    run their work on the speech or fan-out threads), so a slow first call
+    leaves less time for the rest instead of each getting a full timeout.
+    """
+
+    def __init__(self, seconds):
+        self.seconds = seconds
+        self.deadline = time.monotonic() + seconds
+
+    def remaining(self):
+        return max(0.0, self.deadline - time.monotonic())
+
+    def timeout(self, cap=None):
+        """
+        Timeout for the next call: what's left of the budget, at most `cap`
+
+        Raises:
+            BudgetExceeded: nothing left
+        """
+        remaining = self.remaining()
+        if remaining <= 0:
+            raise BudgetExceeded(f"{self.seconds:.1f}s command budget used up")
+        return min(remaining, cap) if cap is not None else remaining
+
+
+def command_budget(kind):
+    """Fresh Budget for a command type, from OUTBOUND_CONFIG['budgets']"""
+    budgets = OUTBOUND_CONFIG['budgets']
+    return Budget(budgets.get(kind, budgets['default']))
+
+
+_breakers = {}
+_breakers_lock = threading.Lock()
+_listeners = []
+
+
+def get_breaker(endpoint, failure_threshold=None, reset_timeout=None):
+    """Return the shared breaker for an endpoint, creating it on first use"""
+    with _breakers_lock:
+        breaker = _breakers.get(endpoint)
+        if breaker is None:
+            breaker = CircuitBreaker(
+                endpoint,
+                failure_threshold=failure_threshold or OUTBOUND_CONFIG['failure_threshold'],
+                reset_timeout=reset_timeout or OUTBOUND_CONFIG['reset_timeout'],
+                max_reset_timeout=OUTBOUND_CONFIG['max_reset_timeout'],
+            )
+            _breakers[endpoint] = breaker
+        return breaker
+
+
+def guarded_call(endpoint, call, budget=None, cap=None, is_failure=None):
+    """
+    Run call(timeout) through the endpoint's breaker and the command budget
+
+    Args:
+        endpoint: Breaker name, e.g. 'weather'
+        call: Function taking the timeout (seconds, or None) for its request
+        budget: Budget of the command making the call, if any
+        cap: The endpoint's own timeout, used as is without a budget
+        is_failure: Predicate for exceptions that count against the endpoint
+            (default: all of them)
+
+    Raises:
+        CircuitOpenError: the endpoint is being skipped
+        BudgetExceeded: the command has no time left
+    """
+    breaker = get_breaker(endpoint)
+    timeout = budget.timeout(cap) if budget is not None else cap
+    if not breaker.allow():
+        raise CircuitOpenError(endpoint, breaker.retry_in())
+    try:
+        result = call(timeout)
+    except Exception as e:
+        if is_failure is None or is_failure(e):
+            breaker.record_failure()
+        else:
+            breaker.record_success()
+        raise
+    breaker.record_success()
+    return result
+
+
+def add_listener(listener):
+    """Call listener() whenever any breaker opens or closes"""
+    _listeners.append(listener)
+
+
+def _notify():
+    for listener in list(_listeners):
+        try:
+            listener()
+        except Exception as e:
+            print(f"DEBUG - Breaker listener failed: {e}")
+
+
+def unavailable():
+    """Names of endpoints currently being skipped or probed"""
+    with _breakers_lock:
+        breakers = list(_breakers.values())
+    return [breaker.name for breaker in breakers if breaker.state != CLOSED]
+
+
+def health_summary():
+    """One-line status for the GUI, empty when everything is reachable"""
+    down = unavailable()
+    return f"Offline: {', '.join(down)}" if down else ""
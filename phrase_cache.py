@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+# phrase_cache.py - On-disk cache of pre-rendered audio for fixed TTS responses
+
+import hashlib
+import importlib.util
+import os
+import threading
+import wave
+from collections import OrderedDict
+
+# Cached phrases are played through PyAudio (already needed for the microphone)
+PLAYBACK_AVAILABLE = importlib.util.find_spec("pyaudio") is not None
+
+
+class PhraseCache:
+    """
+    Size-bounded LRU directory of rendered phrases.
+
+    Files are keyed by a hash of text + voice + rate + volume, so changing any
+    TTS setting naturally misses the old renders. Recency is the file mtime,
+    which survives restarts; the least recently played files are deleted
+    once the directory grows past `max_bytes`.
+    """
+
+    def __init__(self, directory, max_bytes):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()  # key -> size, oldest first
+        self._total = 0
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+        self._load()
+
+    def _load(self):
+        files = []
+        for name in os.listdir(self.directory):
+            if name.endswith(".wav"):
+                path = os.path.join(self.directory, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                files.append((stat.st_mtime, name[:-4], stat.st_size))
+        for _, key, size in sorted(files):
+            self._entries[key] = size
+            self._total += size
+
+    @staticmethod
+    def make_key(text, voice, rate, volume):
+        return hashlib.sha1(f"{text}\x00{voice}\x00{rate}\x00{volume}".encode("utf-8")).hexdigest()
+
+    def path_for(self, key):
+        return os.path.join(self.directory, key + ".wav")
+
+    def get(self, key):
+        """Return the cached file path for key (and mark it recently used), or None"""
+        with self._lock:
+            if key not in self._entries:
+                return None
+            path = self.path_for(key)
+            if not os.path.exists(path):
+                self._total -= self._entries.pop(key)
+                return None
+            self._entries.move_to_end(key)
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return path
+
+    def add(self, key, rendered_path):
+        """
+        Move a freshly rendered file into the cache
+
+        Files the player can't read (e.g. AIFF from the macOS driver) are
+        discarded and the phrase stays uncached.
+        """
+        if not is_playable(rendered_path):
+            _remove(rendered_path)
+            return None
+        path = self.path_for(key)
+        os.replace(rendered_path, path)
+        size = os.path.getsize(path)
+        with self._lock:
+            if key in self._entries:
+                self._total -= self._entries.pop(key)
+            self._entries[key] = size
+            self._total += size
+            self._evict()
+        return path
+
+    def _evict(self):
+        while self._total > self.max_bytes and len(self._entries) > 1:
+            key, size = self._entries.popitem(last=False)
+            self._total -= size
+            _remove(self.path_for(key))
+
+    def __contains__(self, key):
+        with self._lock:
+            return key in self._entries
+
+
+def _remove(path):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+def is_playable(path):
+    try:
+        with wave.open(path, "rb") as wav:
+            return wav.getnframes() > 0
+    except (OSError, EOFError, wave.Error):
+        return False
+
+
+_pyaudio = None
+
+
+def play_wav(path, should_stop=None, on_chunk=None):
+    """
+    Play a WAV file through PyAudio, blocking until it finishes
+
+    Args:
+        should_stop: Optional callable checked between chunks; playback ends early when it returns True
+        on_chunk: Optional callable(data, rate, width, channels) called with each chunk as it is played
+
+    Returns:
+        bool: False if playback was stopped early
+    """
+    global _pyaudio
+    import pyaudio
+
+    if _pyaudio is None:
+        _pyaudio = pyaudio.PyAudio()
+    with wave.open(path, "rb") as wav:
+        stream = _pyaudio.open(format=_pyaudio.get_format_from_width(wav.getsampwidth()),
+                               channels=wav.getnchannels(), rate=wav.getframerate(), output=True)
+        try:
+            chunk = 1024
+            data = wav.readframes(chunk)
+            while data:
+                if should_stop is not None and should_stop():
+                    return False
+                if on_chunk is not None:
+                    on_chunk(data, wav.getframerate(), wav.getsampwidth(), wav.getnchannels())
+                stream.write(data)
+                data = wav.readframes(chunk)
+        finally:
+            stream.stop_stream()
+            stream.close()
+    return True
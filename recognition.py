@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+# recognition.py - Run one utterance through several locales concurrently
+
+import time
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+
+import speech_recognition as sr
+
+from config import SPEECH_RECOGNITION_CONFIG
+from outbound import Budget
+from speech_backends import create_backend_chain
+
+
+class RecognitionResult:
+    """A transcript with the locale that produced it and its confidence (0.0 if unknown)"""
+
+    def __init__(self, text, language, confidence=0.0, elapsed=0.0):
+        self.text = text
+        self.language = language
+        self.confidence = confidence
+        self.elapsed = elapsed
+
+    def __repr__(self):
+        return f"RecognitionResult({self.text!r}, {self.language}, confidence={self.confidence:.2f})"
+
+
+class RecognitionCoordinator:
+    """
+    Sends the same AudioData to every configured locale at once.
+
+    The first result at or above `confidence_threshold` wins immediately;
+    otherwise the most confident result that arrived before the deadline is
+    used, with earlier locales in the list breaking ties. Outstanding requests
+    are cancelled (or abandoned if already in flight) once a winner is chosen.
+    The deadline is a Budget passed down to each backend request, so none of
+    them waits out its own timeout after the coordinator has given up.
+    """
+
+    def __init__(self, recognizer, languages=None, deadline=None, confidence_threshold=None,
+                 recognize_fn=None):
+        config = SPEECH_RECOGNITION_CONFIG
+        self.recognizer = recognizer
+        self.languages = list(languages or config.get('languages') or [config['language']])
+        self.deadline = deadline if deadline is not None else config.get('recognition_deadline', 8.0)
+        self.confidence_threshold = (confidence_threshold if confidence_threshold is not None
+                                     else config.get('confidence_threshold', 0.8))
+        # Each locale runs through the configured backend fallback chain
+        self.recognize_fn = recognize_fn or create_backend_chain(config).recognize
+        self._executor = ThreadPoolExecutor(max_workers=max(2, 2 * len(self.languages)),
+                                            thread_name_prefix="recognize")
+
+    def _run(self, audio, language, budget):
+        start = time.perf_counter()
+        text, confidence = self.recognize_fn(self.recognizer, audio, language, budget)
+        return RecognitionResult(text, language, confidence, time.perf_counter() - start)
+
+    def recognize(self, audio, budget=None):
+        """
+        Recognize audio across all locales
+
+        Args:
+            budget: outbound.Budget for the whole recognition (default: the deadline)
+
+        Returns:
+            RecognitionResult
+
+        Raises:
+            sr.UnknownValueError: No locale produced a transcript
+            sr.RequestError: Every locale failed with a backend error
+        """
+        if budget is None:
+            budget = Budget(self.deadline)
+        futures = {self._executor.submit(self._run, audio, language, budget): language
+                   for language in self.languages}
+        pending = set(futures)
+        results = []
+        request_errors = []
+
+        try:
+            while pending:
+                remaining = budget.remaining()
+                if remaining <= 0:
+                    print(f"DEBUG - Recognition deadline hit, abandoning {[futures[f] for f in pending]}")
+                    break
+                done, pending = wait(pending, timeout=remaining, return_when=FIRST_COMPLETED)
+                for future in done:
+                    try:
+                        result = future.result()
+                    except sr.UnknownValueError:
+                        continue
+                    except sr.RequestError as e:
+                        request_errors.append(e)
+                        continue
+                    except Exception as e:
+                        print(f"Recognition error ({futures[future]}): {e}")
+                        continue
+                    if result.confidence >= self.confidence_threshold:
+                        return result
+                    results.append(result)
+        finally:
+            for future in pending:
+                future.cancel()
+
+        if results:
+            order = {language: i for i, language in enumerate(self.languages)}
+            return max(results, key=lambda r: (r.confidence, -order[r.language]))
+        if request_errors and len(request_errors) == len(self.languages):
+            raise request_errors[0]
+        raise sr.UnknownValueError()
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False)
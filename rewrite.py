@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+# rewrite.py - One-pass, word-bounded phrase rewriting for command preprocessing
+
+import re
+
+
+class RewriteEngine:
+    """
+    Applies a phrase -> replacement table in a single left-to-right scan.
+
+    The table is compiled once into one alternation ordered longest phrase
+    first, so at any position the longest phrase wins, and every phrase must
+    start and end on a word boundary. Replaced text is never rescanned, which
+    keeps the result independent of the table's order. Map a phrase to itself
+    to protect it from shorter rules (e.g. 'recycle bin' vs 'recycle').
+    """
+
+    def __init__(self, replacements):
+        self.replacements = {phrase.lower(): new for phrase, new in replacements.items()}
+        phrases = sorted(self.replacements, key=len, reverse=True)
+        alternation = "|".join(re.escape(phrase) for phrase in phrases)
+        self._pattern = re.compile(rf"(?<!\w)(?:{alternation})(?!\w)") if phrases else None
+
+    def apply(self, text):
+        """
+        Rewrite text and report which rules fired
+
+        Returns:
+            tuple: (rewritten text, list of (phrase, replacement) in match order)
+        """
+        if self._pattern is None or not text:
+            return text, []
+
+        fired = []
+
+        def substitute(match):
+            phrase = match.group(0)
+            replacement = self.replacements[phrase]
+            if replacement != phrase:
+                fired.append((phrase, replacement))
+            return replacement
+
+        return self._pattern.sub(substitute, text), fired
+
+    def rewrite(self, text):
+        """Rewrite text, discarding the fired-rule report"""
+        return self.apply(text)[0]
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+# router.py - Single-pass intent routing with a compiled keyword automaton
+
+from collections import deque
+
+INFERRED_SEARCH = "INFERRED_SEARCH"
+UNKNOWN = "UNKNOWN"
+
+
+class KeywordAutomaton:
+    """
+    Aho-Corasick automaton that finds every keyword occurrence in one pass
+    """
+
+    def __init__(self):
+        self._goto = [{}]
+        self._fail = [0]
+        self._output = [()]
+        self._built = False
+
+    def add(self, keyword, value):
+        """Add a keyword that reports `value` when it is found"""
+        if self._built:
+            raise RuntimeError("Cannot add keywords after build()")
+        state = 0
+        for char in keyword:
+            next_state = self._goto[state].get(char)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append(())
+                self._goto[state][char] = next_state
+            state = next_state
+        if value not in self._output[state]:
+            self._output[state] = self._output[state] + (value,)
+
+    def build(self):
+        """Compute failure links so matching never backtracks"""
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fail = self._fail[state]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[next_state] = self._goto[fail].get(char, 0)
+                # Merge outputs of the failure state (suffix matches)
+                for value in self._output[self._fail[next_state]]:
+                    if value not in self._output[next_state]:
+                        self._output[next_state] = self._output[next_state] + (value,)
+        self._built = True
+        return self
+
+    def iter_matches(self, text):
+        """Yield the value of every keyword occurrence in text"""
+        goto = self._goto
+        fail = self._fail
+        output = self._output
+        state = 0
+        for char in text:
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if output[state]:
+                yield from output[state]
+
+
+class IntentRouter:
+    """
+    Routes a preprocessed command to an intent name in a single scan
+    """
+
+    def __init__(self, intents):
+        """
+        Args:
+            intents: (name, keywords) pairs in priority order, highest first.
+                Matching is plain substring matching.
+        """
+        self.intents = [name for name, _ in intents]
+        self._automaton = KeywordAutomaton()
+        for priority, (_, keywords) in enumerate(intents):
+            for keyword in keywords:
+                self._automaton.add(keyword, priority)
+        self._automaton.build()
+
+    def hits(self, command):
+        """Return the set of intent names whose keywords appear in command"""
+        return {self.intents[priority] for priority in self._automaton.iter_matches(command)}
+
+    def route(self, command):
+        """
+        Pick the highest-priority intent for command
+
+        Returns:
+            str: Intent name, INFERRED_SEARCH or UNKNOWN
+        """
+        best = None
+        for priority in self._automaton.iter_matches(command):
+            if best is None or priority < best:
+                best = priority
+                if best == 0:
+                    break
+        if best is not None:
+            return self.intents[best]
+
+        # No keyword matched, try to infer intent
+        if len(command.split()) > 2 and not any(char in command for char in "?!"):
+            return INFERRED_SEARCH
+        return UNKNOWN
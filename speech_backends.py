@@ -0,0 +1,260 @@
+#!/usr/bin/env python3
+# speech_backends.py - Pluggable speech-to-text backends and an ordered fallback chain
+
+import copy
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+
+import speech_recognition as sr
+
+from config import SPEECH_RECOGNITION_CONFIG
+from outbound import CLOSED, BudgetExceeded, get_breaker
+
+
+class SpeechBackend:
+    """
+    Base class for speech-to-text engines
+
+    Subclasses implement recognize() and return (transcript, confidence),
+    raising sr.UnknownValueError when nothing was understood and
+    sr.RequestError when the engine itself failed.
+    """
+
+    name = "base"
+    # False for engines that ignore the requested locale (one offline model)
+    locale_aware = True
+    # True for engines whose recognize() takes timeout= and bounds its own request with it
+    timeout_aware = False
+
+    def __init__(self, config=None):
+        self.config = config or {}
+
+    def available(self):
+        """Whether the engine's dependencies are installed"""
+        return True
+
+    def recognize(self, recognizer, audio, language):
+        raise NotImplementedError
+
+
+class GoogleBackend(SpeechBackend):
+    """Google Web Speech API (needs network)"""
+
+    name = "google"
+    timeout_aware = True
+
+    def recognize(self, recognizer, audio, language, timeout=None):
+        # Bound the HTTP request itself, not just our wait on it. Locales run
+        # concurrently on one recognizer, so each request gets its own copy
+        recognizer = copy.copy(recognizer)
+        recognizer.operation_timeout = timeout if timeout is not None else self.config.get('backend_timeouts', {}).get(self.name)
+        response = recognizer.recognize_google(audio, language=language, show_all=True)
+        alternatives = response.get('alternative') if isinstance(response, dict) else None
+        if not alternatives:
+            raise sr.UnknownValueError()
+        best = alternatives[0]
+        return best['transcript'], float(best.get('confidence', 0.0))
+
+
+class SphinxBackend(SpeechBackend):
+    """CMU PocketSphinx, fully offline"""
+
+    name = "sphinx"
+    locale_aware = False
+
+    def available(self):
+        try:
+            import pocketsphinx  # noqa: F401
+            return True
+        except ImportError:
+            return False
+
+    def recognize(self, recognizer, audio, language):
+        return recognizer.recognize_sphinx(audio), 0.0
+
+
+class VoskBackend(SpeechBackend):
+    """Vosk/Kaldi, fully offline. The model is loaded once and reused."""
+
+    name = "vosk"
+    locale_aware = False
+
+    def __init__(self, config=None):
+        super().__init__(config)
+        self._model = None
+        self._model_lock = threading.Lock()
+
+    def available(self):
+        try:
+            import vosk  # noqa: F401
+            return True
+        except ImportError:
+            return False
+
+    def _get_model(self):
+        with self._model_lock:
+            if self._model is None:
+                import vosk
+                self._model = vosk.Model(self.config.get('vosk_model_path', 'model'))
+            return self._model
+
+    def recognize(self, recognizer, audio, language):
+        import vosk
+        try:
+            model = self._get_model()
+        except Exception as e:
+            raise sr.RequestError(f"could not load Vosk model: {e}")
+        kaldi = vosk.KaldiRecognizer(model, 16000)
+        kaldi.AcceptWaveform(audio.get_raw_data(convert_rate=16000, convert_width=2))
+        text = json.loads(kaldi.FinalResult()).get('text', '')
+        if not text:
+            raise sr.UnknownValueError()
+        return text, 0.0
+
+
+class StubBackend(SpeechBackend):
+    """
+    Deterministic local backend for tests and scripted runs
+
+    Returns config['stub_transcript'] for every utterance, or raises
+    UnknownValueError when it is empty.
+    """
+
+    name = "stub"
+
+    def recognize(self, recognizer, audio, language):
+        text = self.config.get('stub_transcript', '')
+        if not text:
+            raise sr.UnknownValueError()
+        return text, 1.0
+
+
+BACKENDS = {
+    'google': GoogleBackend,
+    'sphinx': SphinxBackend,
+    'vosk': VoskBackend,
+    'stub': StubBackend,
+}
+
+
+def register_backend(name, backend_class):
+    """Make a SpeechBackend subclass selectable by name in the config"""
+    BACKENDS[name] = backend_class
+
+
+class FallbackChain:
+    """
+    Tries backends in order, each with its own timeout.
+
+    Each backend has a circuit breaker (outbound.py): after it errors or times
+    out on `failure_threshold` utterances in a row it is skipped for
+    `cooldown` seconds, then one request probes whether it has recovered.
+    Every locale sends the same utterance, so only the primary locale's
+    errors are counted; one glitch is one failure, not one per locale. Backends that
+    don't understand the audio are not penalised; the next one is tried.
+    With a Budget, each backend gets at most what is left of it, and one cut
+    short by the budget rather than its own timeout isn't counted as failing.
+    Locale-agnostic (offline) backends only run for the primary language so
+    concurrent per-locale requests don't decode the same audio repeatedly.
+    """
+
+    def __init__(self, backends, timeouts=None, failure_threshold=1, cooldown=60.0, primary_language=None):
+        self.backends = [b for b in backends if self._check_available(b)]
+        self.timeouts = timeouts or {}
+        self.primary_language = primary_language
+        self.health = {b.name: get_breaker(f"{b.name} speech", failure_threshold, cooldown) for b in self.backends}
+        self._executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="stt-backend")
+
+    @staticmethod
+    def _check_available(backend):
+        if backend.available():
+            return True
+        print(f"Warning: speech backend '{backend.name}' is not installed, skipping it")
+        return False
+
+    def recognize(self, recognizer, audio, language, budget=None):
+        """
+        Args:
+            budget: outbound.Budget shared by the whole recognition, if any
+
+        Returns:
+            tuple: (transcript, confidence) from the first backend that understood the audio
+        """
+        errors = []
+        understood_nothing = False
+        attempted = False
+
+        for backend in self.backends:
+            if not backend.locale_aware and self.primary_language and language != self.primary_language:
+                continue
+            # Checked before allow(), which may hand out the breaker's one probe
+            cap = self.timeouts.get(backend.name)
+            try:
+                timeout = budget.timeout(cap) if budget is not None else cap
+            except BudgetExceeded as e:
+                print(f"DEBUG - Speech backend '{backend.name}' skipped: {e}")
+                errors.append(sr.RequestError(str(e)))
+                break
+            health = self.health[backend.name]
+            if not health.allow():
+                continue
+
+            attempted = True
+            kwargs = {'timeout': timeout} if backend.timeout_aware else {}
+            future = self._executor.submit(backend.recognize, recognizer, audio, language, **kwargs)
+            try:
+                result = future.result(timeout=timeout)
+            except sr.UnknownValueError:
+                health.record_success()
+                understood_nothing = True
+                continue
+            except FutureTimeoutError:
+                future.cancel()
+                print(f"DEBUG - Speech backend '{backend.name}' timed out after {timeout:.1f}s")
+                errors.append(sr.RequestError(f"{backend.name} timed out"))
+                if cap is None or timeout < cap:
+                    # The budget ran out, not the backend's own timeout
+                    health.release()
+                    continue
+            except Exception as e:
+                print(f"DEBUG - Speech backend '{backend.name}' failed: {e}")
+                errors.append(e if isinstance(e, sr.RequestError) else sr.RequestError(str(e)))
+            else:
+                health.record_success()
+                return result
+
+            if self.primary_language is None or language == self.primary_language:
+                health.record_failure()
+            else:
+                health.release()
+
+        if not attempted and not errors:
+            raise sr.RequestError("no speech backend available (all failing, retrying later)")
+        if understood_nothing or not errors:
+            raise sr.UnknownValueError()
+        raise errors[0]
+
+    def status(self):
+        """Name -> 'ok' / 'open' (being skipped) / 'half-open' (due a probe) for each backend in the chain"""
+        return {b.name: ('ok' if self.health[b.name].state == CLOSED else self.health[b.name].state) for b in self.backends}
+
+
+def create_backend_chain(config=SPEECH_RECOGNITION_CONFIG):
+    """Build the fallback chain named by config['backends']"""
+    backends = []
+    for name in config.get('backends', ['google']):
+        backend_class = BACKENDS.get(name)
+        if backend_class is None:
+            print(f"Warning: unknown speech backend '{name}'")
+            continue
+        backends.append(backend_class(config))
+
+    languages = config.get('languages') or [config['language']]
+    return FallbackChain(
+        backends,
+        timeouts=config.get('backend_timeouts'),
+        failure_threshold=config.get('backend_failure_threshold', 1),
+        cooldown=config.get('backend_cooldown', 60.0),
+        primary_language=languages[0],
+    )
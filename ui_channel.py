@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+# ui_channel.py - Thread-safe, batched GUI updates from the assistant threads
+
+from collections import deque
+
+
+class UiChannel:
+    """
+    Stands in for JarvisGUI on every non-Tk thread.
+
+    Tk widgets may only be touched from the thread running mainloop(), so
+    calls like update_status() just append to a deque (append/popleft are
+    atomic, no lock needed). A root.after() pump on the Tk thread drains it
+    once per frame and applies only the newest value of each kind, so a burst
+    of status messages costs one label update.
+    """
+
+    def __init__(self, view, interval_ms=33):
+        self.view = view
+        self.root = view.root
+        self.interval_ms = interval_ms
+        self._pending = deque()
+        self.applied = 0
+        self.coalesced = 0
+        self.root.after(interval_ms, self._pump)
+
+    def update_status(self, text):
+        self._pending.append(('status', text))
+
+    def update_health(self, text):
+        self._pending.append(('health', text))
+
+    def update_transcription(self, text):
+        self._pending.append(('transcription', text))
+
+    def start_listening_animation(self):
+        self._pending.append(('listening', True))
+
+    def stop_listening_animation(self):
+        self._pending.append(('listening', False))
+
+    def quit(self):
+        """Close the window (after applying anything already queued)"""
+        self._pending.append(('quit', None))
+
+    def _pump(self):
+        latest = {}
+        count = 0
+        while True:
+            try:
+                kind, value = self._pending.popleft()
+            except IndexError:
+                break
+            latest[kind] = value
+            count += 1
+        self.coalesced += count - len(latest)
+
+        try:
+            if 'listening' in latest:
+                if latest['listening']:
+                    self.view.start_listening_animation()
+                else:
+                    self.view.stop_listening_animation()
+            if 'status' in latest:
+                self.view.update_status(latest['status'])
+            if 'health' in latest:
+                self.view.update_health(latest['health'])
+            if 'transcription' in latest:
+                self.view.update_transcription(latest['transcription'])
+            self.applied += len(latest)
+        except Exception as e:
+            print(f"GUI update error: {e}")
+
+        if 'quit' in latest:
+            self.root.quit()
+            return
+        self.root.after(self.interval_ms, self._pump)
+
+
+class NullSink:
+    """GUI replacement for headless runs: every update is dropped"""
+
+    def update_status(self, text):
+        pass
+
+    def update_health(self, text):
+        pass
+
+    def update_transcription(self, text):
+        pass
+
+    def start_listening_animation(self):
+        pass
+
+    def stop_listening_animation(self):
+        pass
+
+    def quit(self):
+        pass
@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+# vad.py - Frame-level voice activity detection on raw PCM with NumPy
+
+from collections import deque
+
+import numpy as np
+import speech_recognition as sr
+
+from config import VAD_CONFIG
+
+
+def pcm_to_frames(pcm, sample_rate, frame_ms):
+    """Split 16-bit mono PCM bytes into a (frames, samples) float32 array in [-1, 1]"""
+    samples = np.frombuffer(pcm, dtype=np.int16)
+    frame_len = max(1, int(sample_rate * frame_ms / 1000))
+    count = len(samples) // frame_len
+    return samples[:count * frame_len].reshape(count, frame_len).astype(np.float32) / 32768.0
+
+
+def frame_features(frames):
+    """
+    Short-time energy (dB) and zero-crossing rate for every frame
+
+    Returns:
+        tuple: (energy_db, zcr) arrays, one value per frame
+    """
+    energy_db = 10.0 * np.log10(np.mean(frames * frames, axis=1) + 1e-10)
+    signs = np.signbit(frames)
+    zcr = np.mean(signs[:, 1:] != signs[:, :-1], axis=1)
+    return energy_db, zcr
+
+
+def classify_frames(energy_db, zcr, noise_db, config=VAD_CONFIG):
+    """
+    Raw per-frame speech decision
+
+    Voiced speech is loud relative to the noise floor. Unvoiced fricatives
+    (s, f, sh) are quieter but have a high zero-crossing rate, so they pass
+    with half the energy margin when their ZCR is in the configured range.
+    """
+    margin = config['energy_margin_db']
+    zcr_low, zcr_high = config['zcr_range']
+    loud = energy_db > noise_db + margin
+    fricative = (energy_db > noise_db + margin / 2) & (zcr >= zcr_low) & (zcr <= zcr_high)
+    return loud | fricative
+
+
+def _dilate_forward(mask, frames):
+    """Extend every True run `frames - 1` frames to the right"""
+    if frames <= 1 or not len(mask):
+        return mask
+    return np.convolve(mask.astype(np.int32), np.ones(frames, dtype=np.int32))[:len(mask)] > 0
+
+
+def smooth_frames(mask, min_speech_frames, hangover_frames):
+    """
+    Drop speech runs shorter than `min_speech_frames` (clicks, bumps) and
+    hold every remaining run for `hangover_frames` afterwards
+    """
+    if min_speech_frames > 1 and len(mask) >= min_speech_frames:
+        window = np.ones(min_speech_frames, dtype=np.int32)
+        full_runs = np.convolve(mask.astype(np.int32), window, mode='valid') == min_speech_frames
+        starts = np.zeros(len(mask), dtype=bool)
+        starts[:len(full_runs)] = full_runs
+        mask = _dilate_forward(starts, min_speech_frames)
+    elif min_speech_frames > 1:
+        mask = np.zeros(len(mask), dtype=bool)
+    return _dilate_forward(mask, hangover_frames + 1)
+
+
+def _ms_to_frames(ms, config):
+    return max(1, int(round(ms / config['frame_ms'])))
+
+
+def speech_mask(pcm, sample_rate, noise_db=None, config=VAD_CONFIG):
+    """
+    Smoothed speech/non-speech decision for every frame of 16-bit PCM
+
+    The noise floor defaults to the 10th percentile of frame energies.
+    """
+    frames = pcm_to_frames(pcm, sample_rate, config['frame_ms'])
+    if not len(frames):
+        return np.zeros(0, dtype=bool)
+    energy_db, zcr = frame_features(frames)
+    floor = np.percentile(energy_db, 10)
+    if noise_db is not None:
+        floor = min(floor, noise_db)
+    raw = classify_frames(energy_db, zcr, floor, config)
+    return smooth_frames(raw, _ms_to_frames(config['min_speech_ms'], config), _ms_to_frames(config['hangover_ms'], config))
+
+
+def trim_silence(audio, noise_db=None, config=VAD_CONFIG):
+    """
+    Cut leading and trailing non-speech from an AudioData
+
+    Returns:
+        sr.AudioData: The trimmed audio (16-bit), or None if no speech was found
+    """
+    pcm = audio.get_raw_data(convert_width=2)
+    rate = audio.sample_rate
+    mask = speech_mask(pcm, rate, noise_db, config)
+    speech = np.flatnonzero(mask)
+    if not len(speech):
+        return None
+
+    frame_bytes = int(rate * config['frame_ms'] / 1000) * 2
+    padding = _ms_to_frames(config['padding_ms'], config)
+    start = max(0, speech[0] - padding) * frame_bytes
+    end = min(len(mask), speech[-1] + 1 + padding) * frame_bytes
+    if speech[-1] + 1 + padding >= len(mask):
+        end = len(pcm)  # Keep the partial frame at the very end
+    return sr.AudioData(pcm[start:end], rate, 2)
+
+
+class StreamingVad:
+    """
+    Incremental VAD for live capture
+
+    feed() takes raw chunks as they are read from the microphone and says
+    whether speech is currently present. The noise floor is tracked with an
+    exponential average of non-speech frames, so it follows the room between
+    utterances without a separate calibration pass.
+
+    Non-speech frames alone can't follow noise that jumps by more than the
+    speech margin: every frame then looks like speech. So once a speech run
+    outlasts max_speech_run_ms, the floor is raised to the quietest frame of
+    the last noise_window_ms (real speech dips to the floor between words
+    well within that window; a fan or TV doesn't).
+    """
+
+    def __init__(self, sample_rate, config=VAD_CONFIG):
+        self.sample_rate = sample_rate
+        self.config = config
+        self.noise_db = None
+        self._min_speech = _ms_to_frames(config['min_speech_ms'], config)
+        self._max_speech_run = _ms_to_frames(config['max_speech_run_ms'], config)
+        self._recent = deque(maxlen=_ms_to_frames(config['noise_window_ms'], config))  # Frame energies (dB)
+        self._speech_run = 0
+        self._remainder = b""
+
+    def reset(self):
+        self._speech_run = 0
+        self._remainder = b""
+        self._recent.clear()
+
+    def feed(self, chunk):
+        """
+        Returns:
+            bool: True once at least min_speech_ms of consecutive speech has been seen
+                and the latest frame is still speech
+        """
+        data = self._remainder + chunk
+        frame_bytes = int(self.sample_rate * self.config['frame_ms'] / 1000) * 2
+        usable = len(data) - len(data) % frame_bytes
+        self._remainder = data[usable:]
+        if not usable:
+            return self._speech_run >= self._min_speech
+
+        frames = pcm_to_frames(data[:usable], self.sample_rate, self.config['frame_ms'])
+        energy_db, zcr = frame_features(frames)
+        if self.noise_db is None:
+            self.noise_db = float(np.min(energy_db))
+
+        speech = classify_frames(energy_db, zcr, self.noise_db, self.config)
+        rate = self.config['noise_adapt_rate']
+        for is_speech, energy in zip(speech, energy_db):
+            self._recent.append(float(energy))
+            if is_speech:
+                self._speech_run += 1
+                if self._speech_run >= self._max_speech_run and len(self._recent) == self._recent.maxlen:
+                    floor = min(self._recent)
+                    if floor > self.noise_db + 1.0:
+                        print(f"DEBUG - Background noise rose, noise floor {self.noise_db:.1f} -> {floor:.1f} dB")
+                        self.noise_db = floor
+            else:
+                self._speech_run = 0
+                # Follow drops in noise immediately, rises slowly
+                if energy < self.noise_db:
+                    self.noise_db = float(energy)
+                else:
+                    self.noise_db += rate * (float(energy) - self.noise_db)
+        return self._speech_run >= self._min_speech
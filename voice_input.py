@@ -3,6 +3,13 @@
 
 import speech_recognition as sr
 import time
+from audio_session import get_audio_session, VAD_AVAILABLE
+from capture import get_wake_word_gate, wake_word_allows
+from config import VAD_CONFIG
+from recognition import RecognitionCoordinator
+
+if VAD_AVAILABLE:
+    from vad import trim_silence
 
 def listen_for_command(gui):
     """
@@ -11,73 +18,31 @@ def listen_for_command(gui):
     Returns:
         str: The recognized text command or empty string if not recognized
     """
-    recognizer = sr.Recognizer()
-    
-    # More sensitive microphone settings for better recognition
-    recognizer.energy_threshold = 4000  # Increased from 300 for better noise filtering
-    recognizer.dynamic_energy_threshold = True
-    recognizer.pause_threshold = 1.2  # Increased from 0.8 to allow for natural pauses
-    recognizer.operation_timeout = None  # No timeout for listening
-    
     try:
-        with sr.Microphone() as source:
-            # Update GUI status
-            gui.update_status("Adjusting for ambient noise...")
-            
-            # Adjust for ambient noise with a longer duration for better accuracy
-            print("Adjusting for ambient noise...")
-            recognizer.adjust_for_ambient_noise(source, duration=2.0)  # Increased duration
-            print(f"Energy threshold set to: {recognizer.energy_threshold}")
-            
-            gui.update_status("Listening...")
-            gui.start_listening_animation()
-            
-            print("Listening for command... (Speak now)")
-            
-            # Listen for the user's input with improved settings
-            try:
-                # Increased timeouts for better recognition
-                audio = recognizer.listen(source, timeout=15, phrase_time_limit=10)
-                
-                gui.update_status("Processing speech...")
-                gui.stop_listening_animation()
-                
-                print("Audio captured, processing...")
-                
-                # Use Google's speech recognition with improved error handling
-                try:
-                    # Try Google Speech Recognition first
-                    command = recognizer.recognize_google(audio, language='en-US')
-                    print(f"Recognized: '{command}'")
-                    gui.update_status("Ready")
-                    return command.lower()
-                    
-                except sr.UnknownValueError:
-                    print("Could not understand audio")
-                    gui.update_status("Could not understand - please try again")
-                    # Try with different language settings if first attempt fails
-                    try:
-                        command = recognizer.recognize_google(audio, language='en-IN')
-                        print(f"Recognized (en-IN): '{command}'")
-                        gui.update_status("Ready")
-                        return command.lower()
-                    except:
-                        time.sleep(1)
-                        gui.update_status("Ready")
-                        return ""
-                    
-                except sr.RequestError as e:
-                    print(f"Google Speech Recognition error: {e}")
-                    gui.update_status("Speech service error - please try again")
-                    speak_safe("Sorry, speech recognition service is unavailable.", gui)
-                    return ""
-                        
-            except sr.WaitTimeoutError:
-                print("Listening timeout - no speech detected")
-                gui.stop_listening_animation()
-                gui.update_status("No speech detected - ready for next command")
-                # Don't speak timeout errors to avoid audio feedback loops
-                return ""
+        start = time.perf_counter()
+        session = get_audio_session(gui)
+        
+        gui.update_status("Listening...")
+        gui.start_listening_animation()
+        
+        print(f"Listening for command... (Speak now) [ready in {(time.perf_counter() - start) * 1000:.0f} ms]")
+        
+        # Listen for the user's input on the already-open stream
+        try:
+            audio = session.listen()
+        except sr.WaitTimeoutError:
+            print("Listening timeout - no speech detected")
+            gui.stop_listening_animation()
+            gui.update_status("No speech detected - ready for next command")
+            # Don't speak timeout errors to avoid audio feedback loops
+            return ""
+        
+        gui.stop_listening_animation()
+        # Same wake word rule as the background pipeline
+        if not wake_word_allows(get_wake_word_gate(), audio):
+            gui.update_status("Ready")
+            return ""
+        return recognize_audio(audio, gui)
                 
     except OSError as e:
         print(f"Microphone error: {e}")
@@ -91,13 +56,75 @@ def listen_for_command(gui):
         gui.stop_listening_animation()
         return ""
 
+def next_queued_command(pipeline, gui, timeout=1.0):
+    """
+    Take the next utterance captured by a background CapturePipeline and recognize it
+    
+    Returns:
+        str: The recognized command, or empty string if nothing was queued or recognized
+    """
+    audio = pipeline.get(timeout)
+    if audio is None:
+        return ""
+    return recognize_audio(audio, gui)
+
+def recognize_audio(audio, gui):
+    """
+    Convert captured audio to text
+    
+    Returns:
+        str: The recognized text command or empty string if not recognized
+    """
+    coordinator = get_recognition_coordinator(gui)
+    
+    gui.update_status("Processing speech...")
+    print("Audio captured, processing...")
+    
+    # Send only the speech itself; skip the network entirely for pure noise
+    if VAD_AVAILABLE and VAD_CONFIG.get('enabled', True):
+        session = get_audio_session(gui)
+        trimmed = trim_silence(audio, noise_db=session.vad.noise_db if session.vad else None)
+        if trimmed is None:
+            print("No speech in captured audio")
+            gui.update_status("Ready")
+            return ""
+        print(f"DEBUG - VAD trimmed {len(audio.frame_data)} -> {len(trimmed.frame_data)} bytes")
+        audio = trimmed
+    
+    # All configured locales run concurrently; the first confident one wins
+    try:
+        result = coordinator.recognize(audio)
+        print(f"Recognized ({result.language}, {result.confidence:.2f}): '{result.text}'")
+        gui.update_status("Ready")
+        return result.text.lower()
+        
+    except sr.UnknownValueError:
+        print("Could not understand audio")
+        gui.update_status("Could not understand - please try again")
+        return ""
+        
+    except sr.RequestError as e:
+        print(f"Speech recognition error: {e}")
+        gui.update_status("Speech service error - please try again")
+        speak_safe("Sorry, speech recognition service is unavailable.", gui)
+        return ""
+
+_coordinator = None
+
+def get_recognition_coordinator(gui=None):
+    """Shared RecognitionCoordinator bound to the audio session's recognizer"""
+    global _coordinator
+    if _coordinator is None:
+        _coordinator = RecognitionCoordinator(get_audio_session(gui).recognizer)
+    return _coordinator
+
 def speak_safe(text, gui):
     """
     Safe speak function that handles import errors
     """
     try:
         from voice_output import speak
-        speak(text, gui)
+        speak(text, gui, key="audio-error")
     except ImportError:
         print(f"Voice output not available: {text}")
         gui.update_status(f"Jarvis: {text}")
@@ -1,28 +1,481 @@
 #!/usr/bin/env python3
-# voice_output.py - Handles text-to-speech responses
+# voice_output.py - Handles text-to-speech responses on a dedicated worker thread
 
-import pyttsx3
+import heapq
+import itertools
+import os
+import re
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
 
-# Initialize the TTS engine
-engine = pyttsx3.init()
+from config import TTS_CONFIG
+from phrase_cache import PLAYBACK_AVAILABLE, PhraseCache, play_wav
 
-# Set properties (optional)
-engine.setProperty('rate', 180)  # Speed of speech
-engine.setProperty('volume', 1.0)  # Volume (0.0 to 1.0)
+# Lower numbers are spoken first; equal priorities keep their submission order
+PRIORITY_URGENT = 0   # Errors, shutdown
+PRIORITY_NORMAL = 10  # Regular responses
+PRIORITY_STATUS = 20  # Progress/status chatter that may be superseded
+PRIORITY_BACKGROUND = 100  # Phrase cache rendering, only when nothing is waiting to be spoken
 
-# Get available voices and set a voice (optional)
-voices = engine.getProperty('voices')
-# For a female voice (if available)
-# engine.setProperty('voice', voices[1].id)
+# Cached audio kept as the echo reference (1024-frame chunks, about 1.5 s at 22 kHz)
+REFERENCE_CHUNKS = 32
 
-def speak(text, gui): # Add gui as an argument
+_SENTENCE_BREAK = re.compile(r'(?<=[.!?;:])\s+|\s*\n\s*')
+_CLAUSE_BREAK = re.compile(r'(?<=,)\s+')
+
+
+def split_sentences(text, max_chars=None):
+    """
+    Split a response into the chunks it is spoken in
+
+    Text is split at sentence ends and line breaks; sentences longer than
+    `max_chars` are further split at commas, regrouping clauses up to that length.
+
+    Returns:
+        list: Non-empty chunks in order
+    """
+    max_chars = max_chars or TTS_CONFIG.get('max_chunk_chars', 100)
+    chunks = []
+    for sentence in _SENTENCE_BREAK.split(text):
+        sentence = sentence.strip()
+        if not sentence:
+            continue
+        if len(sentence) <= max_chars:
+            chunks.append(sentence)
+            continue
+        current = ""
+        for clause in _CLAUSE_BREAK.split(sentence):
+            if current and len(current) + 1 + len(clause) > max_chars:
+                chunks.append(current)
+                current = clause
+            else:
+                current = f"{current} {clause}" if current else clause
+        chunks.append(current)
+    return chunks
+
+
+class SpeechStream(Future):
+    """
+    One spoken response, played chunk by chunk as its text arrives.
+
+    The TTS worker starts on the first chunk while later ones are still being
+    fed (by a handler's generator) or waiting their turn, so perceived latency
+    depends on the first sentence only. Resolves to True once every chunk was
+    spoken, or False if it was superseded or stopped part way.
+    """
+
+    def __init__(self, text=None):
+        super().__init__()
+        self._chunks = deque()
+        self._cond = threading.Condition()
+        self._closed = False
+        self._fed = []
+        self.stopped = False
+        if text is not None:
+            self.feed(text)
+            self.close()
+
+    @property
+    def text(self):
+        """Everything fed so far"""
+        with self._cond:
+            return " ".join(self._fed)
+
+    def feed(self, text):
+        """Append a fragment; it is split into sentences/clauses before playing"""
+        chunks = split_sentences(text)
+        with self._cond:
+            self._fed.append(text.strip())
+            self._chunks.extend(chunks)
+            self._cond.notify_all()
+
+    def close(self):
+        """No more fragments will be fed"""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+    def stop(self):
+        """Stop speaking: drop the rest of the response (a cached chunk is cut off immediately)"""
+        with self._cond:
+            self.stopped = True
+            self._cond.notify_all()
+
+    def next_chunk(self):
+        """Block for the next chunk; None when the stream is finished or stopped"""
+        with self._cond:
+            self._cond.wait_for(lambda: self._chunks or self._closed or self.stopped)
+            if self.stopped or not self._chunks:
+                return None
+            return self._chunks.popleft()
+
+
+class _Request:
+    """One queued unit of work for the TTS worker: speak a stream, or render text into the phrase cache"""
+
+    __slots__ = ('priority', 'seq', 'text', 'key', 'stream', 'gui', 'cache', 'render')
+
+    def __init__(self, priority, seq, text=None, key=None, stream=None, gui=None, cache=False, render=False):
+        self.priority = priority
+        self.seq = seq
+        self.text = text
+        self.key = key
+        self.stream = stream
+        self.gui = gui
+        self.cache = cache
+        self.render = render
+
+    def __lt__(self, other):
+        return (self.priority, self.seq) < (other.priority, other.seq)
+
+
+class SpeechWorker:
+    """
+    Owns the pyttsx3 engine and speaks queued streams one at a time.
+
+    pyttsx3 engines must be driven from the thread that created them, so the
+    engine is created on the worker thread, which starts on warm_up() or the
+    first submit. Nothing touches the audio driver at import time, and a
+    speak() issued during warm-up just queues until the engine is ready.
+    Each request is a SpeechStream,
+    which resolves to True once it has been spoken, or False if it was
+    superseded (same coalesce key) or stopped.
+
+    Requests marked `cache=True` are fixed phrases: they play from the phrase
+    cache when a render exists, and are rendered in the background after the
+    first live synthesis otherwise.
+    """
+
+    def __init__(self, config=TTS_CONFIG):
+        self.config = config
+        self._queue = []
+        self._cond = threading.Condition()
+        self._seq = itertools.count()
+        self._thread = None
+        self._speaking = False
+        self._current = None
+        self.engine = None
+        self.phrase_cache = None
+        self.voices = []  # (id, name) of every installed voice, read once at startup
+        self.ready = threading.Event()
+        # Playback intervals and the most recent cached audio, for echo gating
+        self.playback_started = None
+        self.playback_ended = 0.0
+        self._reference = deque(maxlen=REFERENCE_CHUNKS)
+        self._reference_format = None
+
+    def _create_engine(self):
+        import pyttsx3
+
+        engine = pyttsx3.init()
+        engine.setProperty('rate', self.config.get('rate', 180))  # Speed of speech
+        engine.setProperty('volume', self.config.get('volume', 1.0))  # Volume (0.0 to 1.0)
+
+        # Lets stop() cut a live utterance short between words
+        engine.connect('started-word', self._on_word)
+
+        voices = engine.getProperty('voices') or []
+        self.voices = [(voice.id, voice.name) for voice in voices]
+        voice_index = self.config.get('voice_index')
+        if voice_index is not None:
+            if 0 <= voice_index < len(voices):
+                engine.setProperty('voice', voices[voice_index].id)
+            else:
+                print(f"Warning: voice_index {voice_index} out of range ({len(voices)} voices installed); using the default voice")
+        return engine
+
+    def _open_phrase_cache(self):
+        if not self.config.get('phrase_cache_enabled'):
+            return None
+        if not PLAYBACK_AVAILABLE:
+            print("Warning: PyAudio not available. Phrase cache disabled.")
+            return None
+        try:
+            return PhraseCache(self.config['phrase_cache_dir'], self.config['phrase_cache_max_bytes'])
+        except OSError as e:
+            print(f"Warning: phrase cache disabled: {e}")
+            return None
+
+    def _ensure_started(self):
+        if self._thread is None or not self._thread.is_alive():
+            self.ready.clear()
+            self._thread = threading.Thread(target=self._run, name="tts-worker", daemon=True)
+            self._thread.start()
+
+    def submit(self, stream, gui, priority=PRIORITY_NORMAL, key=None, cache=False):
+        """
+        Queue a SpeechStream to be spoken
+
+        Args:
+            key: Coalesce key. Queued requests with the same key that haven't
+                started yet are dropped in favour of this one.
+            cache: Text is fixed; its chunks are worth keeping in the phrase cache
+        """
+        with self._cond:
+            if key is not None:
+                kept = []
+                for request in self._queue:
+                    if request.key == key:
+                        request.stream.stop()
+                        request.stream.set_result(False)
+                    else:
+                        kept.append(request)
+                if len(kept) != len(self._queue):
+                    self._queue = kept
+                    heapq.heapify(self._queue)
+            heapq.heappush(self._queue, _Request(priority, next(self._seq), key=key, stream=stream, gui=gui, cache=cache))
+            self._ensure_started()
+            self._cond.notify()
+        return stream
+
+    def warm_up(self):
+        """Start the worker thread so the engine loads in the background"""
+        with self._cond:
+            self._ensure_started()
+
+    def prewarm(self, phrases):
+        """Render fixed phrases into the cache in the background (no-op for ones already cached)"""
+        with self._cond:
+            for text in phrases:
+                for chunk in split_sentences(text):
+                    heapq.heappush(self._queue, _Request(PRIORITY_BACKGROUND, next(self._seq), chunk, render=True))
+            self._ensure_started()
+            self._cond.notify()
+
+    def cancel_pending(self):
+        """Drop everything that hasn't started playing yet (background renders are kept)"""
+        with self._cond:
+            for request in self._queue:
+                if not request.render:
+                    request.stream.stop()
+                    request.stream.set_result(False)
+            self._queue = [request for request in self._queue if request.render]
+            heapq.heapify(self._queue)
+
+    def stop(self):
+        """Drop queued speech and cut the current response short"""
+        with self._cond:
+            current = self._current
+        self.cancel_pending()
+        if current is not None:
+            current.stop()
+
+    def _speech_pending(self):
+        return self._speaking or any(not request.render for request in self._queue)
+
+    def wait_idle(self, timeout=None):
+        """Block until no speech is queued or playing"""
+        with self._cond:
+            return self._cond.wait_for(lambda: not self._speech_pending(), timeout)
+
+    @property
+    def busy(self):
+        with self._cond:
+            return self._speech_pending()
+
+    def _cache_key(self, text):
+        engine = self.engine
+        return PhraseCache.make_key(text, engine.getProperty('voice'), engine.getProperty('rate'), engine.getProperty('volume'))
+
+    def _render(self, text):
+        """Synthesize text to a WAV file and add it to the phrase cache"""
+        key = self._cache_key(text)
+        if key in self.phrase_cache:
+            return
+        partial = os.path.join(self.phrase_cache.directory, key + ".tmp")
+        try:
+            start = time.perf_counter()
+            self.engine.save_to_file(text, partial)
+            self.engine.runAndWait()
+            if self.phrase_cache.add(key, partial):
+                print(f"DEBUG - Cached phrase in {(time.perf_counter() - start) * 1000:.0f} ms: {text[:40]!r}")
+        except Exception as e:
+            print(f"DEBUG - Could not render phrase for cache: {e}")
+            try:
+                os.remove(partial)
+            except OSError:
+                pass
+
+    def _on_word(self, name, location, length):
+        current = self._current
+        if current is not None and current.stopped:
+            self.engine.stop()
+
+    def _on_playback_chunk(self, data, rate, width, channels):
+        self._reference_format = (rate, width, channels)
+        self._reference.append(data)
+
+    def _say(self, text, cache, stream):
+        """Speak one chunk, from the phrase cache when possible"""
+        if cache and self.phrase_cache is not None:
+            path = self.phrase_cache.get(self._cache_key(text))
+            if path is not None:
+                try:
+                    play_wav(path, should_stop=lambda: stream.stopped, on_chunk=self._on_playback_chunk)
+                    return
+                except Exception as e:
+                    print(f"DEBUG - Cached playback failed, synthesizing instead: {e}")
+
+        self._reference.clear()  # Live synthesis has no reference audio
+        self.engine.say(text)
+        self.engine.runAndWait()
+
+        if cache and self.phrase_cache is not None:
+            with self._cond:
+                heapq.heappush(self._queue, _Request(PRIORITY_BACKGROUND, next(self._seq), text, render=True))
+
+    def _speak(self, request):
+        """Play a stream chunk by chunk; returns False if it was stopped part way"""
+        stream = request.stream
+        shown = None
+        try:
+            while True:
+                chunk = stream.next_chunk()
+                if chunk is None:
+                    return not stream.stopped
+                text = stream.text
+                if request.gui is not None and text != shown:
+                    request.gui.update_status(f"Jarvis: {text}")
+                    shown = text
+                if self.playback_started is None:
+                    self._reference.clear()
+                    self.playback_started = time.monotonic()
+                self._say(chunk, request.cache, stream)
+        finally:
+            if self.playback_started is not None:
+                self.playback_started = None
+                self.playback_ended = time.monotonic()
+
+    def _run(self):
+        start = time.perf_counter()
+        try:
+            self.engine = self._create_engine()
+        except Exception as e:
+            print(f"Text-to-speech engine failed to start: {e}")
+            self.cancel_pending()
+            self.ready.set()
+            return
+        self.phrase_cache = self._open_phrase_cache()
+        print(f"DEBUG - Text-to-speech engine ready in {(time.perf_counter() - start) * 1000:.0f} ms")
+        self.ready.set()
+
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._queue)
+                request = heapq.heappop(self._queue)
+                if request.render:
+                    if self.phrase_cache is None:
+                        continue
+                elif not request.stream.set_running_or_notify_cancel():
+                    continue
+                else:
+                    self._speaking = True
+                    self._current = request.stream
+
+            if request.render:
+                self._render(request.text)
+                continue
+
+            try:
+                request.stream.set_result(self._speak(request))
+            except Exception as e:
+                print(f"Speech error: {e}")
+                request.stream.set_exception(e)
+            finally:
+                with self._cond:
+                    self._speaking = False
+                    self._current = None
+                    self._cond.notify_all()
+
+
+_worker = SpeechWorker()
+
+
+def speak(text, gui, wait=False, priority=PRIORITY_NORMAL, key=None, cache=False): # Add gui as an argument
     """
     Convert text to speech and update the GUI
-    
+
+    Speech plays on the TTS worker thread one sentence at a time, so this
+    returns immediately unless `wait` is True. `text` may also be an iterable
+    of fragments (e.g. a handler's generator); it is consumed here, and the
+    first fragment starts playing while the rest are still being produced.
+
     Args:
-        text (str): Text to be spoken
+        text (str or iterable): Text to be spoken, or fragments of it
         gui: The GUI object to update
+        wait (bool): Block until the text has been spoken
+        priority (int): PRIORITY_URGENT, PRIORITY_NORMAL or PRIORITY_STATUS
+        key (str): Coalesce key; a newer message with the same key replaces a queued one
+        cache (bool): Fixed text; play it from the phrase cache once rendered
+
+    Returns:
+        SpeechStream: a Future resolving to True when spoken, False if superseded
+        or stopped; call .stop() on it to cut the response short
+    """
+    if isinstance(text, str):
+        stream = _worker.submit(SpeechStream(text), gui, priority, key, cache)
+    else:
+        stream = _worker.submit(SpeechStream(), gui, priority, key, cache)
+        try:
+            for fragment in text:
+                if stream.stopped:
+                    break
+                stream.feed(fragment)
+        finally:
+            stream.close()
+    if wait:
+        try:
+            stream.result()
+        except Exception:
+            pass
+    return stream
+
+def warm_up_speech():
+    """Load the TTS engine in the background (call during GUI startup)"""
+    _worker.warm_up()
+
+def available_voices(timeout=None):
+    """
+    Installed voices as (id, name) pairs, in `TTS_CONFIG['voice_index']` order
+
+    Waits up to `timeout` for warm-up; the list is read once and cached.
+    """
+    _worker.warm_up()
+    _worker.ready.wait(timeout)
+    return list(_worker.voices)
+
+def playback_state():
     """
-    gui.update_status(f"Jarvis: {text}") # Update GUI instead of printing
-    engine.say(text)
-    engine.runAndWait()
\ No newline at end of file
+    When the assistant is, or last was, making sound
+
+    Returns:
+        tuple: (started, ended) monotonic times; `started` is None when nothing is playing
+    """
+    return _worker.playback_started, _worker.playback_ended
+
+def playback_reference():
+    """
+    The most recent cached audio played, for correlating against the microphone
+
+    Returns:
+        tuple: (pcm bytes, (rate, width, channels)), or None if the current
+        response is being synthesized live and has no reference
+    """
+    chunks = list(_worker._reference)
+    if not chunks or _worker._reference_format is None:
+        return None
+    return b"".join(chunks), _worker._reference_format
+
+def prewarm_phrases(phrases):
+    """Render fixed responses into the phrase cache while the assistant is idle"""
+    _worker.prewarm(phrases)
+
+def wait_for_speech(timeout=None):
+    """Block until everything queued so far has been spoken"""
+    return _worker.wait_idle(timeout)
+
+def stop_speaking():
+    """Drop queued speech and stop the response currently playing after its current chunk"""
+    _worker.stop()
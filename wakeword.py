@@ -0,0 +1,250 @@
+#!/usr/bin/env python3
+# wakeword.py - On-device "jarvis" keyword spotting with MFCC + DTW template matching
+
+import glob
+import os
+import sys
+import time
+import wave
+
+import numpy as np
+
+from config import WAKE_WORD_CONFIG
+
+SAMPLE_RATE = 16000
+
+
+def _mel_filterbank(num_filters, fft_size, sample_rate):
+    def hz_to_mel(hz):
+        return 2595.0 * np.log10(1.0 + hz / 700.0)
+
+    def mel_to_hz(mel):
+        return 700.0 * (10 ** (mel / 2595.0) - 1.0)
+
+    mel_points = np.linspace(hz_to_mel(0), hz_to_mel(sample_rate / 2), num_filters + 2)
+    bins = np.floor((fft_size + 1) * mel_to_hz(mel_points) / sample_rate).astype(int)
+    bank = np.zeros((num_filters, fft_size // 2 + 1), dtype=np.float32)
+    for i in range(1, num_filters + 1):
+        left, center, right = bins[i - 1], bins[i], bins[i + 1]
+        if center > left:
+            bank[i - 1, left:center] = (np.arange(left, center) - left) / (center - left)
+        if right > center:
+            bank[i - 1, center:right] = (right - np.arange(center, right)) / (right - center)
+    return bank
+
+
+def _dct_matrix(num_coeffs, num_filters):
+    n = np.arange(num_filters)
+    k = np.arange(num_coeffs)[:, None]
+    return np.cos(np.pi * k * (2 * n + 1) / (2 * num_filters)).astype(np.float32)
+
+
+_FRAME = int(0.025 * SAMPLE_RATE)
+_HOP = int(0.010 * SAMPLE_RATE)
+_FFT = 512
+_MEL_BANK = _mel_filterbank(26, _FFT, SAMPLE_RATE)
+_DCT = _dct_matrix(13, 26)
+_WINDOW = np.hamming(_FRAME).astype(np.float32)
+
+
+def mfcc(samples):
+    """
+    13 MFCCs per 10 ms hop for 16 kHz float samples
+
+    Returns:
+        np.ndarray: (frames, 13)
+    """
+    samples = np.asarray(samples, dtype=np.float32)
+    if len(samples) < _FRAME:
+        return np.zeros((0, _DCT.shape[0]), dtype=np.float32)
+    emphasized = np.append(samples[0], samples[1:] - 0.97 * samples[:-1])
+    count = 1 + (len(emphasized) - _FRAME) // _HOP
+    index = np.arange(_FRAME)[None, :] + _HOP * np.arange(count)[:, None]
+    frames = emphasized[index] * _WINDOW
+    power = np.abs(np.fft.rfft(frames, _FFT)) ** 2 / _FFT
+    log_mel = np.log(power @ _MEL_BANK.T + 1e-8)
+    return log_mel @ _DCT.T
+
+
+def subsequence_dtw(template, query):
+    """
+    Best alignment cost of `template` anywhere inside `query`, per template frame
+
+    Each template frame may consume zero, one or two query frames, so every
+    row depends only on the previous one and the recursion vectorizes.
+    """
+    if not len(template) or not len(query):
+        return np.inf
+    # Pairwise Euclidean distances, (template frames, query frames)
+    cost = np.sqrt(((template[:, None, :] - query[None, :, :]) ** 2).sum(axis=2))
+    row = cost[0].copy()  # Free start anywhere in the query
+    for i in range(1, len(template)):
+        prev = row
+        shift1 = np.concatenate(([np.inf], prev[:-1]))
+        shift2 = np.concatenate(([np.inf, np.inf], prev[:-2]))
+        row = cost[i] + np.minimum(prev, np.minimum(shift1, shift2))
+    return float(row.min() / len(template))
+
+
+def audio_to_samples(audio):
+    """sr.AudioData -> 16 kHz float32 samples"""
+    pcm = audio.get_raw_data(convert_rate=SAMPLE_RATE, convert_width=2)
+    return np.frombuffer(pcm, dtype=np.int16).astype(np.float32) / 32768.0
+
+
+def load_wav(path):
+    """Read a WAV file as 16 kHz mono float32 samples"""
+    with wave.open(path, "rb") as wav:
+        rate = wav.getframerate()
+        width = wav.getsampwidth()
+        channels = wav.getnchannels()
+        raw = wav.readframes(wav.getnframes())
+    if width != 2:
+        raise ValueError(f"{path}: only 16-bit WAV files are supported")
+    samples = np.frombuffer(raw, dtype=np.int16).astype(np.float32) / 32768.0
+    if channels > 1:
+        samples = samples.reshape(-1, channels).mean(axis=1)
+    if rate != SAMPLE_RATE:
+        positions = np.arange(0, len(samples), rate / SAMPLE_RATE)
+        samples = np.interp(positions, np.arange(len(samples)), samples).astype(np.float32)
+    return samples
+
+
+def spotting_features(samples):
+    """MFCCs without c0, so loudness differences don't dominate the distance"""
+    return mfcc(samples)[:, 1:]
+
+
+class WakeWordSpotter:
+    """
+    Matches the start of each utterance against enrolled "jarvis" recordings
+
+    Templates are MFCC sequences of short WAV recordings of the wake word
+    (see `python wakeword.py enroll`). An utterance is accepted when its first
+    `search_seconds` align with any template below `threshold`.
+    """
+
+    def __init__(self, templates=None, threshold=None, search_seconds=None, config=WAKE_WORD_CONFIG):
+        self.threshold = threshold if threshold is not None else config['threshold']
+        self.search_seconds = search_seconds if search_seconds is not None else config['search_seconds']
+        self.templates = list(templates or [])
+
+    @classmethod
+    def from_directory(cls, path, **kwargs):
+        templates = [spotting_features(load_wav(wav_path)) for wav_path in sorted(glob.glob(os.path.join(path, "*.wav")))]
+        return cls([t for t in templates if len(t)], **kwargs)
+
+    def score(self, samples):
+        """Lowest template distance for the start of `samples` (lower is a better match)"""
+        if not self.templates:
+            return np.inf
+        query = spotting_features(samples[:int(self.search_seconds * SAMPLE_RATE)])
+        return min(subsequence_dtw(template, query) for template in self.templates)
+
+    def detect(self, samples):
+        """
+        Returns:
+            tuple: (detected, score)
+        """
+        score = self.score(samples)
+        return score <= self.threshold, score
+
+
+class WakeWordGate:
+    """
+    Lets audio through to the recognizer only when the wake word was spoken.
+
+    After a detection, follow-up utterances pass without the wake word for
+    `follow_up_seconds`, so "Jarvis." ... "what time is it" works as well as
+    "Jarvis, what time is it".
+    """
+
+    def __init__(self, spotter, follow_up_seconds=None, config=WAKE_WORD_CONFIG):
+        self.spotter = spotter
+        self.follow_up_seconds = follow_up_seconds if follow_up_seconds is not None else config['follow_up_seconds']
+        self.awake_until = 0.0
+        self.accepted = 0
+        self.rejected = 0
+
+    def allow(self, audio):
+        """Whether this AudioData should be sent to the recognizer"""
+        now = time.monotonic()
+        if now < self.awake_until:
+            self.awake_until = now + self.follow_up_seconds
+            self.accepted += 1
+            return True
+
+        detected, score = self.spotter.detect(audio_to_samples(audio))
+        print(f"DEBUG - Wake word score {score:.2f} (threshold {self.spotter.threshold:.2f})")
+        if detected:
+            self.awake_until = now + self.follow_up_seconds
+            self.accepted += 1
+        else:
+            self.rejected += 1
+        return detected
+
+
+def create_wake_word_gate(config=WAKE_WORD_CONFIG):
+    """Build the gate from config, or return None if the mode is off or has no templates"""
+    if not config.get('enabled'):
+        return None
+    spotter = WakeWordSpotter.from_directory(config['templates_dir'], config=config)
+    if not spotter.templates:
+        print(f"Warning: wake word mode enabled but no templates in {config['templates_dir']}; gate disabled")
+        return None
+    return WakeWordGate(spotter, config=config)
+
+
+def evaluate(spotter, positive_paths, negative_paths):
+    """
+    False-accept / false-reject rates over labelled WAV files
+
+    Returns:
+        dict: counts, rates and mean detection time in ms
+    """
+    false_rejects = false_accepts = 0
+    elapsed = []
+    for paths, expected in ((positive_paths, True), (negative_paths, False)):
+        for path in paths:
+            samples = load_wav(path)
+            start = time.perf_counter()
+            detected, _ = spotter.detect(samples)
+            elapsed.append((time.perf_counter() - start) * 1000)
+            if expected and not detected:
+                false_rejects += 1
+            elif detected and not expected:
+                false_accepts += 1
+    return {
+        'positives': len(positive_paths),
+        'negatives': len(negative_paths),
+        'false_rejects': false_rejects,
+        'false_accepts': false_accepts,
+        'frr': false_rejects / len(positive_paths) if positive_paths else 0.0,
+        'far': false_accepts / len(negative_paths) if negative_paths else 0.0,
+        'mean_ms': sum(elapsed) / len(elapsed) if elapsed else 0.0,
+    }
+
+
+def enroll(count=5):
+    """Record wake word templates from the microphone into templates_dir"""
+    import speech_recognition as sr
+
+    os.makedirs(WAKE_WORD_CONFIG['templates_dir'], exist_ok=True)
+    recognizer = sr.Recognizer()
+    with sr.Microphone(sample_rate=SAMPLE_RATE) as source:
+        recognizer.adjust_for_ambient_noise(source, duration=1)
+        for i in range(count):
+            print(f"Say 'Jarvis' ({i + 1}/{count})...")
+            audio = recognizer.listen(source, timeout=10, phrase_time_limit=2)
+            path = os.path.join(WAKE_WORD_CONFIG['templates_dir'], f"jarvis_{int(time.time())}_{i}.wav")
+            with open(path, "wb") as f:
+                f.write(audio.get_wav_data(convert_rate=SAMPLE_RATE, convert_width=2))
+            print(f"Saved {path}")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "enroll":
+        enroll(int(sys.argv[2]) if len(sys.argv) > 2 else 5)
+    else:
+        print("Usage: python wakeword.py enroll [count]")
+        print("Evaluate against fixtures with: python benchmarks/eval_wakeword.py <fixtures_dir>")
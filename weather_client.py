@@ -0,0 +1,314 @@
+#!/usr/bin/env python3
+# weather_client.py - OpenWeatherMap client with a pooled session and a per-city TTL cache
+
+import random
+import threading
+import time
+from collections import OrderedDict, deque, namedtuple
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeout
+
+import requests
+
+from outbound import BudgetExceeded, guarded_call
+from config import DEFAULT_CITIES, DEFAULT_CITY, OPENWEATHER_API_KEY, WEATHER_CONFIG
+
+# Background refreshes have their own breaker: their failures never make an
+# interactive lookup skip the API, and vice versa
+PREFETCH_ENDPOINT = 'weather prefetch'
+
+WeatherReport = namedtuple('WeatherReport', ['city', 'condition', 'temperature', 'feels_like', 'humidity'])
+
+
+def normalize_city(city):
+    return " ".join(city.lower().split())
+
+
+def describe(report):
+    """The spoken sentence for a report"""
+    return (f"The weather in {report.city} is {report.condition} with a temperature of {report.temperature:.1f}°C, "
+            f"feels like {report.feels_like:.1f}°C, and humidity at {report.humidity}%")
+
+
+def brief(report):
+    """Short spoken form for one city of a multi-city answer"""
+    return f"{report.city}, {report.condition}, {report.temperature:.0f}°C"
+
+
+class WeatherClient:
+    """
+    Current-weather lookups with caching and request coalescing.
+
+    - One requests.Session, so repeat lookups reuse a keep-alive connection.
+    - Reports are cached per city for `ttl` seconds (LRU, `cache_size` cities).
+    - Between `ttl` and `stale_ttl` the cached report is returned immediately
+      and refreshed in the background (stale-while-revalidate).
+    - Concurrent lookups of the same city share one HTTP request.
+    - Requests go through the 'weather' circuit breaker and, when given, the
+      command's Budget (outbound.py), so a dead API fails fast.
+    """
+
+    def __init__(self, api_key=OPENWEATHER_API_KEY, config=WEATHER_CONFIG, session=None):
+        self.api_key = api_key
+        self.config = config
+        self.session = session or requests.Session()
+        self._cache = OrderedDict()  # normalized city -> (report, fetched_at)
+        self._inflight = {}  # normalized city -> Future of the request in progress
+        self._lock = threading.Lock()
+        self._refresher = ThreadPoolExecutor(max_workers=2, thread_name_prefix="weather-refresh")
+        self._fanout = ThreadPoolExecutor(max_workers=config['fanout_workers'], thread_name_prefix="weather-fanout")
+        self.stats = {'hits': 0, 'stale_hits': 0, 'misses': 0, 'coalesced': 0, 'requests': 0}
+
+    def fetch(self, city, budget=None, endpoint='weather'):
+        """
+        One uncached API request
+
+        Args:
+            endpoint: Circuit breaker the request counts against
+
+        Returns:
+            WeatherReport, or None if the city is unknown
+
+        Raises:
+            requests.RequestException: network or server error
+            CircuitOpenError: the API failed repeatedly and is being skipped
+            BudgetExceeded: the command has no time left for a request
+        """
+        return guarded_call(endpoint, lambda timeout: self._request(city, timeout),
+                            budget=budget, cap=self.config['timeout'])
+
+    def _request(self, city, timeout):
+        self.stats['requests'] += 1
+        params = {'q': city, 'appid': self.api_key, 'units': self.config['units']}
+        response = self.session.get(self.config['base_url'], params=params, timeout=timeout)
+        if response.status_code in (400, 404):
+            return None
+        response.raise_for_status()
+        data = response.json()
+        return WeatherReport(
+            city=data.get('name') or city,
+            condition=data['weather'][0]['description'],
+            temperature=data['main']['temp'],
+            feels_like=data['main']['feels_like'],
+            humidity=data['main']['humidity'],
+        )
+
+    def get(self, city, budget=None):
+        """
+        Weather for a city, from cache when fresh enough
+
+        Returns:
+            WeatherReport, or None if the city is unknown
+
+        Raises:
+            requests.RequestException: no usable cached report and the request failed
+            CircuitOpenError, BudgetExceeded: see fetch()
+        """
+        key = normalize_city(city)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._cache.get(key)
+            if entry is not None:
+                report, fetched_at = entry
+                age = now - fetched_at
+                if age < self.config['ttl']:
+                    self._cache.move_to_end(key)
+                    self.stats['hits'] += 1
+                    return report
+                if age < self.config['stale_ttl']:
+                    self._cache.move_to_end(key)
+                    self.stats['stale_hits'] += 1
+                    if key not in self._inflight:
+                        self._refresher.submit(self._refresh, key, city)
+                    return report
+            self.stats['misses'] += 1
+        return self._load(key, city, budget)
+
+    def get_many(self, cities, deadline=None, budget=None):
+        """
+        Look up several cities concurrently, all sharing one deadline
+
+        Lookups run on a bounded pool; cached cities answer at once. Results
+        come back in the order given, each as soon as it and every earlier
+        city is ready, so the first can be spoken while the rest load. A city
+        still loading at the deadline keeps fetching in the background (the
+        next ask is a cache hit) and is reported as timed out.
+
+        Args:
+            cities: City names or queries
+            deadline: Seconds for the whole set (default: config 'fanout_deadline')
+            budget: The command's Budget; the deadline never outlasts it
+
+        Yields:
+            tuple: (city, report or None, exception or None) - a late city
+            carries concurrent.futures.TimeoutError
+        """
+        if deadline is None:
+            deadline = self.config['fanout_deadline']
+        if budget is not None:
+            deadline = min(deadline, budget.remaining())
+        end = time.monotonic() + deadline
+        futures = [(city, self._fanout.submit(self.get, city, budget)) for city in cities]
+        for city, future in futures:
+            try:
+                yield city, future.result(timeout=max(0.0, end - time.monotonic())), None
+            except Exception as e:  # Includes FutureTimeout for a city past the deadline
+                yield city, None, e
+
+    def refresh(self, city, endpoint='weather'):
+        """Fetch now regardless of cache age (joins a request already in flight)"""
+        return self._load(normalize_city(city), city, endpoint=endpoint)
+
+    def age(self, city):
+        """Seconds since the cached report was fetched, or None if not cached"""
+        with self._lock:
+            entry = self._cache.get(normalize_city(city))
+        return time.monotonic() - entry[1] if entry is not None else None
+
+    def cached(self, city):
+        """The cached report regardless of age, or None (never touches the network)"""
+        with self._lock:
+            entry = self._cache.get(normalize_city(city))
+        return entry[0] if entry is not None else None
+
+    def _refresh(self, key, city):
+        try:
+            self._load(key, city)
+        except Exception as e:
+            print(f"DEBUG - Background weather refresh for {city} failed: {e}")
+
+    def _load(self, key, city, budget=None, endpoint='weather'):
+        """Fetch through the single-flight table, storing the result"""
+        with self._lock:
+            future = self._inflight.get(key)
+            leader = future is None
+            if leader:
+                future = Future()
+                self._inflight[key] = future
+            else:
+                self.stats['coalesced'] += 1
+        if not leader:
+            try:
+                return future.result(timeout=budget.remaining() if budget is not None else None)
+            except FutureTimeout:
+                raise BudgetExceeded(f"gave up waiting for {city}")
+
+        try:
+            report = self.fetch(city, budget, endpoint)
+        except Exception as e:
+            with self._lock:
+                del self._inflight[key]
+            future.set_exception(e)
+            raise
+        with self._lock:
+            if report is not None:
+                self._cache[key] = (report, time.monotonic())
+                self._cache.move_to_end(key)
+                while len(self._cache) > self.config['cache_size']:
+                    self._cache.popitem(last=False)
+            del self._inflight[key]
+        future.set_result(report)
+        return report
+
+
+class WeatherPrefetcher:
+    """
+    Keeps the default and favourite cities warm in the client's cache.
+
+    All cities are fetched once at startup, then refreshed every
+    `prefetch_interval` seconds (randomized by `prefetch_jitter` so several
+    installs don't hit the API in lockstep), skipping any a user lookup
+    refreshed recently. Background requests are capped at `prefetch_budget`
+    per hour, and errors back off exponentially up to `prefetch_backoff_max`.
+    Requests count against PREFETCH_ENDPOINT, not the interactive 'weather'
+    breaker, and no error (a bad response included) stops the thread.
+    """
+
+    def __init__(self, client, cities, config=WEATHER_CONFIG):
+        self.client = client
+        self.config = config
+        self.cities = list(dict.fromkeys(cities))  # De-duplicated, order kept
+        self._sent = deque()  # Monotonic times of background requests in the last hour
+        self._failures = 0
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="weather-prefetch", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+
+    def _within_budget(self):
+        now = time.monotonic()
+        while self._sent and now - self._sent[0] > 3600:
+            self._sent.popleft()
+        return len(self._sent) < self.config['prefetch_budget']
+
+    def _jittered(self, seconds):
+        jitter = self.config['prefetch_jitter']
+        return seconds * random.uniform(1 - jitter, 1 + jitter)
+
+    def refresh_round(self):
+        """
+        Refresh every city that is missing or older than the interval
+
+        Returns:
+            float: seconds to wait before the next round
+        """
+        interval = self.config['prefetch_interval']
+        for city in self.cities:
+            if self._stop.is_set():
+                break
+            age = self.client.age(city)
+            if age is not None and age < interval:
+                continue
+            if not self._within_budget():
+                print("DEBUG - Weather prefetch budget used up, waiting for the next round")
+                break
+            self._sent.append(time.monotonic())
+            try:
+                self.client.refresh(city, endpoint=PREFETCH_ENDPOINT)
+                self._failures = 0
+            except Exception as e:
+                self._failures += 1
+                delay = min(self.config['prefetch_backoff'] * 2 ** (self._failures - 1), self.config['prefetch_backoff_max'])
+                print(f"DEBUG - Weather prefetch for {city} failed ({e}); retrying in {delay:.0f} s")
+                return self._jittered(delay)
+        return self._jittered(interval)
+
+    def _run(self):
+        while not self._stop.is_set():
+            delay = self.refresh_round()
+            self._stop.wait(delay)
+
+
+_client = None
+_client_lock = threading.Lock()
+_prefetcher = None
+
+
+def get_weather_client():
+    """Return the shared weather client, creating it on first use"""
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = WeatherClient()
+        return _client
+
+
+def start_prefetch(config=WEATHER_CONFIG):
+    """Start refreshing DEFAULT_CITY and DEFAULT_CITIES in the background (no-op if disabled)"""
+    global _prefetcher
+    if not config.get('prefetch_enabled') or _prefetcher is not None:
+        return _prefetcher
+    from gazetteer import city_query
+
+    # Same canonical queries the weather handler uses, so prefetched entries are cache hits
+    cities = [city_query(city) for city in [DEFAULT_CITY] + list(DEFAULT_CITIES)]
+    _prefetcher = WeatherPrefetcher(get_weather_client(), cities, config).start()
+    return _prefetcher